@@ -0,0 +1,3 @@
+"""
+Núcleo compartilhado dos scrapers de supermercados (Zona Sul, Prezunic).
+"""
@@ -0,0 +1,195 @@
+"""
+Linha de comando do azumarill, por etapas:
+    python -m azumarill coletar   [-l loja ...] [-c categoria ...] [--organicos] [--max-paginas N]
+                                  [--concorrencia N] [--formato planilha|bruto|csv|jsonl] [--backend html|api]
+    python -m azumarill processar [-l loja ...] [-c categoria ...] [--organicos]
+    python -m azumarill exportar  [-l loja ...] [-c categoria ...] [--organicos] --formato xlsx|parquet|arrow|jsonl
+    python -m azumarill reprocessar [-l loja ...] [-c categoria ...] [--organicos] [--acervo arquivo.sqlite]
+                                  [--ate 2026-10-15T18:00] [--processos N] [--formato planilha|bruto] [--backend html|api]
+
+- coletar: busca as lojas. Com --formato planilha (padrão) salva a planilha como
+  azumarill.coleta; bruto grava só os produtos como coletados (produtos_brutos_<loja>.jsonl)
+  para a etapa `processar`; csv e jsonl gravam cada página assim que chega (saída contínua)
+- processar: monta a planilha (e atualiza o histórico de preços) a partir dos produtos brutos
+- exportar: converte a planilha CSV para outro formato
+- reprocessar: refaz a coleta e a planilha a partir do acervo das páginas já baixadas
+  (azumarill.acervo), sem rede, ex. depois de mudar a classificação ou o processamento
+
+Com --categoria (slug ou nome, ex. hortifruti) só essas categorias são coletadas, sem a
+busca de orgânicos, a não ser com --organicos; --organicos sozinho faz só a busca. Os
+arquivos de uma seleção levam a seleção no nome (ex. produtos_hortifruti_prezunic_hortifruti.csv)
+e não entram no histórico de preços.
+
+Cada etapa só importa o que usa: a coleta não carrega o pandas (só no fim, para a
+planilha), e o openpyxl só é carregado para gravar Excel.
+"""
+import argparse
+import logging
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from azumarill.lojas import LOJAS, obter_loja
+from azumarill.telemetria import configurar_logs
+
+log = logging.getLogger('azumarill.cli')
+
+FORMATOS_COLETA = ('planilha', 'bruto', 'csv', 'jsonl')
+# Os de exportacao.FORMATOS_EXPORTACAO, repetidos para a ajuda não importar o pandas
+FORMATOS_EXPORTACAO = ('xlsx', 'parquet', 'arrow', 'jsonl')
+SELECAO_ORGANICOS = 'organicos'
+
+
+def categorias_da_loja(loja, pedidas):
+    """Categorias (slug, nome) da loja entre as `pedidas` (slug ou nome, sem diferenciar maiúsculas)"""
+    pedidas = {pedida.lower() for pedida in pedidas}
+    return [(slug, nome) for slug, nome in loja.categorias if slug.lower() in pedidas or nome.lower() in pedidas]
+
+
+def lojas_selecionadas(argumentos):
+    """
+    Lojas pedidas, cada uma reduzida às categorias pedidas (e à busca de orgânicos, se pedida)
+    e com os limites da linha de comando. Retorna lista de Loja (SystemExit se nada casar).
+    """
+    lojas = []
+    for nome in argumentos.lojas or list(LOJAS):
+        loja = obter_loja(nome)
+        ajustes = {}
+        if argumentos.categorias or argumentos.organicos:
+            categorias = categorias_da_loja(loja, argumentos.categorias or ())
+            if not categorias and not argumentos.organicos:
+                log.warning(f"⚠️  {nome}: nenhuma das categorias pedidas (configuradas: "
+                            f"{', '.join(slug for slug, _ in loja.categorias)})")
+                continue
+            selecao = ([SELECAO_ORGANICOS] if argumentos.organicos else []) + [slug for slug, _ in categorias]
+            ajustes.update(categorias=categorias, selecao='+'.join(selecao))
+            if not argumentos.organicos:
+                ajustes['termos_organicos'] = []
+        if getattr(argumentos, 'max_paginas', None):
+            ajustes['max_paginas'] = argumentos.max_paginas
+        if getattr(argumentos, 'concorrencia', None):
+            ajustes['max_por_host'] = argumentos.concorrencia
+        lojas.append(loja.com_ajustes(**ajustes) if ajustes else loja)
+    if not lojas:
+        sys.exit("❌ Nenhuma loja com as categorias pedidas")
+    return lojas
+
+
+def coletar(argumentos):
+    # Lido na importação de azumarill.coleta
+    if argumentos.backend:
+        os.environ['AZUMARILL_BACKEND'] = argumentos.backend
+    from azumarill import coleta
+
+    lojas = [coleta.loja_do_ambiente(loja) for loja in lojas_selecionadas(argumentos)]
+    saida = None
+    if argumentos.formato in ('csv', 'jsonl'):
+        saida = coleta.ARQUIVO_PLANILHA.replace('.xlsx', f'.{argumentos.formato}')
+    coleta.executar(lojas, saida=saida, brutos=argumentos.formato == 'bruto')
+
+
+def processar(argumentos):
+    from azumarill import coleta
+
+    for loja in lojas_selecionadas(argumentos):
+        caminho = loja.arquivo_de_saida(coleta.ARQUIVO_BRUTO)
+        try:
+            produtos = coleta.ler_brutos(caminho)
+        except FileNotFoundError:
+            log.error(f"❌ {caminho} não encontrado: rode antes `python -m azumarill coletar --formato bruto`")
+            continue
+        log.info(f"📦 {loja.nome}: {len(produtos)} produtos brutos de {caminho}")
+        coleta.salvar_produtos_da_loja(loja, produtos)
+
+
+def exportar(argumentos):
+    from azumarill.coleta import ARQUIVO_PLANILHA
+    from azumarill.exportacao import exportar_planilha
+
+    for loja in lojas_selecionadas(argumentos):
+        caminho = loja.arquivo_de_saida(ARQUIVO_PLANILHA.replace('.xlsx', '.csv'))
+        try:
+            exportar_planilha(caminho, argumentos.formato)
+        except FileNotFoundError:
+            log.error(f"❌ {caminho} não encontrado: rode antes a coleta (ou `processar`)")
+        except ImportError as erro:
+            sys.exit(f"❌ {erro}")
+
+
+def reprocessar(argumentos):
+    # Lido na importação de azumarill.coleta
+    if argumentos.backend:
+        os.environ['AZUMARILL_BACKEND'] = argumentos.backend
+    from azumarill import coleta
+    from azumarill.acervo import ARQUIVO_ACERVO_PADRAO, VARIAVEL_AMBIENTE, AcervoDePaginas
+    from azumarill.reprocessamento import reprocessar as reprocessar_do_acervo
+
+    caminho = argumentos.acervo or os.environ.get(VARIAVEL_AMBIENTE) or ARQUIVO_ACERVO_PADRAO
+    if not Path(caminho).exists():
+        sys.exit(f"❌ Acervo {caminho} não encontrado: as páginas são guardadas nele durante a coleta")
+    ate = datetime.fromisoformat(argumentos.ate).timestamp() if argumentos.ate else None
+
+    lojas = [coleta.loja_do_ambiente(loja) for loja in lojas_selecionadas(argumentos)]
+    acervo = AcervoDePaginas(caminho)
+    try:
+        reprocessar_do_acervo(lojas, acervo, coleta.BACKEND_EXTRACAO, ate, argumentos.processos,
+                              brutos=argumentos.formato == 'bruto')
+    finally:
+        acervo.fechar()
+
+
+def main(args=None):
+    selecao = argparse.ArgumentParser(add_help=False)
+    selecao.add_argument('-l', '--loja', dest='lojas', action='append', choices=sorted(LOJAS), metavar='loja',
+                         help=f"loja (repetível; padrão: todas; configuradas: {', '.join(LOJAS)})")
+    selecao.add_argument('-c', '--categoria', dest='categorias', action='append', metavar='categoria',
+                         help='só esta categoria, pelo slug ou nome (repetível); sem a busca de orgânicos')
+    selecao.add_argument('--organicos', action='store_true',
+                         help='busca de orgânicos (sozinha, ou junto com as categorias pedidas)')
+    verbosidade = selecao.add_mutually_exclusive_group()
+    verbosidade.add_argument('-v', '--verboso', action='store_const', const='debug', dest='nivel_log',
+                             help='mostra também cada página buscada')
+    verbosidade.add_argument('-q', '--silencioso', action='store_const', const='warning', dest='nivel_log',
+                             help='só avisos e erros')
+
+    parser = argparse.ArgumentParser(prog='python -m azumarill', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    etapas = parser.add_subparsers(dest='etapa', required=True)
+
+    etapa_coletar = etapas.add_parser('coletar', parents=[selecao], help='busca as lojas')
+    etapa_coletar.add_argument('--max-paginas', type=int, help='limite de páginas por categoria/busca')
+    etapa_coletar.add_argument('--concorrencia', type=int, help='requisições simultâneas por host')
+    etapa_coletar.add_argument('--formato', choices=FORMATOS_COLETA, default='planilha',
+                               help='planilha completa, produtos brutos ou saída contínua (padrão: planilha)')
+    etapa_coletar.add_argument('--backend', choices=('html', 'api'),
+                               help='raspagem das páginas ou API do VTEX (padrão: AZUMARILL_BACKEND ou html)')
+    etapa_coletar.set_defaults(funcao=coletar)
+
+    etapa_processar = etapas.add_parser('processar', parents=[selecao],
+                                        help='monta a planilha a partir dos produtos brutos')
+    etapa_processar.set_defaults(funcao=processar)
+
+    etapa_exportar = etapas.add_parser('exportar', parents=[selecao], help='converte a planilha CSV')
+    etapa_exportar.add_argument('--formato', choices=FORMATOS_EXPORTACAO, required=True)
+    etapa_exportar.set_defaults(funcao=exportar)
+
+    etapa_reprocessar = etapas.add_parser('reprocessar', parents=[selecao],
+                                          help='refaz a coleta a partir do acervo de páginas, sem rede')
+    etapa_reprocessar.add_argument('--acervo',
+                                   help='arquivo do acervo (padrão: AZUMARILL_ACERVO ou acervo_paginas.sqlite)')
+    etapa_reprocessar.add_argument('--ate', help='usa as páginas buscadas até esta data/hora ISO (padrão: as últimas)')
+    etapa_reprocessar.add_argument('--processos', type=int, help='processos de extração (padrão: um por núcleo)')
+    etapa_reprocessar.add_argument('--formato', choices=('planilha', 'bruto'), default='planilha',
+                                   help='planilha completa ou produtos brutos (padrão: planilha)')
+    etapa_reprocessar.add_argument('--backend', choices=('html', 'api'),
+                                   help='backend da coleta original (padrão: AZUMARILL_BACKEND ou html)')
+    etapa_reprocessar.set_defaults(funcao=reprocessar)
+
+    argumentos = parser.parse_args(args)
+    configurar_logs(argumentos.nivel_log)
+    argumentos.funcao(argumentos)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+"""
+Acervo das páginas brutas baixadas pela coleta, endereçado pelo conteúdo.
+
+Toda página que a coleta recebe (da rede ou do cache HTTP) é guardada aqui, para que
+uma mudança na classificação (`classificar_tipo`) ou no processamento
+(`separar_nome_quantidade`) possa ser aplicada de novo sem coletar as lojas outra vez
+(ver azumarill.reprocessamento):
+- corpos: comprimidos com zlib e identificados pelo SHA-256 do conteúdo, então a mesma
+  página baixada em várias execuções ocupa espaço uma vez só
+- manifesto (tabela `paginas`): loja, URL, momento da busca, status, hash do corpo e os
+  cabeçalhos que a coleta lê (o total de resultados da API)
+- cache de extração: os produtos extraídos de cada corpo, pelo hash, pela cadeia de
+  extratores e pela versão do código de extração; uma página já analisada não é
+  analisada de novo, nem na coleta nem no reprocessamento
+
+Banco SQLite em WAL, seguro para várias threads e para os trabalhadores da fila
+(cada processo com a sua conexão).
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+from azumarill import extracao, pagina
+
+log = logging.getLogger(__name__)
+
+# Variável de ambiente com o arquivo do acervo; vazia desliga
+VARIAVEL_AMBIENTE = 'AZUMARILL_ACERVO'
+ARQUIVO_ACERVO_PADRAO = 'acervo_paginas.sqlite'
+
+# Cabeçalhos da resposta guardados no manifesto (os que a coleta lê, ver vtex.total_de_resultados)
+CABECALHOS_GUARDADOS = ('resources',)
+
+NIVEL_COMPRESSAO = 6
+
+# Espera pela trava do banco quando outro processo (trabalhador da fila) está gravando
+TIMEOUT_SEGUNDOS = 30
+
+
+def hash_do_corpo(conteudo):
+    """SHA-256 (hex) do corpo da resposta: a chave do corpo no acervo e no cache de extração"""
+    return hashlib.sha256(conteudo).hexdigest()
+
+
+def _versao_da_extracao():
+    """
+    Versão do código de extração: hash dos fontes de azumarill.extracao e azumarill.pagina
+    e do parser escolhido. Muda quando os extratores mudam, o que invalida o cache de extração.
+    """
+    resumo = hashlib.sha256(pagina.PARSER_PADRAO.encode())
+    for modulo in (extracao, pagina):
+        resumo.update(Path(modulo.__file__).read_bytes())
+    return resumo.hexdigest()[:16]
+
+
+VERSAO_EXTRACAO = _versao_da_extracao()
+
+
+class AcervoDePaginas:
+    """
+    Corpos das páginas (comprimidos, sem repetição), manifesto das buscas e cache de extração.
+    Seguro para uso a partir de várias threads.
+    """
+
+    def __init__(self, caminho):
+        self.caminho = Path(caminho)
+        self.estatisticas = {'guardadas': 0, 'corpos_novos': 0, 'extracoes_reaproveitadas': 0}
+
+        self._trava = threading.Lock()
+        self._conexao = sqlite3.connect(self.caminho, timeout=TIMEOUT_SEGUNDOS, check_same_thread=False)
+        self._conexao.execute('PRAGMA journal_mode=WAL')
+        self._conexao.execute('PRAGMA synchronous=NORMAL')
+        self._conexao.executescript('''
+            CREATE TABLE IF NOT EXISTS corpos (
+                hash TEXT PRIMARY KEY,
+                tamanho INTEGER NOT NULL,
+                corpo BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS paginas (
+                loja TEXT NOT NULL,
+                url TEXT NOT NULL,
+                buscada_em REAL NOT NULL,
+                status INTEGER NOT NULL,
+                hash TEXT NOT NULL,
+                cabecalhos TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_paginas_url ON paginas (loja, url, buscada_em);
+            CREATE TABLE IF NOT EXISTS extracoes (
+                hash TEXT NOT NULL,
+                extratores TEXT NOT NULL,
+                versao TEXT NOT NULL,
+                produtos TEXT NOT NULL,
+                PRIMARY KEY (hash, extratores, versao)
+            );
+        ''')
+        self._conexao.commit()
+
+    def guardar(self, loja, url, status, conteudo, cabecalhos=None):
+        """Guarda o corpo (se ainda não estiver no acervo) e registra a busca no manifesto"""
+        chave = hash_do_corpo(conteudo)
+        guardados = {nome: cabecalhos[nome] for nome in CABECALHOS_GUARDADOS if cabecalhos and nome in cabecalhos}
+        with self._trava:
+            novo = self._conexao.execute('SELECT 1 FROM corpos WHERE hash = ?', (chave,)).fetchone() is None
+            if novo:
+                self._conexao.execute('INSERT OR IGNORE INTO corpos VALUES (?, ?, ?)',
+                                      (chave, len(conteudo), zlib.compress(conteudo, NIVEL_COMPRESSAO)))
+            self._conexao.execute('INSERT INTO paginas VALUES (?, ?, ?, ?, ?, ?)',
+                                  (loja, url, time.time(), status, chave,
+                                   json.dumps(guardados) if guardados else None))
+            self._conexao.commit()
+            self.estatisticas['guardadas'] += 1
+            self.estatisticas['corpos_novos'] += novo
+        return chave
+
+    def ler(self, loja, url, ate=None):
+        """
+        Última versão guardada da URL da loja (buscada até o timestamp `ate`, se informado).
+        Retorna (conteudo, status, cabecalhos) ou None se a URL não estiver no acervo.
+        """
+        with self._trava:
+            linha = self._conexao.execute('''
+                SELECT corpos.corpo, paginas.status, paginas.cabecalhos
+                FROM paginas JOIN corpos ON corpos.hash = paginas.hash
+                WHERE paginas.loja = ? AND paginas.url = ? AND paginas.buscada_em <= ?
+                ORDER BY paginas.buscada_em DESC LIMIT 1''',
+                (loja, url, ate if ate is not None else float('inf'))).fetchone()
+        if linha is None:
+            return None
+        corpo, status, cabecalhos = linha
+        return zlib.decompress(corpo), status, json.loads(cabecalhos) if cabecalhos else {}
+
+    def extracao_guardada(self, chave, cadeia):
+        """Produtos já extraídos do corpo `chave` com a `cadeia` e esta versão dos extratores, ou None"""
+        with self._trava:
+            linha = self._conexao.execute(
+                'SELECT produtos FROM extracoes WHERE hash = ? AND extratores = ? AND versao = ?',
+                (chave, ','.join(cadeia), VERSAO_EXTRACAO)).fetchone()
+            if linha is None:
+                return None
+            self.estatisticas['extracoes_reaproveitadas'] += 1
+        return json.loads(linha[0])
+
+    def guardar_extracao(self, chave, cadeia, produtos):
+        """Guarda os produtos extraídos do corpo `chave` com a `cadeia` (nome e preço brutos, id)"""
+        with self._trava:
+            self._conexao.execute('INSERT OR REPLACE INTO extracoes VALUES (?, ?, ?, ?)',
+                                  (chave, ','.join(cadeia), VERSAO_EXTRACAO,
+                                   json.dumps(produtos, ensure_ascii=False)))
+            self._conexao.commit()
+
+    def resumo(self):
+        """Retorna dict com o total de buscas no manifesto, corpos únicos e MB comprimidos/originais"""
+        with self._trava:
+            buscas = self._conexao.execute('SELECT COUNT(*) FROM paginas').fetchone()[0]
+            corpos, comprimido, original = self._conexao.execute(
+                'SELECT COUNT(*), COALESCE(SUM(LENGTH(corpo)), 0), COALESCE(SUM(tamanho), 0) FROM corpos').fetchone()
+        return {'buscas': buscas, 'corpos': corpos,
+                'mb_comprimidos': comprimido / 1024 / 1024, 'mb_originais': original / 1024 / 1024}
+
+    def imprimir_estatisticas(self):
+        stats, resumo = self.estatisticas, self.resumo()
+        log.info(f"🗄️  Acervo: {stats['guardadas']} páginas guardadas ({stats['corpos_novos']} corpos novos), "
+                 f"{stats['extracoes_reaproveitadas']} extrações reaproveitadas | {self.caminho}: "
+                 f"{resumo['buscas']} buscas, {resumo['corpos']} corpos, {resumo['mb_comprimidos']:.1f} MB "
+                 f"({resumo['mb_originais']:.1f} MB sem compressão)")
+
+    def fechar(self):
+        with self._trava:
+            self._conexao.close()
+
+
+def acervo_do_ambiente():
+    """
+    Abre o acervo do arquivo em AZUMARILL_ACERVO (padrão: acervo_paginas.sqlite no diretório atual).
+    Retorna o AcervoDePaginas ou None (variável vazia: acervo desligado).
+    """
+    caminho = os.environ.get(VARIAVEL_AMBIENTE, ARQUIVO_ACERVO_PADRAO)
+    if not caminho:
+        return None
+    return AcervoDePaginas(caminho)
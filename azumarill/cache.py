@@ -0,0 +1,180 @@
+"""
+Cache HTTP persistente em disco, usado por baixo de `buscar_pagina`.
+
+- chave: URL + cabeçalhos que mudam o conteúdo (User-Agent, Accept, Accept-Language)
+- dentro do TTL a resposta sai do disco sem nenhuma requisição
+- fora do TTL a página é revalidada com If-None-Match/If-Modified-Since (304 = reaproveita)
+- TTL configurável por loja/categoria (prefixo "host/caminho" mais longo vence)
+- tamanho máximo com remoção das entradas menos usadas recentemente (LRU)
+- corpos comprimidos com zlib num banco SQLite
+"""
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from urllib.parse import urlsplit
+
+log = logging.getLogger(__name__)
+
+# Cabeçalhos que entram na chave do cache
+HEADERS_RELEVANTES = ('User-Agent', 'Accept', 'Accept-Language')
+
+TTL_PADRAO = 3600  # segundos
+TAMANHO_MAXIMO_PADRAO = 200 * 1024 * 1024  # bytes (comprimidos)
+
+# Variável de ambiente que ativa o cache: diretório onde o banco é criado
+VARIAVEL_AMBIENTE = 'AZUMARILL_CACHE'
+
+
+class CacheHTTP:
+    """
+    Cache de respostas HTTP em SQLite, seguro para uso a partir de várias threads.
+    ttls: dict {"host/caminho": segundos}, ex.: {"www.zonasul.com.br/hortifruti": 1800}
+    """
+
+    def __init__(self, caminho, ttl_padrao=TTL_PADRAO, ttls=None, tamanho_maximo=TAMANHO_MAXIMO_PADRAO):
+        self.caminho = Path(caminho)
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_padrao = ttl_padrao
+        # Prefixos mais longos primeiro: a categoria vence a loja
+        self.ttls = sorted((ttls or {}).items(), key=lambda item: len(item[0]), reverse=True)
+        self.tamanho_maximo = tamanho_maximo
+        self.estatisticas = {'acertos': 0, 'revalidados': 0, 'baixados': 0}
+        
+        self._trava = threading.Lock()
+        self._conexao = sqlite3.connect(self.caminho, check_same_thread=False)
+        self._conexao.execute('PRAGMA journal_mode=WAL')
+        self._conexao.execute('''
+            CREATE TABLE IF NOT EXISTS respostas (
+                chave TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                armazenado_em REAL NOT NULL,
+                acessado_em REAL NOT NULL,
+                tamanho INTEGER NOT NULL,
+                corpo BLOB NOT NULL
+            )''')
+        self._conexao.execute('CREATE INDEX IF NOT EXISTS idx_respostas_acesso ON respostas (acessado_em)')
+        self._conexao.commit()
+        self._tamanho_total = self._conexao.execute(
+            'SELECT COALESCE(SUM(tamanho), 0) FROM respostas').fetchone()[0]
+
+    def ttl_para(self, url):
+        """TTL (segundos) da URL, pelo prefixo host/caminho mais longo configurado"""
+        partes = urlsplit(url)
+        alvo = partes.netloc + partes.path
+        for prefixo, ttl in self.ttls:
+            if alvo.startswith(prefixo):
+                return ttl
+        return self.ttl_padrao
+
+    @staticmethod
+    def chave(url, headers):
+        """Chave do cache: hash da URL e dos cabeçalhos relevantes"""
+        partes = [url] + [f"{nome}:{headers.get(nome, '')}" for nome in HEADERS_RELEVANTES]
+        return hashlib.sha256('\n'.join(partes).encode('utf-8')).hexdigest()
+
+    def _ler(self, chave):
+        with self._trava:
+            return self._conexao.execute(
+                'SELECT status, etag, last_modified, armazenado_em, corpo FROM respostas WHERE chave = ?',
+                (chave,)).fetchone()
+
+    def _tocar(self, chave, renovar=False):
+        agora = time.time()
+        with self._trava:
+            if renovar:
+                self._conexao.execute('UPDATE respostas SET acessado_em = ?, armazenado_em = ? WHERE chave = ?',
+                                      (agora, agora, chave))
+            else:
+                self._conexao.execute('UPDATE respostas SET acessado_em = ? WHERE chave = ?', (agora, chave))
+            self._conexao.commit()
+
+    def _gravar(self, chave, url, response):
+        corpo = zlib.compress(response.content, 6)
+        agora = time.time()
+        with self._trava:
+            anterior = self._conexao.execute('SELECT tamanho FROM respostas WHERE chave = ?', (chave,)).fetchone()
+            if anterior:
+                self._tamanho_total -= anterior[0]
+            self._conexao.execute(
+                'INSERT OR REPLACE INTO respostas VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (chave, url, response.status_code, response.headers.get('ETag'),
+                 response.headers.get('Last-Modified'), agora, agora, len(corpo), corpo))
+            self._tamanho_total += len(corpo)
+            self._remover_excedente()
+            self._conexao.commit()
+
+    def _remover_excedente(self):
+        """Remove as entradas menos usadas até caber no tamanho máximo (chamar com a trava)"""
+        while self._tamanho_total > self.tamanho_maximo:
+            linhas = self._conexao.execute(
+                'SELECT chave, tamanho FROM respostas ORDER BY acessado_em LIMIT 32').fetchall()
+            if not linhas:
+                break
+            for chave, tamanho in linhas:
+                self._conexao.execute('DELETE FROM respostas WHERE chave = ?', (chave,))
+                self._tamanho_total -= tamanho
+                if self._tamanho_total <= self.tamanho_maximo:
+                    break
+
+    def buscar(self, sessao, url, timeout=10):
+        """
+        Busca a URL passando pelo cache.
+        Retorna (status, conteudo). Erros HTTP sobem como requests.exceptions.HTTPError,
+        igual a uma chamada direta com raise_for_status().
+        """
+        chave = self.chave(url, sessao.headers)
+        entrada = self._ler(chave)
+        
+        headers_condicionais = {}
+        if entrada:
+            status, etag, last_modified, armazenado_em, corpo = entrada
+            if time.time() - armazenado_em < self.ttl_para(url):
+                self._tocar(chave)
+                self.estatisticas['acertos'] += 1
+                return status, zlib.decompress(corpo)
+            if etag:
+                headers_condicionais['If-None-Match'] = etag
+            if last_modified:
+                headers_condicionais['If-Modified-Since'] = last_modified
+        
+        response = sessao.get(url, headers=headers_condicionais, timeout=timeout)
+        
+        if response.status_code == 304 and entrada:
+            # Não mudou desde a última vez: renova a validade e usa o corpo guardado
+            self._tocar(chave, renovar=True)
+            self.estatisticas['revalidados'] += 1
+            return entrada[0], zlib.decompress(entrada[4])
+        
+        response.raise_for_status()
+        self._gravar(chave, url, response)
+        self.estatisticas['baixados'] += 1
+        return response.status_code, response.content
+
+    def imprimir_estatisticas(self):
+        """Mostra quantas páginas vieram do cache, foram revalidadas ou baixadas"""
+        stats = self.estatisticas
+        log.info(f"\n💾 Cache: {stats['acertos']} do disco, {stats['revalidados']} revalidadas (304), "
+                 f"{stats['baixados']} baixadas ({self._tamanho_total / 1024 / 1024:.1f} MB em disco)")
+
+    def fechar(self):
+        with self._trava:
+            self._conexao.close()
+
+
+def cache_do_ambiente(nome_banco, ttls=None, ttl_padrao=TTL_PADRAO):
+    """
+    Cria o cache se a variável AZUMARILL_CACHE apontar para um diretório.
+    Retorna o CacheHTTP ou None (cache desativado).
+    """
+    diretorio = os.environ.get(VARIAVEL_AMBIENTE)
+    if not diretorio:
+        return None
+    return CacheHTTP(Path(diretorio) / nome_banco, ttl_padrao=ttl_padrao, ttls=ttls)
@@ -0,0 +1,193 @@
+"""
+Classificação de produtos por palavras-chave, compilada uma única vez na importação.
+
+As listas de palavras de cada tipo viram uma expressão regular em forma de trie
+(prefixos comuns fatorados, ex.: 'sal(?:ame|mão|sicha)?'), então cada posição do
+nome é testada contra todas as palavras de uma vez em vez de ~100 buscas com `in`.
+A expressão fica dentro de um lookahead, o que encontra palavras sobrepostas em
+qualquer posição numa única passada; a prioridade entre tipos
+(hortifruti > carnes > frios e laticinios > mercearia > processados) é resolvida
+pelo menor índice encontrado, com o mesmo resultado da busca lista a lista.
+As versões em lote (`classificar_tipos`, `determinar_organicos`) recebem uma coluna
+do pandas e classificam cada nome distinto uma única vez.
+
+Opcionalmente os acentos podem ser ignorados (`sem_acentos=True`). Isso NÃO é o
+padrão porque muda a classificação: 'maçã' sem acento ('maca') casa com 'macarrão'.
+"""
+import re
+import unicodedata
+
+# Tipos em ordem de prioridade e suas palavras-chave
+PALAVRAS_POR_TIPO = (
+    # Hortifruti: frutas, verduras, legumes, hortaliças
+    ('hortifruti', (
+        'fruta', 'verdura', 'legume', 'hortaliça', 'folha',
+        'banana', 'maçã', 'laranja', 'tomate', 'cebola', 'alho',
+        'batata', 'cenoura', 'abobrinha', 'berinjela', 'pimentão',
+        'alface', 'rúcula', 'couve', 'repolho', 'brócolis',
+        'morango', 'uva', 'mamão', 'abacate', 'limão',
+        'chuchu', 'abóbora', 'quiabo', 'vagem', 'pepino',
+    )),
+    # Carnes: carnes, aves, peixes
+    ('carnes', (
+        'carne', 'frango', 'peixe', 'porco', 'bovino', 'suíno',
+        'bife', 'alcatra', 'picanha', 'maminha', 'contra-filé',
+        'coxinha', 'sobrecoxa', 'peito', 'salmão', 'tilápia',
+        'sardinha', 'atum', 'linguiça', 'salsicha', 'embutido',
+    )),
+    # Frios e Laticínios: queijos, iogurtes, leites, requeijão, etc.
+    ('frios e laticinios', (
+        'queijo', 'iogurte', 'leite', 'requeijão', 'manteiga',
+        'nata', 'creme de leite', 'ricota', 'cottage', 'mussarela',
+        'presunto', 'mortadela', 'salame', 'peito de peru',
+        'laticínio', 'laticinio',
+    )),
+    # Mercearia: grãos, cereais, farinhas, açúcares, óleos, etc.
+    ('mercearia', (
+        'arroz', 'feijão', 'lentilha', 'grão', 'cereal', 'aveia', 'quinoa',
+        'farinha', 'trigo', 'milho', 'soja', 'castanha', 'amendoim', 'nozes',
+        'açúcar', 'sal', 'óleo', 'azeite', 'vinagre', 'macarrão', 'massa',
+        'biscoito', 'bolacha', 'café', 'chá', 'mel', 'geleia',
+    )),
+)
+
+# Processados: padaria, confeitaria, bebidas, condimentos, congelados, etc.
+# Se não se encaixou em nenhum tipo acima, vai para processados
+TIPO_PADRAO = 'processados'
+
+PALAVRAS_ORGANICO = ('orgânico', 'organico', 'organic', 'bio', 'biológico', 'biologico')
+ORGANICO = 'Orgânico'
+NAO_ORGANICO = 'Não Orgânico'
+
+
+def remover_acentos(texto):
+    """Remove acentos e cedilha: 'maçã' -> 'maca'"""
+    decomposto = unicodedata.normalize('NFKD', texto)
+    return ''.join(c for c in decomposto if not unicodedata.combining(c))
+
+
+def padrao_trie(palavras):
+    """
+    Monta uma expressão regular (sem grupos de captura) que casa qualquer uma das palavras,
+    com prefixos comuns fatorados. Continuações são gulosas: em cada posição casa a
+    palavra mais longa possível.
+    """
+    trie = {}
+    for palavra in palavras:
+        no = trie
+        for caractere in palavra:
+            no = no.setdefault(caractere, {})
+        no[''] = True
+    
+    def gerar(no):
+        ramos = [re.escape(c) + gerar(filho) for c, filho in sorted(no.items()) if c != '']
+        if not ramos:
+            return ''
+        if len(ramos) == 1:
+            corpo = ramos[0]
+            return f'(?:{corpo})?' if '' in no else corpo
+        corpo = '(?:' + '|'.join(ramos) + ')'
+        return corpo + '?' if '' in no else corpo
+    
+    return gerar(trie)
+
+
+class Classificador:
+    """
+    Classificador de tipo compilado. Construído uma vez por variante (com/sem acentos).
+    """
+
+    def __init__(self, palavras_por_tipo, sem_acentos=False):
+        self.sem_acentos = sem_acentos
+        self.tipos = tuple(tipo for tipo, _ in palavras_por_tipo)
+        
+        prioridade = {}
+        for indice, (_, palavras) in enumerate(palavras_por_tipo):
+            for palavra in palavras:
+                palavra = self.normalizar(palavra)
+                prioridade.setdefault(palavra, indice)  # primeira ocorrência = maior prioridade
+        
+        # Na mesma posição o padrão casa a palavra mais longa; as palavras mais curtas
+        # que também casariam ali são prefixos dela. A prioridade efetiva de uma palavra
+        # é então a melhor entre ela e seus prefixos.
+        self._prioridade = {
+            palavra: min(p for prefixo, p in prioridade.items() if palavra.startswith(prefixo))
+            for palavra in prioridade
+        }
+        self._padrao = re.compile(f'(?=({padrao_trie(prioridade)}))')
+
+    def normalizar(self, texto):
+        texto = texto.lower()
+        return remover_acentos(texto) if self.sem_acentos else texto
+
+    def classificar(self, nome_produto):
+        """Tipo do produto numa única passada pelo nome"""
+        if not nome_produto:
+            return TIPO_PADRAO
+        
+        melhor = len(self.tipos)
+        prioridade = self._prioridade
+        for match in self._padrao.finditer(self.normalizar(nome_produto)):
+            indice = prioridade[match.group(1)]
+            if indice < melhor:
+                melhor = indice
+                if melhor == 0:
+                    break
+        return self.tipos[melhor] if melhor < len(self.tipos) else TIPO_PADRAO
+
+    def classificar_serie(self, nomes):
+        """
+        Classifica uma coluna inteira (pandas.Series de nomes).
+        Cada nome distinto é classificado uma vez só (catálogos repetem muitos nomes
+        entre páginas, buscas e lojas). Retorna uma Series de tipos com o mesmo índice.
+        """
+        import pandas as pd
+        
+        distintos = pd.unique(nomes)
+        tipos = {nome: self.classificar(nome if isinstance(nome, str) else None) for nome in distintos}
+        return pd.Series(nomes.map(tipos), index=nomes.index, name=nomes.name, dtype=object)
+
+
+CLASSIFICADOR = Classificador(PALAVRAS_POR_TIPO)
+CLASSIFICADOR_SEM_ACENTOS = Classificador(PALAVRAS_POR_TIPO, sem_acentos=True)
+
+PADRAO_ORGANICO = re.compile(padrao_trie(PALAVRAS_ORGANICO))
+PADRAO_ORGANICO_SEM_ACENTOS = re.compile(padrao_trie({remover_acentos(p) for p in PALAVRAS_ORGANICO}))
+
+
+def classificar_tipo(nome_produto, sem_acentos=False):
+    """
+    Classifica o tipo do produto baseado no nome.
+    Retorna: 'hortifruti', 'mercearia', 'frios e laticinios', 'carnes' ou 'processados'
+    """
+    classificador = CLASSIFICADOR_SEM_ACENTOS if sem_acentos else CLASSIFICADOR
+    return classificador.classificar(nome_produto)
+
+
+def classificar_tipos(nomes, sem_acentos=False):
+    """Versão em lote de classificar_tipo para uma pandas.Series de nomes"""
+    classificador = CLASSIFICADOR_SEM_ACENTOS if sem_acentos else CLASSIFICADOR
+    return classificador.classificar_serie(nomes)
+
+
+def determinar_organico(nome_produto, sem_acentos=False):
+    """
+    Determina se o produto é orgânico baseado no nome.
+    Retorna: 'Orgânico' ou 'Não Orgânico'
+    """
+    if not nome_produto:
+        return NAO_ORGANICO
+    nome = nome_produto.lower()
+    if sem_acentos:
+        return ORGANICO if PADRAO_ORGANICO_SEM_ACENTOS.search(remover_acentos(nome)) else NAO_ORGANICO
+    return ORGANICO if PADRAO_ORGANICO.search(nome) else NAO_ORGANICO
+
+
+def determinar_organicos(nomes, sem_acentos=False):
+    """Versão em lote de determinar_organico para uma pandas.Series de nomes (um teste por nome distinto)"""
+    import pandas as pd
+    
+    distintos = pd.unique(nomes)
+    categorias = {nome: determinar_organico(nome if isinstance(nome, str) else None, sem_acentos)
+                  for nome in distintos}
+    return pd.Series(nomes.map(categorias), index=nomes.index, name=nomes.name, dtype=object)
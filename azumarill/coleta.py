@@ -0,0 +1,910 @@
+"""
+Motor de coleta comum a todas as lojas.
+
+`ColetaDaLoja` faz a coleta de uma loja configurada em azumarill.lojas (busca de
+orgânicos por termo + categorias de alimentos, paginação, diário, cache, acervo das
+páginas e saída contínua). `main` coleta várias lojas no mesmo processo e ao mesmo tempo: todas
+compartilham um MotorDeColeta, que mantém semáforo e balde de tokens separados por
+host, então cada loja tem o próprio limite de cortesia.
+
+O pandas (planilha, histórico de preços) só é importado no fim, para salvar a planilha:
+a coleta com saída contínua ou só dos produtos brutos (`executar(..., brutos=True)`) não o carrega.
+
+Uso: python -m azumarill.coleta [loja ...]   (sem argumentos, todas as lojas)
+     [-v | -q] [--relatorio relatorio.json] [--prometheus azumarill.prom]
+Para coletar só algumas categorias, ou por etapas, veja `python -m azumarill`.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+import requests
+
+from azumarill.acervo import acervo_do_ambiente, hash_do_corpo
+from azumarill.cache import cache_do_ambiente
+from azumarill.classificador import classificar_tipo
+from azumarill.diario import DiarioDeColeta
+from azumarill.extracao import extrair_produtos
+from azumarill.lojas import LOJAS, obter_loja
+from azumarill.motor import MotorDeColeta
+from azumarill.pagina import PaginaBruta
+from azumarill.processos import ExtracaoEmProcessos
+from azumarill.paginacao import (FORMATOS_PAGINACAO, MemoriaDePaginacao, formato_da_url,
+                                  montar_url_pagina, sondar_formatos)
+from azumarill.sessao import (criar_sessao, imprimir_estatisticas_conexoes, retentativas_da_resposta,
+                              segundos_retry_after, status_das_retentativas)
+from azumarill.telemetria import Telemetria, configurar_logs
+from azumarill.vtex import coletar_paginas_api, extrair_produtos_api, total_de_resultados, url_busca_api
+
+log = logging.getLogger('azumarill.coleta')  # nome fixo: com python -m, __name__ é '__main__'
+
+# Backend de extração: 'html' (páginas da vitrine) ou 'api' (API de catálogo do VTEX)
+BACKEND_EXTRACAO = os.environ.get('AZUMARILL_BACKEND', 'html')
+
+# Saída contínua opcional: AZUMARILL_SAIDA=<arquivo.csv|arquivo.jsonl> ou '-' (JSONL na saída padrão).
+# Cada página é gravada assim que chega, em vez de montar a planilha no fim
+SAIDA_CONTINUA = os.environ.get('AZUMARILL_SAIDA')
+
+# Extração em pool de processos (AZUMARILL_PROCESSOS=<workers>); 0 extrai no próprio laço de eventos
+PROCESSOS_EXTRACAO = int(os.environ.get('AZUMARILL_PROCESSOS', '0'))
+
+# Taxa de requisições por host: 'adaptativo' (AIMD a partir das respostas) ou 'fixo' (a configurada na Loja)
+CONTROLE_TAXA = os.environ.get('AZUMARILL_CONTROLE', 'adaptativo')
+
+# Relatório JSON e arquivo de métricas do Prometheus da execução (opcionais)
+ARQUIVO_RELATORIO = os.environ.get('AZUMARILL_RELATORIO')
+ARQUIVO_PROMETHEUS = os.environ.get('AZUMARILL_PROMETHEUS')
+
+# Histórico de preços (azumarill.historico) alimentado pelas planilhas: AZUMARILL_HISTORICO=<arquivo.sqlite>;
+# vazio desliga. O padrão é o historico.ARQUIVO_HISTORICO, repetido aqui para não importar o pandas
+ARQUIVO_HISTORICO = os.environ.get('AZUMARILL_HISTORICO', 'historico_precos.sqlite')
+
+# Arquivos de cada loja ({loja} é trocado pelo nome dela)
+ARQUIVO_PLANILHA = 'produtos_hortifruti_{loja}.xlsx'
+ARQUIVO_PARCIAL = 'produtos_hortifruti_{loja}_parcial.xlsx'
+ARQUIVO_BRUTO = 'produtos_brutos_{loja}.jsonl'  # produtos como coletados, para processar depois
+ARQUIVO_DIARIO = 'coleta_{loja}.sqlite'
+ARQUIVO_CACHE = 'cache_{loja}.sqlite'
+ARQUIVO_PAGINACAO = 'paginacao_{loja}.json'
+
+
+def url_api_da_loja(loja):
+    """
+    Endereço da API de catálogo da loja. AZUMARILL_URL_API_<LOJA> (ou AZUMARILL_URL_API)
+    aponta para outro endereço, ex.: o servidor local azumarill.servidor_vtex
+    """
+    padrao = os.environ.get('AZUMARILL_URL_API', loja.url)
+    return os.environ.get(f'AZUMARILL_URL_API_{loja.nome.upper()}', padrao)
+
+
+def loja_do_ambiente(loja):
+    """
+    A loja, ou uma cópia servida de outro endereço quando AZUMARILL_URL_LOJA_<LOJA>
+    (ou AZUMARILL_URL_LOJA) estiver definida, ex.: o servidor local azumarill.servidor_vtex
+    """
+    url = os.environ.get(f'AZUMARILL_URL_LOJA_{loja.nome.upper()}', os.environ.get('AZUMARILL_URL_LOJA'))
+    return loja.com_url(url) if url else loja
+
+
+def chave_do_nome(produto):
+    """Chave usada para deduplicar produtos por nome"""
+    return (produto.get('nome_bruto') or '').strip().lower()
+
+
+def chave_do_produto(produto):
+    """
+    Identidade do produto: o SKU/ID da loja (quando a página informa) junto com o nome.
+    O nome continua na chave porque o ID sozinho já apareceu repetido em produtos diferentes
+    nas respostas das lojas; assim a deduplicação nunca descarta o que a de nomes manteria.
+    """
+    return produto.get('id'), chave_do_nome(produto)
+
+
+def juntar_sem_repetidos(listas):
+    """Junta as listas de produtos na ordem, sem repetir produtos (chave_do_produto). Retorna lista"""
+    vistos = set()
+    juntos = []
+    for produtos in listas:
+        for produto in produtos:
+            chave = chave_do_produto(produto)
+            if chave not in vistos:
+                vistos.add(chave)
+                juntos.append(produto)
+    return juntos
+
+
+class ColetaDaLoja:
+    """
+    Coleta de uma loja: sessão, cache e memória de paginação próprios.
+    `diario`, `saida`, `extracao_paralela` (ExtracaoEmProcessos) e `telemetria` são
+    opcionais e podem ser definidos antes de `coletar`.
+    `acervo`: AcervoDePaginas onde as páginas recebidas são guardadas (padrão: o de
+    AZUMARILL_ACERVO, ver azumarill.acervo); com ele, a extração passa pelo cache de extração.
+    """
+
+    def __init__(self, loja, backend=BACKEND_EXTRACAO, diario=None, saida=None, acervo=None):
+        self.loja = loja
+        self.backend = backend
+        self.url_api = url_api_da_loja(loja)
+        self.diario = diario
+        self.saida = saida
+        self.motor = None
+        self.extracao_paralela = None
+        self.telemetria = None
+
+        # Sessão da loja: conexões keep-alive reaproveitadas e retentativas com backoff
+        # (o pool por host acompanha o número de requisições simultâneas)
+        self.sessao = criar_sessao(loja.headers, pool_maximo=loja.max_por_host)
+        # Toda resposta que vem da rede (inclusive revalidações do cache) alimenta o controle de taxa
+        self.sessao.hooks['response'].append(self.observar_resposta)
+
+        # Cache HTTP opcional em disco, ativado com AZUMARILL_CACHE=<diretório>
+        self.cache = cache_do_ambiente(loja.arquivo(ARQUIVO_CACHE), ttls=loja.ttl_cache)
+
+        # Acervo das páginas brutas, para reprocessar sem coletar de novo (AZUMARILL_ACERVO; vazio desliga)
+        self.acervo = acervo if acervo is not None else acervo_do_ambiente()
+
+        # Lojas com paginação detectada guardam o formato entre execuções
+        self.memoria_paginacao = None
+        if loja.formato_paginacao is None:
+            self.memoria_paginacao = MemoriaDePaginacao(loja.arquivo(ARQUIVO_PAGINACAO))
+
+    def buscar_pagina(self, url, mostrar_log=False):
+        """
+        Faz a requisição e retorna (PaginaBruta, status), ou (None, None) em caso de erro.
+        A árvore BeautifulSoup só é montada se algum extrator pedir `pagina.soup`.
+        Com telemetria, registra latência, status, bytes e retentativas (pelo cache, só latência e status).
+        """
+        inicio = time.perf_counter()
+        response = None
+        try:
+            if mostrar_log:
+                log.debug(f"Acessando: {url}")
+            if self.cache is not None:
+                status, conteudo = self.cache.buscar(self.sessao, url, timeout=10)
+                self.registrar_busca(url, inicio, status)
+                self.guardar_no_acervo(url, status, conteudo)
+                return PaginaBruta(conteudo), status
+            response = self.sessao.get(url, timeout=10)
+            response.raise_for_status()
+            self.registrar_busca(url, inicio, response.status_code, response)
+            self.guardar_no_acervo(url, response.status_code, response.content, response.headers)
+            return PaginaBruta(response.content, cabecalhos=response.headers), response.status_code
+        except requests.exceptions.RequestException as e:
+            response = response if response is not None else e.response
+            if response is None and self.motor is not None:
+                # Falha de conexão (sem resposta, o hook da sessão não foi chamado)
+                self.motor.observar(url, None, None)
+            self.registrar_busca(url, inicio, getattr(response, 'status_code', None), response, erro=e)
+            log.error(f"Erro ao acessar {url}: {e}")
+            return None, None
+
+    def guardar_no_acervo(self, url, status, conteudo, cabecalhos=None):
+        if self.acervo is not None:
+            self.acervo.guardar(self.loja.nome, url, status, conteudo, cabecalhos)
+
+    def observar_resposta(self, response, *args, **kwargs):
+        """Hook de resposta da sessão: informa latência, status, retentativas e Retry-After ao motor"""
+        if self.motor is not None:
+            self.motor.observar(response.url, response.elapsed.total_seconds(), response.status_code,
+                                status_das_retentativas(response), segundos_retry_after(response))
+
+    def registrar_busca(self, url, inicio, status, response=None, erro=None):
+        if self.telemetria is None:
+            return
+        tamanho = len(response.content) if response is not None and erro is None else 0
+        self.telemetria.registrar_busca(url, time.perf_counter() - inicio, status, tamanho,
+                                        retentativas_da_resposta(response), erro)
+
+    def extrair_produtos(self, pagina):
+        """Extrai os produtos com a cadeia de extratores da loja"""
+        return extrair_produtos(pagina, self.loja.extratores)
+
+    async def extrair(self, pagina):
+        """
+        Extrai os produtos da página no pool de processos, se houver, ou aqui mesmo.
+        Com o acervo, um corpo já analisado com os mesmos extratores sai do cache de extração.
+        O tempo vai para a telemetria (no pool, inclui a espera por um worker).
+        """
+        inicio = time.perf_counter()
+        chave = produtos = None
+        if self.acervo is not None:
+            chave = hash_do_corpo(pagina.conteudo)
+            produtos = self.acervo.extracao_guardada(chave, self.loja.extratores)
+        if produtos is None:
+            if self.extracao_paralela is not None:
+                produtos = await self.extracao_paralela.extrair(pagina, self.loja.extratores)
+            else:
+                produtos = self.extrair_produtos(pagina)
+            if chave is not None:
+                self.acervo.guardar_extracao(chave, self.loja.extratores, produtos)
+        if self.telemetria is not None:
+            self.telemetria.registrar_extracao(time.perf_counter() - inicio, len(produtos))
+        return produtos
+
+    def classificar(self, produtos, url):
+        """Preenche tipo e URL de origem dos produtos (NÃO marca categoria orgânico/não orgânico aqui)"""
+        inicio = time.perf_counter()
+        for produto in produtos:
+            produto['tipo'] = classificar_tipo(produto['nome_bruto'])
+            produto['url_origem'] = url
+        if self.telemetria is not None:
+            self.telemetria.registrar_classificacao(time.perf_counter() - inicio, len(produtos))
+
+    def nova_lista(self):
+        """Lista de produtos de uma coleta (ListaNaSaida com saída contínua)"""
+        return [] if self.saida is None else self.saida.lista()
+
+    def testar_extracao(self):
+        """
+        Testa se consegue extrair produtos da página de teste da loja (se houver).
+        Retorna True se encontrou produtos.
+        """
+        if self.loja.url_teste is None:
+            return True
+
+        log.info("=" * 60)
+        log.info(f"TESTE INICIAL - VERIFICANDO EXTRAÇÃO ({self.loja.nome})")
+        log.info("=" * 60)
+
+        documento, status = self.buscar_pagina(self.loja.url_teste)
+
+        if documento is None or status != 200:
+            log.error("❌ Erro ao acessar a página. Verifique a URL e sua conexão.")
+            return False
+
+        produtos_teste = self.extrair_produtos(documento)
+
+        if len(produtos_teste) == 0:
+            log.warning("⚠️  Nenhum produto encontrado na primeira página.")
+            log.warning("⚠️  O site pode estar usando JavaScript para carregar produtos dinamicamente.")
+            log.warning("⚠️  Será necessário usar Selenium ou outra ferramenta de renderização JavaScript.")
+            return False
+
+        log.info(f"✅ {len(produtos_teste)} produtos encontrados na primeira página!")
+        log.info("✅ O site usa JSON-LD ou HTML para produtos. Continuando coleta...\n")
+        return True
+
+    async def coletar_todas_paginas(self, url_base, nomes_vistos=None, primeira_pagina=None):
+        """
+        Coleta produtos de todas as páginas disponíveis.
+        Se a página 1 informa o total de itens (JSON-LD), o número de páginas sai dele e as
+        seguintes são buscadas todas de uma vez, assim que o formato de paginação é conhecido;
+        `loja.max_paginas` fica só como limite de segurança. Sem o total, vai página a página.
+        Para quando não encontrar mais produtos, quando uma página repetir a anterior
+        ou der erro. As requisições passam pelo motor, que controla concorrência e taxa por host.
+        Com o diário, cada página concluída é registrada e a coleta retoma de onde parou.
+        Sem formato de paginação fixo na loja, o formato vem da memória ou é detectado na página 2.
+        Lojas com `deduplicar_nomes` descartam produtos já vistos (chave_do_produto, em
+        `nomes_vistos` se informado).
+        `primeira_pagina`: (documento, produtos) da página 1 já buscada (ex.: pelo plano de buscas).
+        Retorna lista de todos os produtos coletados (ListaNaSaida com saída contínua).
+        """
+        loja = self.loja
+        diario = self.diario
+
+        todos_produtos = self.nova_lista()
+        pagina = 1
+        formato_pagina = loja.formato_paginacao
+        formato_a_confirmar = False  # Formato veio da memória e ainda não trouxe produtos nesta coleta
+        urls_visitadas = set()  # Para evitar loops infinitos
+        produtos_anteriores = None  # Produtos da última página, para detectar páginas repetidas
+        ultima_pagina = None  # Vem do total de itens da página 1
+        buscas_adiantadas = None  # {pagina: tarefa} das páginas buscadas de uma vez
+        if nomes_vistos is None:
+            nomes_vistos = set()
+
+        # Retoma páginas já concluídas numa execução anterior
+        if diario is not None:
+            for pagina_salva, url_salva, produtos_salvos in diario.paginas_concluidas(url_base):
+                todos_produtos.extend(produtos_salvos)
+                urls_visitadas.add(url_salva)
+                produtos_anteriores = produtos_salvos
+                if loja.deduplicar_nomes:
+                    nomes_vistos.update(chave_do_produto(p) for p in produtos_salvos)
+                if pagina_salva == 2 and self.memoria_paginacao is not None:
+                    formato_pagina = formato_da_url(url_salva)
+                pagina = pagina_salva + 1
+
+            if diario.categoria_concluida(url_base):
+                log.info(f"♻️  {url_base} já coletada anteriormente ({len(todos_produtos)} produtos)")
+                return todos_produtos
+            if pagina > 1:
+                log.info(f"♻️  Retomando {url_base} a partir da página {pagina}")
+
+        log.debug(f"\n{'='*60}")
+        log.debug(f"Iniciando coleta de todas as páginas")
+        log.debug(f"URL base: {url_base}")
+        log.debug(f"Limite máximo de páginas: {loja.max_paginas}")
+        log.debug(f"{'='*60}\n")
+
+        concluida = True  # False se parar por erro de rede (a página será tentada de novo)
+
+        while pagina <= loja.max_paginas and (ultima_pagina is None or pagina <= ultima_pagina):
+            documento = None  # Preenchido quando a página já veio da sondagem de formatos
+            produtos_pagina = None
+
+            # Monta URL da página
+            if pagina == 1:
+                url = url_base
+                if primeira_pagina is not None:
+                    documento, produtos_pagina = primeira_pagina
+                    status = 200
+            else:
+                if formato_pagina is None:
+                    formato_pagina = self.memoria_paginacao.obter(url_base)
+                    formato_a_confirmar = formato_pagina is not None
+
+                if formato_pagina is None:
+                    # Formato desconhecido: testa todos em paralelo e usa a resposta vencedora como a página
+                    formato_pagina, url, documento, status, produtos_pagina = await sondar_formatos(
+                        self.motor, self.buscar_pagina, self.extrair, url_base, pagina)
+                    if formato_pagina is not None:
+                        log.info(f"   ✅ Formato de paginação detectado: {formato_pagina}")
+                        self.memoria_paginacao.registrar(url_base, formato_pagina)
+                    else:
+                        formato_pagina = 'page'
+                else:
+                    url = montar_url_pagina(url_base, formato_pagina, pagina)
+
+            log.debug(f"📄 Página {pagina}: {url}")
+
+            # Verifica se já visitou esta URL (proteção contra loop)
+            if url in urls_visitadas:
+                log.warning(f"⚠️  URL já visitada anteriormente. Parando para evitar loop infinito.")
+                break
+            urls_visitadas.add(url)
+
+            # Busca a página (a não ser que já tenha vindo da sondagem ou sido buscada de antemão)
+            if documento is None:
+                tarefa = buscas_adiantadas.pop(pagina, None) if buscas_adiantadas else None
+                if tarefa is not None:
+                    documento, status = await tarefa
+                else:
+                    documento, status = await self.motor.buscar(self.buscar_pagina, url)
+
+            # Se deu erro ao buscar, para
+            if documento is None or status != 200:
+                log.error(f"❌ Erro ou página não encontrada. Parando na página {pagina}")
+                concluida = False
+                break
+
+            # Extrai produtos da página
+            if produtos_pagina is None:
+                produtos_pagina = await self.extrair(documento)
+
+            # Formato memorizado não trouxe produtos novos (página vazia ou repetida):
+            # confere se outro formato traz
+            if formato_a_confirmar:
+                formato_a_confirmar = False
+                nomes_anterior = {p['nome_bruto'] for p in produtos_anteriores} if produtos_anteriores else set()
+                if len(produtos_pagina) == 0 or {p['nome_bruto'] for p in produtos_pagina} == nomes_anterior:
+                    outros_formatos = tuple(f for f in FORMATOS_PAGINACAO if f != formato_pagina)
+                    formato, url_teste, documento_teste, _, produtos_teste = await sondar_formatos(
+                        self.motor, self.buscar_pagina, self.extrair, url_base, pagina,
+                        formatos=outros_formatos)
+                    if formato is not None:
+                        log.info(f"   ✅ Formato de paginação mudou: {formato_pagina} -> {formato}")
+                        formato_pagina, url, documento, produtos_pagina = formato, url_teste, documento_teste, produtos_teste
+                        urls_visitadas.add(url)
+                        self.memoria_paginacao.registrar(url_base, formato_pagina)
+
+            # Se não encontrou produtos, acabaram as páginas
+            if len(produtos_pagina) == 0:
+                log.info(f"✅ Fim das páginas (página {pagina} não tem produtos)")
+                break
+
+            # Verifica se esta página tem os mesmos produtos da anterior (proteção contra loop)
+            if produtos_anteriores:
+                nomes_anterior = {p['nome_bruto'] for p in produtos_anteriores}
+                nomes_atual = {p['nome_bruto'] for p in produtos_pagina}
+                if nomes_anterior == nomes_atual and len(nomes_anterior) > 0:
+                    log.warning(f"⚠️  Página {pagina} tem os mesmos produtos da página anterior. Parando para evitar loop.")
+                    break
+
+            # Total de itens na página 1: dá o número de páginas (só se passa desta página,
+            # já que algumas vitrines informam em numberOfItems só os itens da própria página)
+            if pagina == 1:
+                total = documento.total_de_itens()
+                if total is not None and total > len(produtos_pagina):
+                    ultima_pagina = -(-total // len(produtos_pagina))
+                    log.debug(f"   {total} itens em {ultima_pagina} páginas de {len(produtos_pagina)}")
+
+            # Guarda só esta página para comparar com a próxima
+            produtos_anteriores = produtos_pagina
+
+            # Remove duplicatas baseado no nome
+            produtos_novos = produtos_pagina
+            if loja.deduplicar_nomes:
+                produtos_novos = []
+                for produto in produtos_pagina:
+                    nome = chave_do_produto(produto)
+                    if nome[1] and nome not in nomes_vistos:
+                        nomes_vistos.add(nome)
+                        produtos_novos.append(produto)
+
+                if len(produtos_novos) == 0:
+                    log.warning(f"⚠️  Todos os produtos da página {pagina} são duplicados. Parando.")
+                    break
+
+            # Adiciona tipo e metadados
+            self.classificar(produtos_novos, url)
+
+            # Adiciona produtos encontrados
+            todos_produtos.extend(produtos_novos)
+            log.debug(f"   ✅ {len(produtos_novos)} produtos novos encontrados (Total: {len(todos_produtos)})\n")
+
+            if diario is not None:
+                diario.registrar_pagina(url_base, pagina, url, produtos_novos)
+
+            pagina += 1
+
+            # Com o número de páginas e o formato de paginação conhecidos, busca todas as
+            # restantes de uma vez (o motor segura a concorrência e a taxa do host)
+            if (buscas_adiantadas is None and ultima_pagina is not None and formato_pagina is not None
+                    and not formato_a_confirmar and pagina <= min(ultima_pagina, loja.max_paginas)):
+                ate = min(ultima_pagina, loja.max_paginas)
+                log.debug(f"   Buscando as páginas {pagina} a {ate} de uma vez")
+                buscas_adiantadas = {
+                    seguinte: asyncio.ensure_future(self.motor.buscar(
+                        self.buscar_pagina, montar_url_pagina(url_base, formato_pagina, seguinte)))
+                    for seguinte in range(pagina, ate + 1)
+                }
+
+        # Parou antes das páginas já buscadas (erro, página repetida...): descarta o resto
+        for tarefa in (buscas_adiantadas or {}).values():
+            tarefa.cancel()
+
+        if ultima_pagina is not None and pagina > ultima_pagina:
+            log.info(f"✅ Fim das páginas ({ultima_pagina} páginas pelo total de itens da primeira)")
+        if pagina > loja.max_paginas:
+            log.warning(f"⚠️  Limite máximo de {loja.max_paginas} páginas atingido.")
+
+        if diario is not None and concluida:
+            diario.concluir_categoria(url_base)
+
+        log.info(f"\n{'='*60}")
+        log.info(f"Coleta concluída: {len(todos_produtos)} produtos em {pagina-1} páginas")
+        log.info(f"{'='*60}\n")
+
+        return todos_produtos
+
+    def url_primeira_pagina_do_termo(self, termo_busca):
+        """URL da primeira página (ou janela da API) da busca por termo; é também a chave no diário"""
+        if self.backend == 'api':
+            return url_busca_api(self.url_api, termo=termo_busca)
+        return self.loja.url_busca(quote(termo_busca, safe=''))
+
+    async def planejar_buscas(self, termos):
+        """
+        Plano das buscas por termo: busca a primeira página de todos os termos ao mesmo tempo
+        e só pagina um termo de cada grupo com os mesmos resultados, ou seja, os mesmos
+        produtos (pelo SKU/ID) na mesma ordem e o mesmo total (ex.: 'orgânico' e 'organico',
+        que a busca da loja normaliza igual). Termos com progresso no diário ficam de fora
+        da comparação e são retomados normalmente.
+        Retorna [(termo, primeira_pagina)] dos termos a paginar, com primeira_pagina =
+        (documento, produtos) ou None (a página 1 é buscada na paginação).
+        """
+        urls = {termo: self.url_primeira_pagina_do_termo(termo) for termo in termos}
+        comparaveis = [termo for termo in termos
+                       if self.diario is None or not self.diario.paginas_concluidas(urls[termo])]
+        respostas = await asyncio.gather(*(self.motor.buscar(self.buscar_pagina, urls[termo])
+                                           for termo in comparaveis))
+
+        primeiras = dict(zip(comparaveis, respostas))
+        plano = []
+        assinaturas = {}  # {(chaves da página 1, total): termo que vai ser paginado}
+        for termo in termos:
+            documento, status = primeiras.get(termo, (None, None))
+            if documento is None or status not in (200, 206):
+                plano.append((termo, None))
+                continue
+            if self.backend == 'api':
+                produtos = extrair_produtos_api(documento.conteudo)
+                total = total_de_resultados(documento.cabecalhos)
+            else:
+                produtos = await self.extrair(documento)
+                total = documento.total_de_itens()
+            assinatura = (tuple(chave_do_produto(p) for p in produtos), total)
+            if produtos and assinatura in assinaturas:
+                log.info(f"   ⏭️  '{termo}' traz os mesmos resultados de '{assinaturas[assinatura]}': sem paginar")
+                continue
+            assinaturas[assinatura] = termo
+            plano.append((termo, (documento, produtos)))
+        return plano
+
+    async def buscar_produtos_por_termo(self, termo_busca, nomes_vistos=None, primeira_pagina=None):
+        """
+        Busca produtos orgânicos por termo na busca global da loja, ex.:
+        https://www.zonasul.com.br/organico?_q={termo}&map=ft
+        `primeira_pagina`: (documento, produtos) da página 1, se já buscada pelo plano.
+        Retorna lista de produtos encontrados.
+        """
+        url_busca = self.loja.url_busca(quote(termo_busca, safe=''))
+
+        log.info(f"\n🔍 Buscando por termo: '{termo_busca}' ({self.loja.nome})")
+        log.info(f"   URL: {url_busca}")
+
+        if self.backend == 'api':
+            produtos = await coletar_paginas_api(self.url_api, self.motor, self.buscar_pagina, termo=termo_busca,
+                                                 classificar=classificar_tipo, diario=self.diario, saida=self.saida,
+                                                 telemetria=self.telemetria, primeira_pagina=primeira_pagina)
+        else:
+            produtos = await self.coletar_todas_paginas(url_busca, nomes_vistos, primeira_pagina)
+
+        log.info(f"   📊 {len(produtos)} produtos encontrados para '{termo_busca}'")
+        return produtos
+
+    async def coletar_produtos_organicos(self):
+        """
+        Coleta produtos orgânicos fazendo busca global pelos termos da loja (em paralelo).
+        Termos com os mesmos resultados de outro não são paginados (planejar_buscas), e os
+        produtos repetidos entre as buscas (pelo SKU/ID) são descartados já na junção.
+        Retorna lista de produtos orgânicos encontrados.
+        """
+        todos_produtos = self.nova_lista()
+        nomes_vistos = set()  # Para evitar duplicatas entre as buscas (lojas com deduplicar_nomes)
+
+        log.info("=" * 60)
+        log.info(f"COLETA DE PRODUTOS ORGÂNICOS ({self.loja.nome})")
+        log.info("ESTRATÉGIA: Busca Global por Termos")
+        log.info("=" * 60)
+
+        plano = await self.planejar_buscas(self.loja.termos_organicos)
+        resultados = await asyncio.gather(*(self.buscar_produtos_por_termo(termo, nomes_vistos, primeira_pagina)
+                                            for termo, primeira_pagina in plano))
+
+        # Com saída contínua os produtos já foram gravados (e a saída não repete nomes)
+        if self.saida is not None:
+            for produtos_busca in resultados:
+                todos_produtos.extend(produtos_busca)
+        else:
+            todos_produtos.extend(juntar_sem_repetidos(resultados))
+
+        log.info(f"\n{'='*60}")
+        log.info(f"TOTAL DE PRODUTOS ORGÂNICOS COLETADOS ({self.loja.nome}): {len(todos_produtos)}")
+        log.info(f"{'='*60}\n")
+
+        return todos_produtos
+
+    async def coletar_categoria(self, categoria_slug, categoria_nome):
+        url = self.loja.url_categoria(categoria_slug)
+
+        log.info(f"\n🔍 Coletando de: {categoria_nome} ({self.loja.nome})")
+        log.info(f"   URL: {url}")
+
+        # Cada categoria deduplica as próprias páginas; entre categorias a deduplicação
+        # é feita em coletar_produtos_nao_organicos, na ordem da lista
+        if self.backend == 'api':
+            produtos = await coletar_paginas_api(self.url_api, self.motor, self.buscar_pagina, categoria=categoria_slug,
+                                                 classificar=classificar_tipo, diario=self.diario, saida=self.saida,
+                                                 telemetria=self.telemetria)
+        else:
+            produtos = await self.coletar_todas_paginas(url)
+
+        if len(produtos) > 0:
+            log.info(f"   ✅ {len(produtos)} produtos encontrados em {categoria_nome}")
+        else:
+            log.info(f"   ⚠️  Nenhum produto encontrado em {categoria_nome}")
+        return produtos
+
+    async def coletar_produtos_nao_organicos(self):
+        """
+        Coleta produtos não orgânicos das categorias de alimentos da loja (em paralelo).
+        Retorna lista de produtos não orgânicos encontrados.
+        """
+        todos_produtos = self.nova_lista()
+
+        log.info("=" * 60)
+        log.info(f"COLETA DE PRODUTOS NÃO ORGÂNICOS ({self.loja.nome})")
+        log.info("ESTRATÉGIA: Categorias de Alimentos")
+        log.info("=" * 60)
+
+        # Todas as categorias em paralelo; o motor respeita os limites do host
+        resultados = await asyncio.gather(*(self.coletar_categoria(slug, nome)
+                                            for slug, nome in self.loja.categorias))
+
+        # Junta na ordem das categorias, removendo (se a loja pede) produtos já vistos em
+        # categorias anteriores. Com saída contínua os produtos já foram gravados e a
+        # saída não repete nomes
+        if self.loja.deduplicar_nomes and self.saida is None:
+            todos_produtos.extend(juntar_sem_repetidos(resultados))
+        else:
+            for produtos in resultados:
+                todos_produtos.extend(produtos)
+
+        log.info(f"\n{'='*60}")
+        log.info(f"TOTAL DE PRODUTOS NÃO ORGÂNICOS COLETADOS ({self.loja.nome}): {len(todos_produtos)}")
+        log.info(f"{'='*60}\n")
+
+        return todos_produtos
+
+    def usar_motor(self, motor):
+        """Passa a buscar pelo `motor`, com os limites da loja nos hosts da vitrine e da API"""
+        self.motor = motor
+        for url in {self.loja.url, self.url_api}:
+            motor.configurar_host(urlsplit(url).netloc, self.loja.max_por_host, self.loja.requisicoes_por_segundo,
+                                  self.loja.requisicoes_por_segundo_maxima)
+
+    async def coletar(self, motor):
+        """
+        Coleta produtos orgânicos e não orgânicos da loja em paralelo, pelo `motor` compartilhado.
+        Retorna (produtos_organicos, produtos_nao_organicos).
+        """
+        self.usar_motor(motor)
+        return await asyncio.gather(
+            self.coletar_produtos_organicos(),
+            self.coletar_produtos_nao_organicos(),
+        )
+
+    def imprimir_estatisticas(self):
+        imprimir_estatisticas_conexoes(self.sessao)
+        if self.cache is not None:
+            self.cache.imprimir_estatisticas()
+        if self.acervo is not None:
+            self.acervo.imprimir_estatisticas()
+
+
+def criar_motor():
+    """Motor de requisições compartilhado pelas lojas (limites de cada uma em Loja)"""
+    return MotorDeColeta(adaptativo=CONTROLE_TAXA != 'fixo')
+
+
+async def coletar_lojas(coletas, processos=PROCESSOS_EXTRACAO, telemetria=None, motor=None):
+    """
+    Coleta várias lojas ao mesmo tempo com um motor só (limites separados por host;
+    padrão: criar_motor()). Com `processos`, a extração das páginas vai para um pool de
+    processos compartilhado. Com `telemetria`, motor e coletas registram nela as métricas da execução.
+    Retorna [(produtos_organicos, produtos_nao_organicos), ...] na ordem de `coletas`.
+    """
+    motor = motor or criar_motor()
+    motor.telemetria = telemetria
+    extracao_paralela = ExtracaoEmProcessos(processos) if processos else None
+    for coleta in coletas:
+        coleta.extracao_paralela = extracao_paralela
+        coleta.telemetria = telemetria
+
+    try:
+        return await asyncio.gather(*(coleta.coletar(motor) for coleta in coletas))
+    finally:
+        motor.imprimir_resumo_controle()
+        if telemetria is not None:
+            telemetria.registrar_controle(motor.resumo_controle())
+        if extracao_paralela is not None:
+            extracao_paralela.imprimir_estatisticas()
+            extracao_paralela.fechar()
+
+
+def destino_da_loja(destino, loja, varias_lojas):
+    """Destino da saída contínua de uma loja: com várias lojas, cada arquivo leva o nome da loja"""
+    from azumarill.saida import SAIDA_PADRAO
+
+    if destino == SAIDA_PADRAO:
+        return destino
+    if varias_lojas and '{loja}' not in destino:
+        caminho = Path(destino)
+        destino = str(caminho.with_name(f'{caminho.stem}_{{loja}}{caminho.suffix}'))
+    return loja.arquivo_de_saida(destino)
+
+
+def salvar_brutos(produtos, caminho):
+    """Grava os produtos como coletados (nome e preço brutos, tipo, URL), um JSON por linha"""
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        for produto in produtos:
+            arquivo.write(json.dumps(produto, ensure_ascii=False) + '\n')
+    log.info(f"✅ {len(produtos)} produtos brutos salvos em {caminho}")
+
+
+def ler_brutos(caminho):
+    """Lê os produtos gravados por salvar_brutos. Retorna lista"""
+    with open(caminho, encoding='utf-8') as arquivo:
+        return [json.loads(linha) for linha in arquivo if linha.strip()]
+
+
+def filtrar_extracao_ok(coletas):
+    """Mantém só as lojas cuja página de teste trouxe produtos"""
+    aprovadas = []
+    for coleta in coletas:
+        if coleta.testar_extracao():
+            aprovadas.append(coleta)
+        elif coleta.saida is not None:
+            coleta.saida.fechar()
+    return aprovadas
+
+
+def abrir_diarios(coletas):
+    for coleta in coletas:
+        arquivo_diario = coleta.loja.arquivo_de_saida(ARQUIVO_DIARIO)
+        coleta.diario = DiarioDeColeta(arquivo_diario, coleta.loja.nome)
+        if coleta.diario.tem_progresso():
+            log.info(f"♻️  Coleta anterior interrompida encontrada em {arquivo_diario}. Retomando...\n")
+
+
+def imprimir_resumo(coleta, total):
+    log.info("\n" + "=" * 60)
+    log.info(f"RESUMO DA COLETA COMPLETA ({coleta.loja.nome})")
+    log.info("=" * 60)
+    log.info(f"Total de produtos coletados: {total}")
+    coleta.imprimir_estatisticas()
+
+
+def exportar_telemetria(telemetria, relatorio=None, prometheus=None):
+    """Fecha a telemetria da execução, mostra o resumo e grava o relatório JSON e/ou o arquivo do Prometheus"""
+    telemetria.finalizar()
+    telemetria.imprimir_resumo()
+    if relatorio:
+        telemetria.gravar_json(relatorio)
+        log.info(f"📝 Relatório da execução: {relatorio}")
+    if prometheus:
+        telemetria.gravar_prometheus(prometheus)
+        log.info(f"📝 Métricas do Prometheus: {prometheus}")
+
+
+def main_saida_continua(coletas, destino, telemetria=None):
+    """
+    Coleta gravando cada página na saída contínua da loja assim que chega (ver azumarill.saida).
+    Os logs vão para stderr, então o JSONL na saída padrão sai limpo.
+    Retorna {} (os produtos não ficam em memória).
+    """
+    from azumarill.saida import abrir_saida
+
+    varias_lojas = len(coletas) > 1
+    for coleta in coletas:
+        nome = coleta.loja.nome if varias_lojas else None
+        coleta.saida = abrir_saida(destino_da_loja(destino, coleta.loja, varias_lojas), loja=nome)
+
+    if BACKEND_EXTRACAO == 'html':
+        coletas = filtrar_extracao_ok(coletas)
+    if not coletas:
+        return {}
+    abrir_diarios(coletas)
+
+    try:
+        resultados = asyncio.run(coletar_lojas(coletas, telemetria=telemetria))
+    except KeyboardInterrupt:
+        log.warning(f"\n⛔ Coleta interrompida. O que já foi coletado está em {destino}")
+        for coleta in coletas:
+            arquivo_diario = coleta.loja.arquivo_de_saida(ARQUIVO_DIARIO)
+            log.info(f"♻️  Rode novamente para retomar a partir de {arquivo_diario}")
+            coleta.saida.fechar()
+            coleta.diario.fechar()
+        raise SystemExit(130)
+
+    for coleta, (produtos_organicos, produtos_nao_organicos) in zip(coletas, resultados):
+        total = len(produtos_organicos) + len(produtos_nao_organicos)
+        imprimir_resumo(coleta, total)
+        if telemetria is not None:
+            telemetria.registrar_produtos(coleta.loja.nome, total)
+        coleta.saida.imprimir_estatisticas()
+        coleta.saida.fechar()
+
+        coleta.diario.limpar()
+        coleta.diario.fechar()
+
+    return {}
+
+
+def salvar_produtos_da_loja(loja, produtos, brutos=False, parcial=False, historico=True):
+    """
+    Salva os produtos coletados da loja: brutos (JSONL, sem pandas) ou na planilha
+    (`parcial`: a de coleta interrompida). A planilha completa da loja inteira também
+    entra no histórico de preços (a não ser sem `historico`); a de parte da loja
+    (Loja.selecao) não, porque os produtos de fora da seleção contariam como retirados do catálogo.
+    Retorna o DataFrame da planilha (None com `brutos` ou sem produtos).
+    """
+    if brutos:
+        salvar_brutos(produtos, loja.arquivo_de_saida(ARQUIVO_BRUTO))
+        return None
+
+    from azumarill.exportacao import salvar_planilha
+
+    planilha = salvar_planilha(produtos, loja.arquivo_de_saida(ARQUIVO_PARCIAL if parcial else ARQUIVO_PLANILHA))
+    if planilha is None or parcial or not historico or not ARQUIVO_HISTORICO:
+        return planilha
+    if loja.selecao:
+        log.info(f"ℹ️  Coleta só de {loja.selecao}: o histórico de preços não é atualizado")
+        return planilha
+
+    from azumarill.historico import registrar_no_historico
+
+    registrar_no_historico(planilha, loja.nome, ARQUIVO_HISTORICO)
+    return planilha
+
+
+def main_planilha(coletas, telemetria=None, brutos=False):
+    """
+    Coleta as lojas e salva uma planilha por loja (com `brutos`, os produtos brutos em JSONL).
+    Retorna {nome_da_loja: produtos}.
+    """
+    # Primeiro, testa se consegue extrair produtos das páginas (a API não depende do HTML)
+    if BACKEND_EXTRACAO == 'html':
+        coletas = filtrar_extracao_ok(coletas)
+    if not coletas:
+        return {}
+
+    abrir_diarios(coletas)
+
+    # Coleta produtos orgânicos e não orgânicos de todas as lojas
+    try:
+        resultados = asyncio.run(coletar_lojas(coletas, telemetria=telemetria))
+    except KeyboardInterrupt:
+        log.warning("\n⛔ Coleta interrompida. Salvando o que já foi coletado...")
+        for coleta in coletas:
+            if not brutos:
+                salvar_produtos_da_loja(coleta.loja, coleta.diario.produtos(), parcial=True)
+            arquivo_diario = coleta.loja.arquivo_de_saida(ARQUIVO_DIARIO)
+            log.info(f"♻️  Rode novamente para retomar a partir de {arquivo_diario}")
+            coleta.diario.fechar()
+        raise SystemExit(130)
+
+    produtos_por_loja = {}
+    for coleta, (produtos_organicos, produtos_nao_organicos) in zip(coletas, resultados):
+        todos_produtos = produtos_organicos + produtos_nao_organicos
+        imprimir_resumo(coleta, len(todos_produtos))
+        if telemetria is not None:
+            telemetria.registrar_produtos(coleta.loja.nome, len(todos_produtos))
+
+        log.info("(A categoria Orgânico/Não Orgânico será determinada no processamento)")
+
+        # Salva na planilha (aqui determina se é orgânico ou não)
+        salvar_produtos_da_loja(coleta.loja, todos_produtos, brutos)
+
+        # Coleta completa e salva: a próxima execução começa do zero
+        coleta.diario.limpar()
+        coleta.diario.fechar()
+
+        produtos_por_loja[coleta.loja.nome] = todos_produtos
+
+    return produtos_por_loja
+
+
+def executar(lojas, saida=SAIDA_CONTINUA, brutos=False, relatorio=ARQUIVO_RELATORIO, prometheus=ARQUIVO_PROMETHEUS):
+    """
+    Coleta as `lojas` (objetos Loja, ex. Loja.com_ajustes com só algumas categorias) ao
+    mesmo tempo e salva uma planilha por loja, grava na saída contínua `saida` ou, com
+    `brutos`, salva os produtos brutos para processar depois.
+    No fim, mostra o resumo da telemetria e grava `relatorio` (JSON) e `prometheus`, se pedidos.
+    Retorna {nome_da_loja: produtos}.
+    """
+    coletas = [ColetaDaLoja(loja) for loja in lojas]
+    telemetria = Telemetria()
+
+    try:
+        if saida:
+            return main_saida_continua(coletas, saida, telemetria)
+        return main_planilha(coletas, telemetria, brutos)
+    finally:
+        exportar_telemetria(telemetria, relatorio, prometheus)
+
+
+def main(nomes_lojas=None, relatorio=ARQUIVO_RELATORIO, prometheus=ARQUIVO_PROMETHEUS):
+    """
+    Função principal - coleta produtos orgânicos e não orgânicos das lojas (todas ao
+    mesmo tempo) e salva uma planilha por loja (ou grava na saída contínua).
+    Retorna {nome_da_loja: produtos}.
+    """
+    configurar_logs()
+    lojas = [loja_do_ambiente(obter_loja(nome)) for nome in (nomes_lojas or LOJAS)]
+    return executar(lojas, relatorio=relatorio, prometheus=prometheus)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Coleta as lojas configuradas em azumarill.lojas, ao mesmo tempo')
+    parser.add_argument('lojas', nargs='*', choices=sorted(LOJAS), metavar='loja',
+                        help=f"lojas a coletar (padrão: todas; configuradas: {', '.join(LOJAS)})")
+    verbosidade = parser.add_mutually_exclusive_group()
+    verbosidade.add_argument('-v', '--verboso', action='store_const', const='debug', dest='nivel_log',
+                             help='mostra também cada página buscada')
+    verbosidade.add_argument('-q', '--silencioso', action='store_const', const='warning', dest='nivel_log',
+                             help='só avisos e erros')
+    parser.add_argument('--relatorio', default=ARQUIVO_RELATORIO, help='grava o relatório JSON da execução')
+    parser.add_argument('--prometheus', default=ARQUIVO_PROMETHEUS,
+                        help='grava as métricas no formato texto do Prometheus')
+    argumentos = parser.parse_args()
+    configurar_logs(argumentos.nivel_log)
+    main(argumentos.lojas, argumentos.relatorio, argumentos.prometheus)
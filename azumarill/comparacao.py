@@ -0,0 +1,380 @@
+"""
+Comparação de preços entre lojas: casa o mesmo produto nos catálogos de lojas diferentes.
+
+Cada produto da planilha (Nome, Quantidade, Unidade, Preço) vira uma `Assinatura`:
+- tokens do nome sem acentos, em minúsculas, sem palavras vazias ('de', 'com') nem
+  embalagem ('bandeja', 'caixa'), com plurais simples reduzidos ('congelados' -> 'congelado');
+- marca, procurada no nome contra MARCAS (expressão em trie, como no classificador);
+- tamanho em unidade base a partir de Quantidade/Unidade (1 kg -> 1000 g, 1 l -> 1000 ml).
+
+Comparar todos os pares é O(n·m) e não escala com mais lojas. Aqui o catálogo de uma
+das lojas vira um índice invertido (token -> produtos) e cada produto da outra loja só
+é comparado com quem divide algum token discriminante; tokens presentes em boa parte do
+catálogo ('frango', 'queijo') não geram candidatos, só entram na nota. A nota é o
+Jaccard ponderado por IDF dos tokens, ajustado por tamanho e marca divergentes; cada
+produto fica com no máximo um par (atribuição gulosa pela maior confiança).
+
+Uso:
+    python -m azumarill.comparacao [zonasul prezunic] [--saida comparacao_precos.csv] [--confianca-minima 0.5]
+"""
+import argparse
+import logging
+import math
+import re
+import unicodedata
+from itertools import combinations
+
+import pandas as pd
+
+from azumarill.classificador import padrao_trie
+from azumarill.lojas import LOJAS, obter_loja
+from azumarill.processamento import SEM_VALOR
+
+log = logging.getLogger('azumarill.comparacao')  # nome fixo: com python -m, __name__ é '__main__'
+
+ARQUIVO_CATALOGO = 'produtos_hortifruti_{loja}.csv'
+ARQUIVO_COMPARACAO = 'comparacao_precos.csv'
+
+CONFIANCA_MINIMA = 0.5
+
+# Palavras que não distinguem produtos
+PALAVRAS_VAZIAS = frozenset((
+    'a', 'o', 'as', 'os', 'de', 'da', 'do', 'das', 'dos', 'e', 'em', 'no', 'na', 'nos', 'nas',
+    'com', 'sem', 'ao', 'aos', 'p', 'para', 'c', 's', 'tipo',
+    # embalagem
+    'bandeja', 'caixa', 'pacote', 'pote', 'lata', 'garrafa', 'sache', 'sachet', 'pouch', 'zip',
+    'embalagem', 'vidro', 'pet', 'refil', 'kit', 'unidade', 'unidades', 'un', 'und',
+))
+
+# Marcas comuns nos catálogos; nomes em minúsculas e sem acentos
+MARCAS = (
+    'sadia', 'seara', 'perdigao', 'friboi', 'swift', 'aurora', 'pif paf', 'copacol', 'minuano',
+    'qualy', 'doriana', 'nestle', 'danone', 'itambe', 'piracanjuba', 'italac', 'parmalat', 'vigor',
+    'tirolez', 'polenghi', 'president', 'batavo', 'elege', 'quata', 'catupiry', 'yakult', 'activia',
+    'gomes da costa', 'coqueiro', 'pescador', 'camil', 'tio joao', 'urbano', 'kicaldo', 'prato fino',
+    'taeq', 'qualita', 'native', 'mae terra', 'jasmine', 'fazenda da toca', 'korin', 'yoki',
+    'pilao', 'melitta', '3 coracoes', 'tres coracoes', 'nescafe', 'cafe do ponto', 'leao',
+    'barilla', 'renata', 'adria', 'piraque', 'bauducco', 'marilan', 'vitarella', 'richester',
+    'hellmanns', 'heinz', 'quero', 'fugini', 'knorr', 'maggi', 'kitano', 'sakura', 'liza', 'soya',
+    'gallo', 'andorinha', 'borges', 'carbonell', 'bertolli', 'uniao', 'guarani', 'da barra',
+    'ceratti', 'rezende', 'pecpao', 'bassi', 'estancia 92', 'vpj', 'mr beef', 'regina', 'granfino',
+    'chinezinho', 'bom gosto', 'benassi', 'vapza', 'frutoro', 'morro alto', 'jfc', 'nescau', 'ninho',
+)
+PADRAO_MARCA = re.compile(rf"\b({padrao_trie(set(MARCAS))})\b")
+
+# Unidade base de cada unidade da planilha e o fator de conversão
+UNIDADES_BASE = {
+    'g': ('g', 1), 'kg': ('g', 1000),
+    'ml': ('ml', 1), 'l': ('ml', 1000),
+    'un': ('un', 1), 'un.': ('un', 1), 'unidade': ('un', 1), 'unidades': ('un', 1),
+}
+
+PADRAO_NAO_ALFANUMERICO = re.compile(r'[^a-z0-9]+')
+
+# Fatores sobre a nota quando tamanho ou marca não batem
+FATOR_TAMANHO_DIFERENTE = 0.5
+FATOR_TAMANHO_AUSENTE = 0.85
+FATOR_MARCA_DIFERENTE = 0.3
+
+# Um token em mais que esta fração do catálogo indexado (e em mais de MIN_FREQUENTE
+# produtos) não gera candidatos
+FRACAO_TOKEN_FREQUENTE = 0.05
+MIN_FREQUENTE = 20
+
+# Candidatos por produto que recebem a nota completa
+CANDIDATOS_POR_PRODUTO = 20
+
+
+def normalizar_texto(texto):
+    """Minúsculas, sem acentos e só letras/números separados por espaço: 'Maçã  Fuji' -> 'maca fuji'"""
+    # NFKD separa os acentos das letras e o encode descarta tudo o que não é ASCII de uma vez
+    # (bem mais rápido que remover_acentos, que testa caractere a caractere)
+    sem_acentos = unicodedata.normalize('NFKD', texto.lower()).encode('ascii', 'ignore').decode('ascii')
+    return PADRAO_NAO_ALFANUMERICO.sub(' ', sem_acentos).strip()
+
+
+def reduzir_plural(token):
+    """Plural simples: 'congelados' -> 'congelado', 'filés' já sem acento -> 'file'"""
+    if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+        return token[:-1]
+    return token
+
+
+def tokens_do_nome(nome):
+    """Tokens discriminantes do nome, sem repetição. Retorna frozenset"""
+    return frozenset(reduzir_plural(token) for token in normalizar_texto(nome).split()
+                     if token not in PALAVRAS_VAZIAS)
+
+
+def marca_do_nome(nome):
+    """Marca conhecida no nome (a mais longa, se houver várias), ou None"""
+    marcas = PADRAO_MARCA.findall(normalizar_texto(nome))
+    return max(marcas, key=len) if marcas else None
+
+
+def tamanho_normalizado(quantidade, unidade):
+    """
+    Tamanho em unidade base: ('500', 'g') -> (500.0, 'g'), ('1,5', 'l') -> (1500.0, 'ml').
+    Retorna None sem quantidade ou com unidade desconhecida.
+    """
+    if not isinstance(quantidade, str) or quantidade == SEM_VALOR or not isinstance(unidade, str):
+        return None
+    base = UNIDADES_BASE.get(unidade.strip().lower())
+    if base is None:
+        return None
+    try:
+        valor = float(quantidade.replace(',', '.'))
+    except ValueError:
+        return None
+    return (round(valor * base[1], 3), base[0])
+
+
+def formatar_tamanho(tamanho):
+    if tamanho is None:
+        return SEM_VALOR
+    valor, unidade = tamanho
+    return f"{valor:g} {unidade}"
+
+
+class Assinatura:
+    """Forma normalizada de um produto da planilha, usada na comparação"""
+
+    __slots__ = ('nome', 'preco', 'tokens', 'marca', 'tamanho', 'peso')
+
+    def __init__(self, nome, quantidade, unidade, preco):
+        self.nome = nome
+        self.preco = preco
+        self.tokens = tokens_do_nome(nome)
+        self.marca = marca_do_nome(nome)
+        self.tamanho = tamanho_normalizado(quantidade, unidade)
+        self.peso = 0.0  # soma dos IDFs dos tokens, preenchida por calcular_pesos
+
+
+def assinaturas_do_catalogo(df):
+    """
+    Assinaturas dos produtos de uma planilha (DataFrame com Nome, Quantidade, Unidade, Preço).
+    O mesmo produto aparece em várias buscas e categorias: fica uma assinatura por
+    (Nome, Quantidade, Unidade). Retorna lista de Assinatura.
+    """
+    distintos = df.drop_duplicates(subset=['Nome', 'Quantidade', 'Unidade'])
+    assinaturas = []
+    for nome, quantidade, unidade, preco in zip(distintos['Nome'], distintos['Quantidade'],
+                                                 distintos['Unidade'], distintos['Preço']):
+        if isinstance(nome, str) and nome != SEM_VALOR:
+            assinaturas.append(Assinatura(nome, quantidade, unidade, pd.to_numeric(preco, errors='coerce')))
+    return assinaturas
+
+
+def calcular_idf(*catalogos):
+    """IDF de cada token sobre todos os catálogos juntos. Retorna {token: idf}"""
+    frequencia = {}
+    total = 0
+    for catalogo in catalogos:
+        for assinatura in catalogo:
+            total += 1
+            for token in assinatura.tokens:
+                frequencia[token] = frequencia.get(token, 0) + 1
+    return {token: math.log(1 + total / quantidade) for token, quantidade in frequencia.items()}
+
+
+def calcular_pesos(catalogo, idf):
+    for assinatura in catalogo:
+        assinatura.peso = sum(idf[token] for token in assinatura.tokens)
+
+
+def confianca(a, b, idf):
+    """
+    Nota de 0 a 1 de que `a` e `b` são o mesmo produto: Jaccard dos tokens ponderado
+    por IDF, reduzido quando o tamanho ou a marca não batem.
+    """
+    comum = sum(idf[token] for token in a.tokens & b.tokens)
+    if not comum:
+        return 0.0
+    nota = comum / (a.peso + b.peso - comum)
+
+    if a.tamanho is not None and b.tamanho is not None:
+        if a.tamanho != b.tamanho:
+            nota *= FATOR_TAMANHO_DIFERENTE
+    elif a.tamanho is not None or b.tamanho is not None:
+        nota *= FATOR_TAMANHO_AUSENTE
+
+    if a.marca and b.marca and a.marca != b.marca:
+        nota *= FATOR_MARCA_DIFERENTE
+    return nota
+
+
+class IndiceInvertido:
+    """
+    Índice token -> posições dos produtos de um catálogo.
+    Tokens frequentes demais ficam à parte e não geram candidatos, a não ser para
+    nomes que só têm tokens frequentes.
+    """
+
+    def __init__(self, catalogo, idf):
+        self.catalogo = catalogo
+        self.idf = idf
+        postings = {}
+        for posicao, assinatura in enumerate(catalogo):
+            for token in assinatura.tokens:
+                postings.setdefault(token, []).append(posicao)
+        limite = max(MIN_FREQUENTE, int(len(catalogo) * FRACAO_TOKEN_FREQUENTE))
+        self.postings = {token: posicoes for token, posicoes in postings.items() if len(posicoes) <= limite}
+        self.frequentes = {token: posicoes for token, posicoes in postings.items() if len(posicoes) > limite}
+
+    def candidatos(self, assinatura, limite=CANDIDATOS_POR_PRODUTO):
+        """
+        Posições dos produtos que dividem tokens indexados com `assinatura`, os
+        `limite` com maior Jaccard estimado pelos tokens em comum. Um nome só com tokens frequentes
+        ('Morango') usa o menos frequente deles. Retorna lista de posições.
+        """
+        tokens = [token for token in assinatura.tokens if token in self.postings]
+        if not tokens:
+            frequentes = [token for token in assinatura.tokens if token in self.frequentes]
+            if not frequentes:
+                return []
+            token = min(frequentes, key=lambda t: len(self.frequentes[t]))
+            return list(self.frequentes[token])
+
+        acumulado = {}
+        for token in tokens:
+            posicoes = self.postings[token]
+            peso = self.idf[token]
+            for posicao in posicoes:
+                acumulado[posicao] = acumulado.get(posicao, 0.0) + peso
+        if len(acumulado) <= limite:
+            return list(acumulado)
+
+        # Jaccard estimado só com os tokens indexados: entre candidatos com o mesmo
+        # peso em comum, os nomes mais curtos ficam na frente
+        catalogo = self.catalogo
+
+        def estimativa(posicao):
+            comum = acumulado[posicao]
+            return comum / (assinatura.peso + catalogo[posicao].peso - comum)
+        return sorted(acumulado, key=estimativa, reverse=True)[:limite]
+
+
+def pares_candidatos(catalogo_a, catalogo_b, idf, confianca_minima=CONFIANCA_MINIMA):
+    """
+    Pares (confiança, posição em a, posição em b) acima da confiança mínima, usando o
+    índice invertido do catálogo b. Retorna lista.
+    """
+    indice = IndiceInvertido(catalogo_b, idf)
+    pares = []
+    for posicao_a, a in enumerate(catalogo_a):
+        for posicao_b in indice.candidatos(a):
+            nota = confianca(a, catalogo_b[posicao_b], idf)
+            if nota >= confianca_minima:
+                pares.append((nota, posicao_a, posicao_b))
+    return pares
+
+
+def todos_os_pares(catalogo_a, catalogo_b, idf, confianca_minima=CONFIANCA_MINIMA):
+    """Mesmo resultado de pares_candidatos comparando todos com todos (referência, O(n·m))"""
+    return [(nota, posicao_a, posicao_b)
+            for posicao_a, a in enumerate(catalogo_a)
+            for posicao_b, b in enumerate(catalogo_b)
+            if (nota := confianca(a, b, idf)) >= confianca_minima]
+
+
+def atribuir(pares):
+    """Cada produto de cada lado em no máximo um par, escolhendo as maiores confianças primeiro"""
+    usados_a = set()
+    usados_b = set()
+    escolhidos = []
+    for nota, posicao_a, posicao_b in sorted(pares, key=lambda par: (-par[0], par[1], par[2])):
+        if posicao_a in usados_a or posicao_b in usados_b:
+            continue
+        usados_a.add(posicao_a)
+        usados_b.add(posicao_b)
+        escolhidos.append((nota, posicao_a, posicao_b))
+    return escolhidos
+
+
+COLUNAS_COMPARACAO = ['Loja A', 'Nome A', 'Tamanho A', 'Preço A', 'Loja B', 'Nome B', 'Tamanho B', 'Preço B',
+                      'Diferença (%)', 'Confiança']
+
+
+def diferenca_percentual(preco_a, preco_b):
+    if pd.isna(preco_a) or pd.isna(preco_b) or not preco_a:
+        return None
+    return round((preco_b - preco_a) / preco_a * 100, 1)
+
+
+def casar_catalogos(loja_a, df_a, loja_b, df_b, confianca_minima=CONFIANCA_MINIMA, indexado=True):
+    """
+    Casa os produtos de duas planilhas. Retorna DataFrame com um par por linha: loja, nome,
+    tamanho e preço de cada lado, diferença de preço (% sobre a loja A) e a confiança.
+    """
+    catalogo_a = assinaturas_do_catalogo(df_a)
+    catalogo_b = assinaturas_do_catalogo(df_b)
+    idf = calcular_idf(catalogo_a, catalogo_b)
+    calcular_pesos(catalogo_a, idf)
+    calcular_pesos(catalogo_b, idf)
+
+    buscar_pares = pares_candidatos if indexado else todos_os_pares
+    linhas = []
+    for nota, posicao_a, posicao_b in atribuir(buscar_pares(catalogo_a, catalogo_b, idf, confianca_minima)):
+        a = catalogo_a[posicao_a]
+        b = catalogo_b[posicao_b]
+        linhas.append({
+            'Loja A': loja_a, 'Nome A': a.nome, 'Tamanho A': formatar_tamanho(a.tamanho), 'Preço A': a.preco,
+            'Loja B': loja_b, 'Nome B': b.nome, 'Tamanho B': formatar_tamanho(b.tamanho), 'Preço B': b.preco,
+            'Diferença (%)': diferenca_percentual(a.preco, b.preco),
+            'Confiança': round(nota, 3),
+        })
+    return pd.DataFrame(linhas, columns=COLUNAS_COMPARACAO)
+
+
+def comparar_lojas(catalogos, confianca_minima=CONFIANCA_MINIMA):
+    """
+    Compara cada par de lojas de {loja: DataFrame da planilha}.
+    Retorna um DataFrame com todos os pares casados, do mais confiável para o menos.
+    """
+    tabelas = []
+    for (loja_a, df_a), (loja_b, df_b) in combinations(catalogos.items(), 2):
+        tabela = casar_catalogos(loja_a, df_a, loja_b, df_b, confianca_minima)
+        log.info(f"🔗 {loja_a} x {loja_b}: {len(tabela)} produtos casados")
+        tabelas.append(tabela)
+    if not tabelas:
+        return pd.DataFrame(columns=COLUNAS_COMPARACAO)
+    comparacao = pd.concat(tabelas, ignore_index=True)
+    return comparacao.sort_values(['Confiança', 'Nome A'], ascending=[False, True], ignore_index=True)
+
+
+def ler_catalogo(caminho):
+    """Planilha CSV gravada pela coleta, com todas as colunas como texto"""
+    return pd.read_csv(caminho, dtype=str, keep_default_na=False, encoding='utf-8-sig')
+
+
+def main(nomes_lojas=None, saida=ARQUIVO_COMPARACAO, confianca_minima=CONFIANCA_MINIMA):
+    """Lê as planilhas CSV das lojas e grava a tabela de comparação. Retorna o DataFrame"""
+    catalogos = {}
+    for nome in nomes_lojas or LOJAS:
+        caminho = obter_loja(nome).arquivo(ARQUIVO_CATALOGO)
+        try:
+            catalogos[nome] = ler_catalogo(caminho)
+        except FileNotFoundError:
+            log.warning(f"⚠️  {caminho} não encontrado: rode a coleta de {nome} antes")
+    if len(catalogos) < 2:
+        log.error("❌ São necessárias as planilhas de pelo menos duas lojas para comparar")
+        return None
+
+    comparacao = comparar_lojas(catalogos, confianca_minima)
+    comparacao.to_csv(saida, index=False, encoding='utf-8-sig')
+    log.info(f"💾 {len(comparacao)} pares gravados em {saida}")
+    return comparacao
+
+
+if __name__ == '__main__':
+    from azumarill.telemetria import configurar_logs
+
+    parser = argparse.ArgumentParser(description='Casa os produtos das planilhas das lojas e compara os preços')
+    parser.add_argument('lojas', nargs='*', choices=sorted(LOJAS), metavar='loja',
+                        help=f"lojas a comparar (padrão: todas; configuradas: {', '.join(LOJAS)})")
+    parser.add_argument('--saida', default=ARQUIVO_COMPARACAO, help=f'arquivo CSV (padrão: {ARQUIVO_COMPARACAO})')
+    parser.add_argument('--confianca-minima', type=float, default=CONFIANCA_MINIMA,
+                        help=f'descarta pares com confiança menor (padrão: {CONFIANCA_MINIMA})')
+    argumentos = parser.parse_args()
+    configurar_logs()
+    main(argumentos.lojas, argumentos.saida, argumentos.confianca_minima)
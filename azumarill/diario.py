@@ -0,0 +1,94 @@
+"""
+Diário de coleta (checkpoint) em SQLite.
+
+Cada página concluída é gravada com seus produtos assim que termina, e cada
+categoria/busca é marcada quando chega ao fim. Se o processo cair no meio,
+a próxima execução retoma da última página concluída em vez de recomeçar, e
+os produtos já coletados podem ser salvos como saída parcial.
+"""
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+
+class DiarioDeColeta:
+    """
+    Registro persistente do progresso de uma coleta.
+    As chamadas são feitas a partir do laço de eventos (uma thread só).
+    """
+
+    def __init__(self, caminho, loja):
+        self.caminho = Path(caminho)
+        self.loja = loja
+        self._conexao = sqlite3.connect(self.caminho)
+        self._conexao.execute('PRAGMA journal_mode=WAL')
+        self._conexao.executescript('''
+            CREATE TABLE IF NOT EXISTS paginas (
+                loja TEXT NOT NULL,
+                url_base TEXT NOT NULL,
+                pagina INTEGER NOT NULL,
+                url TEXT NOT NULL,
+                produtos TEXT NOT NULL,
+                concluida_em REAL NOT NULL,
+                PRIMARY KEY (loja, url_base, pagina)
+            );
+            CREATE TABLE IF NOT EXISTS categorias (
+                loja TEXT NOT NULL,
+                url_base TEXT NOT NULL,
+                concluida_em REAL NOT NULL,
+                PRIMARY KEY (loja, url_base)
+            );
+        ''')
+        self._conexao.commit()
+
+    def tem_progresso(self):
+        """True se há páginas de uma coleta anterior não finalizada"""
+        linha = self._conexao.execute('SELECT 1 FROM paginas WHERE loja = ? LIMIT 1', (self.loja,)).fetchone()
+        return linha is not None
+
+    def paginas_concluidas(self, url_base):
+        """
+        Páginas já concluídas de uma categoria/busca, em ordem.
+        Retorna lista de (pagina, url, produtos).
+        """
+        linhas = self._conexao.execute(
+            'SELECT pagina, url, produtos FROM paginas WHERE loja = ? AND url_base = ? ORDER BY pagina',
+            (self.loja, url_base)).fetchall()
+        return [(pagina, url, json.loads(produtos)) for pagina, url, produtos in linhas]
+
+    def registrar_pagina(self, url_base, pagina, url, produtos):
+        """Grava uma página concluída e seus produtos"""
+        self._conexao.execute(
+            'INSERT OR REPLACE INTO paginas VALUES (?, ?, ?, ?, ?, ?)',
+            (self.loja, url_base, pagina, url, json.dumps(produtos, ensure_ascii=False), time.time()))
+        self._conexao.commit()
+
+    def categoria_concluida(self, url_base):
+        linha = self._conexao.execute(
+            'SELECT 1 FROM categorias WHERE loja = ? AND url_base = ?', (self.loja, url_base)).fetchone()
+        return linha is not None
+
+    def concluir_categoria(self, url_base):
+        """Marca a categoria/busca como coletada até o fim"""
+        self._conexao.execute('INSERT OR REPLACE INTO categorias VALUES (?, ?, ?)',
+                              (self.loja, url_base, time.time()))
+        self._conexao.commit()
+
+    def produtos(self):
+        """Todos os produtos registrados até agora, na ordem em que foram coletados"""
+        linhas = self._conexao.execute(
+            'SELECT produtos FROM paginas WHERE loja = ? ORDER BY concluida_em', (self.loja,)).fetchall()
+        todos = []
+        for (produtos,) in linhas:
+            todos.extend(json.loads(produtos))
+        return todos
+
+    def limpar(self):
+        """Apaga o progresso da loja (coleta concluída: a próxima começa do zero)"""
+        self._conexao.execute('DELETE FROM paginas WHERE loja = ?', (self.loja,))
+        self._conexao.execute('DELETE FROM categorias WHERE loja = ?', (self.loja,))
+        self._conexao.commit()
+
+    def fechar(self):
+        self._conexao.close()
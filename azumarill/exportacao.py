@@ -0,0 +1,202 @@
+"""
+Exportação da planilha: `salvar_planilha` (CSV, Excel e formatos tipados) e seus gravadores.
+
+A planilha (CSV/XLSX) guarda preço e quantidade como texto, com "-" para ausente.
+Para análise, `tabela_tipada` converte para tipos de verdade (preço e quantidade
+float com NaN para ausente, Categoria/Tipo/Unidade categóricas) e `salvar_parquet`
+/ `salvar_arrow` gravam com pyarrow (opcional). O Arrow IPC sai sem compressão,
+então pode ser mapeado em memória direto (`pyarrow.memory_map` + `ipc.open_file`);
+o Parquet pode ser lido com `pq.read_table(..., memory_map=True)`.
+`exportar_planilha` converte depois uma planilha CSV já gravada para um desses formatos.
+
+O Excel é gravado com o openpyxl em modo write-only: as linhas vão para o arquivo
+à medida que são adicionadas, sem manter a pasta de trabalho inteira em memória.
+"""
+import logging
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+from azumarill.processamento import COLUNAS_PLANILHA, SEM_VALOR, processar_dados_para_planilha
+
+log = logging.getLogger(__name__)
+
+COLUNAS_CATEGORICAS = ('Unidade', 'Categoria', 'Tipo')
+
+
+def pyarrow_disponivel():
+    return pa is not None
+
+
+def tabela_tipada(df):
+    """
+    Converte o DataFrame da planilha (colunas de texto) para tipos de análise.
+    Retorna DataFrame com Preço/Quantidade float e Unidade/Categoria/Tipo categóricas.
+    """
+    tipado = pd.DataFrame({'Nome': df['Nome'].astype('string')})
+    tipado['Quantidade'] = pd.to_numeric(df['Quantidade'].str.replace(',', '.', regex=False), errors='coerce')
+    tipado['Unidade'] = df['Unidade'].where(df['Unidade'] != SEM_VALOR)
+    tipado['Preço'] = pd.to_numeric(df['Preço'], errors='coerce')
+    tipado['Categoria'] = df['Categoria']
+    tipado['Tipo'] = df['Tipo']
+
+    for coluna in COLUNAS_CATEGORICAS:
+        tipado[coluna] = tipado[coluna].astype('category')
+    return tipado[COLUNAS_PLANILHA]
+
+
+def _tabela_arrow(df):
+    return pa.Table.from_pandas(tabela_tipada(df), preserve_index=False)
+
+
+def salvar_parquet(df, caminho):
+    """Grava a planilha tipada em Parquet. Requer pyarrow"""
+    pq.write_table(_tabela_arrow(df), caminho)
+
+
+def salvar_arrow(df, caminho):
+    """Grava a planilha tipada em Arrow IPC (Feather v2) sem compressão, para mapear em memória. Requer pyarrow"""
+    feather.write_feather(_tabela_arrow(df), caminho, compression='uncompressed')
+
+
+def salvar_excel(df, caminho, nome_aba='Sheet1'):
+    """Grava a planilha em XLSX com o openpyxl em modo write-only (linha a linha)"""
+    from openpyxl import Workbook
+
+    pasta = Workbook(write_only=True)
+    aba = pasta.create_sheet(nome_aba)
+    aba.append(list(df.columns))
+    for linha in df.itertuples(index=False, name=None):
+        aba.append(linha)
+    pasta.save(caminho)
+
+
+def salvar_planilha(produtos, nome_arquivo):
+    """
+    Salva os produtos coletados em planilhas Excel e CSV e, com pyarrow instalado,
+    em Parquet e Arrow com colunas tipadas (preço/quantidade numéricos).
+    Colunas: Nome, Quantidade, Unidade, Preço, Categoria, Tipo Produto
+    Retorna o DataFrame gravado (None sem produtos), ex. para o histórico de preços.
+    """
+    if not produtos:
+        log.error("❌ Nenhum produto para salvar!")
+        return
+    
+    log.info("\n" + "=" * 60)
+    log.info("PROCESSANDO DADOS PARA PLANILHA")
+    log.info("=" * 60)
+    
+    # Processa os dados (já em DataFrame)
+    df = processar_dados_para_planilha(produtos)
+    
+    # Remove duplicatas (baseado no nome)
+    total_processado = len(df)
+    df = df.drop_duplicates(subset=['Nome'], keep='first')
+    
+    if len(df) < total_processado:
+        log.info(f"⚠️  {total_processado - len(df)} produtos duplicados removidos")
+    
+    # Ordena por categoria, tipo e nome
+    df = df.sort_values(['Categoria', 'Tipo', 'Nome']).reset_index(drop=True)
+    
+    # Gera nome do arquivo CSV
+    nome_csv = nome_arquivo.replace('.xlsx', '.csv')
+    
+    # Salva em CSV (sempre)
+    try:
+        df.to_csv(nome_csv, index=False, encoding='utf-8-sig')
+        log.info(f"\n✅ Planilha CSV salva com sucesso: {nome_csv}")
+    except Exception as e:
+        log.error(f"❌ Erro ao salvar CSV: {e}")
+        nome_csv = None
+    
+    # Salva em Excel (se possível), linha a linha no modo write-only do openpyxl
+    excel_salvo = False
+    try:
+        salvar_excel(df, nome_arquivo)
+        log.info(f"✅ Planilha Excel salva com sucesso: {nome_arquivo}")
+        excel_salvo = True
+    except ImportError:
+        log.warning("⚠️  openpyxl não está instalado. CSV salvo, mas Excel não foi gerado.")
+        log.info("💡 Para salvar em Excel, instale: pip install openpyxl")
+    except Exception as e:
+        log.warning(f"⚠️  Erro ao salvar Excel: {e}")
+        log.info("✅ CSV foi salvo com sucesso")
+    
+    # Salva versões tipadas para análise (se o pyarrow estiver instalado)
+    arquivos_tipados = []
+    if pyarrow_disponivel():
+        for extensao, salvar in (('.parquet', salvar_parquet), ('.arrow', salvar_arrow)):
+            nome_tipado = nome_arquivo.replace('.xlsx', extensao)
+            try:
+                salvar(df, nome_tipado)
+                log.info(f"✅ Tabela tipada salva com sucesso: {nome_tipado}")
+                arquivos_tipados.append(nome_tipado)
+            except Exception as e:
+                log.warning(f"⚠️  Erro ao salvar {nome_tipado}: {e}")
+    else:
+        log.info("💡 Para gerar também Parquet/Arrow tipados, instale: pip install pyarrow")
+    
+    # Mostra resumo
+    log.info(f"\n📊 Total de produtos únicos: {len(df)}")
+    
+    log.info("\n📈 Resumo por categoria:")
+    resumo = df['Categoria'].value_counts()
+    for categoria, count in resumo.items():
+        log.info(f"   - {categoria}: {count}")
+    
+    log.info("\n📈 Resumo por tipo:")
+    resumo_tipo = df['Tipo'].value_counts()
+    for tipo, count in resumo_tipo.items():
+        log.info(f"   - {tipo}: {count}")
+    
+    # Resumo final dos arquivos gerados
+    log.info("\n" + "=" * 60)
+    log.info("ARQUIVOS GERADOS:")
+    if excel_salvo:
+        log.info(f"   ✅ {nome_arquivo}")
+    if nome_csv:
+        log.info(f"   ✅ {nome_csv}")
+    for nome_tipado in arquivos_tipados:
+        log.info(f"   ✅ {nome_tipado}")
+    log.info("=" * 60)
+    return df
+
+
+def salvar_jsonl(df, caminho):
+    """Grava a planilha em JSONL, um objeto por produto, com os mesmos textos do CSV"""
+    df.to_json(caminho, orient='records', lines=True, force_ascii=False)
+
+
+# Formatos de exportar_planilha: {extensão: gravador(df, caminho)}
+FORMATOS_EXPORTACAO = {
+    'xlsx': salvar_excel,
+    'parquet': salvar_parquet,
+    'arrow': salvar_arrow,
+    'jsonl': salvar_jsonl,
+}
+
+
+def exportar_planilha(caminho_csv, formato, destino=None):
+    """
+    Converte a planilha CSV gravada pela coleta para outro formato de FORMATOS_EXPORTACAO,
+    em `destino` ou ao lado do CSV com a extensão do formato.
+    Retorna o caminho gravado.
+    """
+    from azumarill.comparacao import ler_catalogo
+
+    if formato not in FORMATOS_EXPORTACAO:
+        raise ValueError(f"Formato desconhecido: {formato!r} (disponíveis: {', '.join(FORMATOS_EXPORTACAO)})")
+    if formato in ('parquet', 'arrow') and not pyarrow_disponivel():
+        raise ImportError(f"pyarrow não está instalado (necessário para {formato}): pip install pyarrow")
+    destino = destino or str(Path(caminho_csv).with_suffix(f'.{formato}'))
+    FORMATOS_EXPORTACAO[formato](ler_catalogo(caminho_csv), destino)
+    log.info(f"✅ {caminho_csv} exportada para {destino}")
+    return destino
@@ -0,0 +1,267 @@
+"""
+Extratores de produtos das páginas das vitrines VTEX.
+
+Cada loja declara a sua cadeia de extratores (ver azumarill.lojas): o primeiro que
+encontrar produtos na página vence. O JSON-LD é lido direto dos bytes; a árvore HTML
+só é montada quando a cadeia chega ao extrator de HTML.
+
+O extrator de HTML da cadeia ('html') usa seletores XPath pré-compilados sobre a
+árvore lxml da página e devolve o mesmo que `extrair_produtos_html` (BeautifulSoup
+com funções Python testando a classe de cada tag), que continua disponível como
+'html_bs4'.
+"""
+import json
+import logging
+import re
+
+from bs4 import BeautifulSoup
+from lxml import etree
+
+from azumarill.pagina import PaginaBruta
+
+log = logging.getLogger(__name__)
+
+
+def _id_do_produto(item):
+    """Identificador do produto no JSON-LD (SKU, productID ou mpn), ou None"""
+    identificador = item.get('sku') or item.get('productID') or item.get('mpn')
+    return str(identificador) if identificador else None
+
+
+def extrair_produtos_jsonld(pagina):
+    """
+    Extrai produtos do JSON-LD estruturado, com o SKU da loja em 'id' quando houver.
+    Aceita uma PaginaBruta (blocos lidos direto dos bytes, sem montar a árvore)
+    ou um BeautifulSoup já montado.
+    """
+    produtos = []
+    
+    # Procura scripts JSON-LD
+    if isinstance(pagina, BeautifulSoup):
+        blocos = [script.string for script in pagina.find_all('script', type='application/ld+json')]
+    else:
+        blocos = pagina.blocos_jsonld()
+    
+    for bloco in blocos:
+        try:
+            data = json.loads(bloco)
+            
+            # Verifica se é uma lista de produtos
+            if data.get('@type') == 'ItemList' and 'itemListElement' in data:
+                for item in data['itemListElement']:
+                    produto_item = item.get('item', {})
+                    
+                    if produto_item.get('@type') == 'Product':
+                        nome = produto_item.get('name', '')
+                        preco_info = produto_item.get('offers', {})
+                        
+                        # Tenta pegar o preço
+                        preco = None
+                        if isinstance(preco_info, dict):
+                            preco = preco_info.get('price') or preco_info.get('lowPrice')
+                        
+                        if nome:
+                            produtos.append({
+                                'nome_bruto': nome,
+                                'preco_bruto': preco,
+                                'id': _id_do_produto(produto_item),
+                            })
+        except json.JSONDecodeError:
+            continue
+        except Exception as e:
+            log.error(f"Erro ao processar JSON-LD: {e}")
+            continue
+    
+    return produtos
+
+
+def extrair_produtos_html(soup):
+    """
+    Extrai produtos diretamente do HTML.
+    Procura por elementos comuns de produtos em sites de e-commerce.
+    """
+    produtos = []
+    
+    # Prezunic usa VTEX, então vamos procurar por classes comuns do VTEX
+    # Classes comuns: vtex-product-summary-2-x-container, vtex-product-summary-2-x-nameContainer, etc.
+    
+    # Procura por containers de produtos
+    containers_produto = soup.find_all(['div', 'article', 'section'], 
+                                      class_=lambda x: x and ('product' in str(x).lower() or 
+                                                             'summary' in str(x).lower() or
+                                                             'item' in str(x).lower()))
+    
+    if len(containers_produto) == 0:
+        # Tenta procurar por links de produtos
+        links_produto = soup.find_all('a', href=re.compile(r'/produto|/p/|/product'))
+        
+        for link in links_produto:
+            # Tenta encontrar o nome do produto próximo ao link
+            container = link.find_parent(['div', 'article', 'section'])
+            if container:
+                # Procura por nome do produto
+                nome_elem = container.find(['h2', 'h3', 'span', 'div'], 
+                                          class_=lambda x: x and ('name' in str(x).lower() or 
+                                                                 'title' in str(x).lower()))
+                if not nome_elem:
+                    nome_elem = link
+                
+                nome = nome_elem.get_text(strip=True) if nome_elem else link.get_text(strip=True)
+                
+                # Procura por preço
+                preco_elem = container.find(['span', 'div', 'p'], 
+                                           class_=lambda x: x and ('price' in str(x).lower() or 
+                                                                   'valor' in str(x).lower()))
+                preco = None
+                if preco_elem:
+                    preco_texto = preco_elem.get_text(strip=True)
+                    # Extrai número do preço
+                    match_preco = re.search(r'R\$\s*(\d+[.,]\d+)', preco_texto)
+                    if match_preco:
+                        preco = match_preco.group(1).replace(',', '.')
+                
+                if nome:
+                    produtos.append({
+                        'nome_bruto': nome,
+                        'preco_bruto': preco
+                    })
+    
+    # Se ainda não encontrou, tenta procurar por imagens de produtos (alt text geralmente tem o nome)
+    if len(produtos) == 0:
+        imagens_produto = soup.find_all('img', alt=True, 
+                                       class_=lambda x: x and ('product' in str(x).lower() or 
+                                                              'image' in str(x).lower()))
+        
+        for img in imagens_produto:
+            nome = img.get('alt', '').strip()
+            if nome and len(nome) > 5:  # Nome deve ter pelo menos alguns caracteres
+                # Tenta encontrar preço próximo
+                container = img.find_parent(['div', 'article', 'section'])
+                preco = None
+                if container:
+                    preco_elem = container.find(['span', 'div', 'p'], 
+                                               class_=lambda x: x and 'price' in str(x).lower())
+                    if preco_elem:
+                        preco_texto = preco_elem.get_text(strip=True)
+                        match_preco = re.search(r'R\$\s*(\d+[.,]\d+)', preco_texto)
+                        if match_preco:
+                            preco = match_preco.group(1).replace(',', '.')
+                
+                produtos.append({
+                    'nome_bruto': nome,
+                    'preco_bruto': preco
+                })
+    
+    return produtos
+
+
+def _classe_contem(*palavras):
+    """Condição XPath: o atributo class contém alguma das palavras, sem diferenciar maiúsculas"""
+    classe = "translate(@class, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+    return ' or '.join(f"contains({classe}, '{palavra}')" for palavra in palavras)
+
+
+# Os mesmos critérios de extrair_produtos_html. As varreduras do documento inteiro usam
+# iter() do lxml (filtro de tag em C) e param no primeiro container; as buscas dentro de
+# cada produto são XPaths compilados uma vez
+TAGS_CONTAINER = ('div', 'article', 'section')
+PALAVRAS_CONTAINER = ('product', 'summary', 'item')
+PALAVRAS_IMAGEM = ('product', 'image')
+XPATH_LINKS_PRODUTO = etree.XPath(
+    "//a[contains(@href, '/produto') or contains(@href, '/p/') or contains(@href, '/product')]")
+XPATH_CONTAINER = etree.XPath("ancestor::*[self::div or self::article or self::section][1]")
+XPATH_NOME = etree.XPath(f"(.//*[self::h2 or self::h3 or self::span or self::div][{_classe_contem('name', 'title')}])[1]")
+XPATH_PRECO_LINK = etree.XPath(f"(.//*[self::span or self::div or self::p][{_classe_contem('price', 'valor')}])[1]")
+XPATH_PRECO_IMAGEM = etree.XPath(f"(.//*[self::span or self::div or self::p][{_classe_contem('price')}])[1]")
+XPATH_TEXTOS = etree.XPath(".//text()")
+
+PADRAO_PRECO = re.compile(r'R\$\s*(\d+[.,]\d+)')
+
+
+def _tem_classe(elemento, palavras):
+    """A classe do elemento contém alguma das palavras (sem diferenciar maiúsculas)"""
+    classe = elemento.get('class')
+    if not classe:
+        return False
+    classe = classe.lower()
+    return any(palavra in classe for palavra in palavras)
+
+
+def _texto(elemento):
+    """Texto do elemento como get_text(strip=True) do BeautifulSoup"""
+    return ''.join(texto.strip() for texto in XPATH_TEXTOS(elemento))
+
+
+def _preco(container, seletor):
+    if container is None:
+        return None
+    elementos = seletor(container)
+    if not elementos:
+        return None
+    match_preco = PADRAO_PRECO.search(_texto(elementos[0]))
+    return match_preco.group(1).replace(',', '.') if match_preco else None
+
+
+def extrair_produtos_seletores(pagina):
+    """
+    Extrai produtos do HTML com os critérios de extrair_produtos_html, numa árvore lxml
+    (PaginaBruta ou elemento lxml) e com seletores pré-compilados.
+    """
+    arvore = pagina.arvore if isinstance(pagina, PaginaBruta) else pagina
+    produtos = []
+
+    # Sem containers de produto: procura links de produtos
+    if not any(_tem_classe(elemento, PALAVRAS_CONTAINER) for elemento in arvore.iter(*TAGS_CONTAINER)):
+        for link in XPATH_LINKS_PRODUTO(arvore):
+            containers = XPATH_CONTAINER(link)
+            if not containers:
+                continue
+            container = containers[0]
+            nomes = XPATH_NOME(container)
+            nome = _texto(nomes[0] if nomes else link)
+            if nome:
+                produtos.append({'nome_bruto': nome, 'preco_bruto': _preco(container, XPATH_PRECO_LINK)})
+
+    # Imagens de produtos (o alt geralmente tem o nome)
+    if len(produtos) == 0:
+        for img in arvore.iter('img'):
+            if img.get('alt') is None or not _tem_classe(img, PALAVRAS_IMAGEM):
+                continue
+            nome = img.get('alt').strip()
+            if nome and len(nome) > 5:
+                containers = XPATH_CONTAINER(img)
+                produtos.append({
+                    'nome_bruto': nome,
+                    'preco_bruto': _preco(containers[0] if containers else None, XPATH_PRECO_IMAGEM),
+                })
+
+    return produtos
+
+
+def _extrair_html_da_pagina(pagina):
+    soup = pagina.soup if isinstance(pagina, PaginaBruta) else pagina
+    return extrair_produtos_html(soup)
+
+
+# Extratores disponíveis para as cadeias das lojas, por nome
+EXTRATORES = {
+    'jsonld': extrair_produtos_jsonld,
+    'html': extrair_produtos_seletores,
+    'html_bs4': _extrair_html_da_pagina,
+}
+
+# Prioridade padrão: JSON-LD > HTML
+CADEIA_PADRAO = ('jsonld', 'html')
+
+
+def extrair_produtos(pagina, cadeia=CADEIA_PADRAO):
+    """
+    Tenta extrair produtos com os extratores da cadeia, na ordem.
+    Retorna a lista do primeiro que encontrar produtos (ou lista vazia).
+    """
+    produtos = []
+    for nome in cadeia:
+        produtos = EXTRATORES[nome](pagina)
+        if produtos:
+            break
+    return produtos
@@ -0,0 +1,631 @@
+"""
+Fila de tarefas durável para dividir a coleta entre processos e máquinas.
+
+Em vez de um processo só percorrendo lojas, categorias e páginas, a unidade de trabalho
+é uma tarefa (loja, categoria ou termo de busca, página) numa fila SQLite:
+- `semear` põe na fila a página 1 de cada termo orgânico e categoria das lojas
+- qualquer número de trabalhadores (`trabalhar`, num processo ou em vários, na mesma
+  máquina ou em outras que vejam o mesmo sistema de arquivos, com travas de arquivo
+  funcionando) reserva tarefas com prazo (lease), busca e extrai a página, grava os
+  produtos no seu diário de resultados (JSONL só de acréscimos, um arquivo por
+  trabalhador) e só depois marca a tarefa como concluída. A página 1 que informa o
+  total põe na fila todas as restantes; sem total, cada página põe a seguinte, até
+  uma vazia ou repetida.
+- trabalhador que morre deixa o lease vencer e a tarefa volta a ser reservada por outro
+  (até MAX_TENTATIVAS tentativas; depois fica como 'falhou')
+- `juntar` lê os diários, monta os produtos de cada loja na ordem da coleta normal
+  (termos e categorias na ordem da Loja, páginas em ordem, mesmas deduplicações) e salva
+  a planilha como azumarill.coleta (`salvar_produtos_da_loja`)
+
+Uma tarefa pode ser processada duas vezes (lease vencido de um trabalhador lento): o
+diário aceita as duas e `juntar` fica com a primeira. Os limites de cortesia da Loja
+valem por trabalhador: N trabalhadores fazem até N vezes mais requisições por host.
+
+Uso:
+    python -m azumarill.fila semear [zonasul prezunic] [--novo]
+    python -m azumarill.fila trabalhar [--processos 4] [--concorrencia 4] [--lease 120]
+    python -m azumarill.fila situacao
+    python -m azumarill.fila juntar [zonasul prezunic]
+Todos aceitam --fila <arquivo.sqlite> (padrão: AZUMARILL_FILA ou fila_coleta.sqlite) e
+--backend html|api (padrão: AZUMARILL_BACKEND); os diários de resultados ficam em <fila>.resultados/.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import socket
+import sqlite3
+import time
+import uuid
+from pathlib import Path
+from urllib.parse import quote
+
+from azumarill.coleta import (BACKEND_EXTRACAO, ColetaDaLoja, chave_do_produto, criar_motor, juntar_sem_repetidos,
+                              loja_do_ambiente, salvar_produtos_da_loja, url_api_da_loja)
+from azumarill.lojas import LOJAS, obter_loja
+from azumarill.paginacao import montar_url_pagina, sondar_formatos
+from azumarill.telemetria import configurar_logs
+from azumarill.vtex import (ITENS_POR_JANELA, MAX_JANELAS, STATUS_OK, extrair_produtos_api, total_de_resultados,
+                            url_busca_api)
+
+log = logging.getLogger('azumarill.fila')  # nome fixo: com python -m, __name__ é '__main__'
+
+ARQUIVO_FILA = os.environ.get('AZUMARILL_FILA', 'fila_coleta.sqlite')
+
+LEASE_PADRAO = 120.0  # segundos; cobre uma página com todas as retentativas da sessão
+MAX_TENTATIVAS = 5
+ESPERA_SEM_TAREFA = 0.5  # segundos entre consultas quando só há tarefas reservadas por outros
+
+# Tipos de tarefa
+ORGANICO = 'organico'  # busca por um termo orgânico da loja
+CATEGORIA = 'categoria'
+
+FORMATO_JANELA = 'janela'  # "formato de paginação" das tarefas da API: a página é a janela _from/_to
+
+COLUNAS_TAREFA = ('id', 'loja', 'backend', 'tipo', 'ordem', 'url_base', 'pagina', 'formato', 'ultima_pagina')
+
+
+def pasta_de_resultados(caminho_fila):
+    """Diretório dos diários de resultados de uma fila"""
+    return Path(f'{caminho_fila}.resultados')
+
+
+def url_base_da_tarefa(loja, tipo, chave, backend):
+    """URL da página 1 de um termo orgânico ou categoria (com a do ambiente, se houver)"""
+    if backend == 'api':
+        if tipo == ORGANICO:
+            return url_busca_api(url_api_da_loja(loja), termo=chave)
+        return url_busca_api(url_api_da_loja(loja), categoria=chave)
+    if tipo == ORGANICO:
+        return loja.url_busca(quote(chave, safe=''))
+    return loja.url_categoria(chave)
+
+
+def url_da_janela(url_base, janela):
+    """URL da janela `janela` (1, 2, ...) da API a partir da URL da primeira"""
+    inicio = (janela - 1) * ITENS_POR_JANELA
+    return url_base.replace('_from=0&_to=49', f'_from={inicio}&_to={inicio + ITENS_POR_JANELA - 1}')
+
+
+class FilaDeTarefas:
+    """
+    Tarefas da coleta num banco SQLite compartilhado pelos trabalhadores.
+    Reservar, concluir e devolver são transações curtas; cada processo tem a sua conexão.
+    """
+
+    def __init__(self, caminho=ARQUIVO_FILA):
+        self.caminho = Path(caminho)
+        # Autocommit: as transações são abertas explicitamente com BEGIN IMMEDIATE
+        self._conexao = sqlite3.connect(self.caminho, timeout=30, isolation_level=None)
+        self._conexao.execute('PRAGMA journal_mode=WAL')
+        self._conexao.executescript('''
+            CREATE TABLE IF NOT EXISTS tarefas (
+                id INTEGER PRIMARY KEY,
+                loja TEXT NOT NULL,
+                backend TEXT NOT NULL,
+                tipo TEXT NOT NULL,
+                ordem INTEGER NOT NULL,
+                url_base TEXT NOT NULL,
+                pagina INTEGER NOT NULL,
+                formato TEXT,
+                ultima_pagina INTEGER,
+                estado TEXT NOT NULL DEFAULT 'pendente',
+                tentativas INTEGER NOT NULL DEFAULT 0,
+                dono TEXT,
+                lease_ate REAL,
+                assinatura TEXT,
+                produtos INTEGER,
+                erro TEXT,
+                UNIQUE (loja, url_base, pagina)
+            );
+            CREATE INDEX IF NOT EXISTS tarefas_estado ON tarefas (estado, lease_ate);
+        ''')
+
+    def _transacao(self, funcao, *args):
+        """Roda `funcao(*args)` numa transação de escrita. Retorna o resultado dela"""
+        self._conexao.execute('BEGIN IMMEDIATE')
+        try:
+            resultado = funcao(*args)
+        except BaseException:
+            self._conexao.execute('ROLLBACK')
+            raise
+        self._conexao.execute('COMMIT')
+        return resultado
+
+    def semear(self, lojas, backend=BACKEND_EXTRACAO):
+        """Põe na fila a página 1 dos termos orgânicos e categorias das lojas. Retorna quantas entraram"""
+        tarefas = []
+        for loja in lojas:
+            chaves = [(ORGANICO, ordem, termo) for ordem, termo in enumerate(loja.termos_organicos)]
+            chaves += [(CATEGORIA, ordem, slug) for ordem, (slug, _) in enumerate(loja.categorias)]
+            for tipo, ordem, chave in chaves:
+                tarefas.append((loja.nome, backend, tipo, ordem, url_base_da_tarefa(loja, tipo, chave, backend),
+                                1, loja.formato_paginacao))
+
+        def inserir():
+            antes = self._conexao.total_changes
+            self._conexao.executemany(
+                'INSERT OR IGNORE INTO tarefas (loja, backend, tipo, ordem, url_base, pagina, formato) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)', tarefas)
+            return self._conexao.total_changes - antes
+        return self._transacao(inserir)
+
+    def reservar(self, dono, lease=LEASE_PADRAO):
+        """
+        Reserva a próxima tarefa pendente (ou com lease vencido) por `lease` segundos.
+        Páginas menores primeiro, para descobrir cedo o total de cada categoria.
+        Retorna dict com COLUNAS_TAREFA ou None se não houver tarefa livre.
+        """
+        def reservar():
+            agora = time.time()
+            # Lease vencido na última tentativa: a tarefa desiste
+            self._conexao.execute(
+                "UPDATE tarefas SET estado = 'falhou', erro = 'lease vencido', dono = NULL, lease_ate = NULL "
+                "WHERE estado = 'em_andamento' AND lease_ate < ? AND tentativas >= ?", (agora, MAX_TENTATIVAS))
+            return self._conexao.execute(
+                f"UPDATE tarefas SET estado = 'em_andamento', dono = ?, lease_ate = ?, tentativas = tentativas + 1 "
+                f"WHERE id = (SELECT id FROM tarefas WHERE estado = 'pendente' "
+                f"            OR (estado = 'em_andamento' AND lease_ate < ?) ORDER BY pagina, id LIMIT 1) "
+                f"RETURNING {', '.join(COLUNAS_TAREFA)}", (dono, agora + lease, agora)).fetchone()
+        linha = self._transacao(reservar)
+        return dict(zip(COLUNAS_TAREFA, linha)) if linha is not None else None
+
+    def concluir(self, tarefa, assinatura, produtos, novas_paginas=()):
+        """
+        Marca a tarefa como concluída e põe na fila as `novas_paginas` [(pagina, formato,
+        ultima_pagina)] da mesma categoria, na mesma transação.
+        """
+        def concluir():
+            self._conexao.execute(
+                "UPDATE tarefas SET estado = 'concluida', assinatura = ?, produtos = ?, lease_ate = NULL, erro = NULL "
+                "WHERE id = ?", (assinatura, produtos, tarefa['id']))
+            self._conexao.executemany(
+                'INSERT OR IGNORE INTO tarefas (loja, backend, tipo, ordem, url_base, pagina, formato, ultima_pagina) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                [(tarefa['loja'], tarefa['backend'], tarefa['tipo'], tarefa['ordem'], tarefa['url_base'],
+                  pagina, formato, ultima_pagina) for pagina, formato, ultima_pagina in novas_paginas])
+        self._transacao(concluir)
+
+    def devolver(self, tarefa, dono, erro):
+        """Libera a tarefa que falhou para outra tentativa (ou a marca como 'falhou' na última)"""
+        self._transacao(lambda: self._conexao.execute(
+            "UPDATE tarefas SET estado = CASE WHEN tentativas >= ? THEN 'falhou' ELSE 'pendente' END, "
+            "dono = NULL, lease_ate = NULL, erro = ? WHERE id = ? AND dono = ?",
+            (MAX_TENTATIVAS, erro, tarefa['id'], dono)))
+
+    def assinatura(self, loja, url_base, pagina):
+        """Assinatura (nomes) da página concluída, ou None"""
+        linha = self._conexao.execute(
+            "SELECT assinatura FROM tarefas WHERE loja = ? AND url_base = ? AND pagina = ? AND estado = 'concluida'",
+            (loja, url_base, pagina)).fetchone()
+        return linha[0] if linha is not None else None
+
+    def tem_trabalho(self):
+        """True se ainda há tarefas pendentes ou em andamento (que podem pôr novas páginas na fila)"""
+        linha = self._conexao.execute(
+            "SELECT 1 FROM tarefas WHERE estado IN ('pendente', 'em_andamento') LIMIT 1").fetchone()
+        return linha is not None
+
+    def contagens(self, lojas=None):
+        """Retorna {loja: {estado: tarefas}} e, em '_produtos', {loja: produtos nas páginas concluídas}"""
+        linhas = self._conexao.execute(
+            'SELECT loja, estado, COUNT(*), COALESCE(SUM(produtos), 0) FROM tarefas GROUP BY loja, estado').fetchall()
+        contagens = {'_produtos': {}}
+        for loja, estado, tarefas, produtos in linhas:
+            if lojas is not None and loja not in lojas:
+                continue
+            contagens.setdefault(loja, {})[estado] = tarefas
+            contagens['_produtos'][loja] = contagens['_produtos'].get(loja, 0) + produtos
+        return contagens
+
+    def limpar(self):
+        """Apaga todas as tarefas"""
+        self._transacao(lambda: self._conexao.execute('DELETE FROM tarefas'))
+
+    def fechar(self):
+        self._conexao.close()
+
+
+class DiarioDeResultados:
+    """
+    Diário de resultados de um trabalhador: um JSON por página concluída, só acrescentado.
+    Cada linha vai para o disco (fsync) antes de a tarefa ser marcada como concluída.
+    """
+
+    def __init__(self, pasta, dono):
+        self.pasta = Path(pasta)
+        self.pasta.mkdir(parents=True, exist_ok=True)
+        self._arquivo = open(self.pasta / f'{dono}.jsonl', 'a', encoding='utf-8')
+
+    def registrar(self, tarefa, url, produtos):
+        registro = {'tarefa': tarefa['id'], 'loja': tarefa['loja'], 'backend': tarefa['backend'],
+                    'tipo': tarefa['tipo'], 'ordem': tarefa['ordem'], 'url_base': tarefa['url_base'],
+                    'pagina': tarefa['pagina'], 'url': url, 'produtos': produtos}
+        self._arquivo.write(json.dumps(registro, ensure_ascii=False) + '\n')
+        self._arquivo.flush()
+        os.fsync(self._arquivo.fileno())
+
+    def fechar(self):
+        self._arquivo.close()
+
+
+def ler_resultados(pasta):
+    """Registros de todos os diários da pasta (a linha cortada de um trabalhador que morreu é ignorada)"""
+    for caminho in sorted(Path(pasta).glob('*.jsonl')):
+        with open(caminho, encoding='utf-8') as arquivo:
+            for linha in arquivo:
+                try:
+                    yield json.loads(linha)
+                except ValueError:
+                    continue
+
+
+def assinatura_da_pagina(produtos):
+    """Nomes da página, para detectar a página repetida (vitrine que ignora a paginação)"""
+    return json.dumps(sorted({p['nome_bruto'] for p in produtos}), ensure_ascii=False)
+
+
+class TrabalhadorDaFila:
+    """
+    Processa tarefas da fila até ela esvaziar, com `concorrencia` tarefas ao mesmo tempo
+    pelo motor de coleta (limites por host da Loja, controle de taxa).
+    """
+
+    def __init__(self, fila, pasta, concorrencia=4, lease=LEASE_PADRAO, dono=None):
+        self.fila = fila
+        self.concorrencia = concorrencia
+        self.lease = lease
+        self.dono = dono or f'{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}'
+        self.diario = DiarioDeResultados(pasta, self.dono)
+        self.motor = None
+        self.coletas = {}  # {(loja, backend): ColetaDaLoja}
+        self.paginas = 0
+        self.falhas = 0
+
+    def coleta_da_tarefa(self, tarefa):
+        """ColetaDaLoja (sessão, extratores, memória de paginação) da loja da tarefa"""
+        chave = (tarefa['loja'], tarefa['backend'])
+        if chave not in self.coletas:
+            coleta = ColetaDaLoja(loja_do_ambiente(obter_loja(tarefa['loja'])), backend=tarefa['backend'])
+            coleta.usar_motor(self.motor)
+            self.coletas[chave] = coleta
+        return self.coletas[chave]
+
+    async def executar(self):
+        """Retorna o número de páginas processadas por este trabalhador"""
+        self.motor = criar_motor()
+        log.info(f"👷 Trabalhador {self.dono}: {self.concorrencia} tarefas ao mesmo tempo")
+        try:
+            await asyncio.gather(*(self._vaga() for _ in range(self.concorrencia)))
+        finally:
+            self.diario.fechar()
+        log.info(f"👷 Trabalhador {self.dono}: {self.paginas} páginas, {self.falhas} falhas")
+        return self.paginas
+
+    async def _vaga(self):
+        while True:
+            tarefa = self.fila.reservar(self.dono, self.lease)
+            if tarefa is None:
+                if not self.fila.tem_trabalho():
+                    return
+                await asyncio.sleep(ESPERA_SEM_TAREFA)  # outras tarefas ainda podem pôr páginas na fila
+                continue
+            try:
+                await self.processar(tarefa)
+            except Exception as e:
+                log.error(f"❌ Tarefa {tarefa['id']} ({tarefa['url_base']}, página {tarefa['pagina']}): {e}")
+                self.falhas += 1
+                self.fila.devolver(tarefa, self.dono, repr(e))
+
+    async def processar(self, tarefa):
+        coleta = self.coleta_da_tarefa(tarefa)
+        if tarefa['backend'] == 'api':
+            url, documento, status, produtos, formato = await self._buscar_janela(coleta, tarefa)
+            ok = documento is not None and status in STATUS_OK
+        else:
+            url, documento, status, produtos, formato = await self._buscar_pagina(coleta, tarefa)
+            ok = documento is not None and status == 200
+        if not ok:
+            self.falhas += 1
+            log.error(f"❌ Erro ou página não encontrada: {url} (status {status})")
+            self.fila.devolver(tarefa, self.dono, f'status {status}')
+            return
+
+        api = tarefa['backend'] == 'api'
+        pagina = tarefa['pagina']
+        ultima_pagina = tarefa['ultima_pagina']
+        if pagina == 1 and produtos:
+            if api:
+                total, por_pagina = total_de_resultados(documento.cabecalhos), ITENS_POR_JANELA
+            else:
+                total, por_pagina = documento.total_de_itens(), len(produtos)
+            # Como em coletar_todas_paginas: o total só vale se passa da página
+            if total is not None and total > len(produtos):
+                ultima_pagina = -(-total // por_pagina)
+
+        # As mesmas paradas da coleta: na API, a janela incompleta é a última (e entra);
+        # na vitrine, a página vazia ou igual à anterior encerra (e não entra)
+        assinatura = assinatura_da_pagina(produtos)
+        if api:
+            fim = len(produtos) < ITENS_POR_JANELA
+            registrar = len(produtos) > 0
+        else:
+            fim = len(produtos) == 0 or assinatura == self.fila.assinatura(
+                tarefa['loja'], tarefa['url_base'], pagina - 1)
+            registrar = not fim
+        if registrar:
+            coleta.classificar(produtos, url)
+            self.diario.registrar(tarefa, url, produtos)
+
+        if fim:
+            novas = []
+        elif api:
+            novas = self._proximas_paginas(MAX_JANELAS, tarefa, FORMATO_JANELA, ultima_pagina)
+        else:
+            novas = self._proximas_paginas(coleta.loja.max_paginas, tarefa, formato, ultima_pagina)
+        self.fila.concluir(tarefa, assinatura, len(produtos) if registrar else 0, novas)
+        self.paginas += 1
+
+    def _proximas_paginas(self, limite, tarefa, formato, ultima_pagina):
+        """
+        Páginas que esta tarefa põe na fila: todas as restantes (até `limite`) quando o
+        total e o formato de paginação são conhecidos, só pela tarefa que conheceu os dois;
+        senão só a seguinte. Retorna [(pagina, formato, ultima_pagina)].
+        """
+        pagina = tarefa['pagina']
+        if ultima_pagina is not None:
+            if formato is None:  # a página 2 detecta o formato e põe as outras
+                return [(2, None, ultima_pagina)] if pagina == 1 and ultima_pagina >= 2 else []
+            if pagina > 1 and tarefa['formato'] is not None:
+                return []  # já postas pela página 1 ou pela que detectou o formato
+            ate = min(ultima_pagina, limite)
+            return [(seguinte, formato, ultima_pagina) for seguinte in range(pagina + 1, ate + 1)]
+        if pagina >= limite:
+            log.warning(f"⚠️  Limite máximo de {limite} páginas atingido em {tarefa['url_base']}")
+            return []
+        return [(pagina + 1, formato, None)]
+
+    async def _buscar_pagina(self, coleta, tarefa):
+        """
+        Busca e extrai uma página da vitrine; na primeira página sem formato conhecido
+        detecta o formato como coletar_todas_paginas.
+        Retorna (url, documento, status, produtos, formato das próximas páginas).
+        """
+        url_base, pagina, formato = tarefa['url_base'], tarefa['pagina'], tarefa['formato']
+        documento = produtos = status = None
+        if pagina == 1:
+            url = url_base
+        else:
+            if formato is None:
+                formato = coleta.memoria_paginacao.obter(url_base)
+            if formato is None:
+                formato, url, documento, status, produtos = await sondar_formatos(
+                    self.motor, coleta.buscar_pagina, coleta.extrair, url_base, pagina)
+                if formato is not None:
+                    log.info(f"   ✅ Formato de paginação detectado: {formato}")
+                    coleta.memoria_paginacao.registrar(url_base, formato)
+                else:
+                    formato = 'page'
+            else:
+                url = montar_url_pagina(url_base, formato, pagina)
+
+        if documento is None:
+            documento, status = await self.motor.buscar(coleta.buscar_pagina, url)
+        if documento is not None and status == 200 and produtos is None:
+            produtos = await coleta.extrair(documento)
+        return url, documento, status, produtos, formato
+
+    async def _buscar_janela(self, coleta, tarefa):
+        """Busca e decodifica uma janela da API. Retorna (url, documento, status, produtos, None)"""
+        url = url_da_janela(tarefa['url_base'], tarefa['pagina'])
+        documento, status = await self.motor.buscar(coleta.buscar_pagina, url)
+        produtos = extrair_produtos_api(documento.conteudo) if documento is not None else None
+        return url, documento, status, produtos, None
+
+
+def produtos_das_paginas(paginas, nomes_vistos, deduplicar):
+    """
+    Produtos de uma categoria/busca da vitrine a partir de {pagina: produtos}, com as regras
+    de coletar_todas_paginas: para na primeira página que falta (erro), vazia ou repetida
+    e, com `deduplicar`, descarta produtos já vistos (em `nomes_vistos`) e para numa
+    página só de repetidos.
+    Retorna lista de produtos.
+    """
+    produtos = []
+    nomes_anteriores = None
+    numero = 1
+    while paginas.get(numero):
+        pagina = paginas[numero]
+        nomes = {p['nome_bruto'] for p in pagina}
+        if nomes == nomes_anteriores:
+            break
+        nomes_anteriores = nomes
+        if deduplicar:
+            novos = []
+            for produto in pagina:
+                chave = chave_do_produto(produto)
+                if chave[1] and chave not in nomes_vistos:
+                    nomes_vistos.add(chave)
+                    novos.append(produto)
+            if not novos:
+                break
+            pagina = novos
+        produtos.extend(pagina)
+        numero += 1
+    return produtos
+
+
+def produtos_das_janelas(janelas):
+    """
+    Produtos de uma categoria/busca da API a partir de {janela: produtos}, com as regras
+    de coletar_paginas_api: para na primeira janela que falta e depois da incompleta.
+    Retorna lista de produtos.
+    """
+    produtos = []
+    numero = 1
+    while numero in janelas:
+        produtos.extend(janelas[numero])
+        if len(janelas[numero]) < ITENS_POR_JANELA:
+            break
+        numero += 1
+    return produtos
+
+
+def juntar(caminho_fila=ARQUIVO_FILA, nomes_lojas=None, backend=BACKEND_EXTRACAO):
+    """
+    Junta os diários de resultados e salva a planilha de cada loja (com o histórico de
+    preços, como a coleta). Com tarefas ainda na fila, salva a planilha parcial.
+    Retorna {nome_da_loja: produtos}.
+    """
+    nomes_lojas = list(nomes_lojas or LOJAS)
+    fila = FilaDeTarefas(caminho_fila)
+    try:
+        contagens = fila.contagens(nomes_lojas)
+    finally:
+        fila.fechar()
+
+    # {(loja, tipo, ordem): {pagina: produtos}}; de uma tarefa repetida fica o primeiro registro
+    resultados = {}
+    for registro in ler_resultados(pasta_de_resultados(caminho_fila)):
+        if registro['backend'] != backend:
+            continue
+        paginas = resultados.setdefault((registro['loja'], registro['tipo'], registro['ordem']), {})
+        paginas.setdefault(registro['pagina'], registro['produtos'])
+
+    produtos_por_loja = {}
+    for nome in nomes_lojas:
+        loja = obter_loja(nome)
+        estados = contagens.get(nome, {})
+        if not estados:
+            log.warning(f"⚠️  Nenhuma tarefa de {nome} na fila")
+            continue
+
+        # Mesmas deduplicações da coleta: na vitrine, com `deduplicar_nomes`, página a página
+        # (entre as buscas orgânicas e dentro de cada categoria); na junção, sempre entre as
+        # buscas orgânicas e entre as categorias só com `deduplicar_nomes`
+        nomes_vistos = set()
+        if backend == 'api':
+            def produtos_de(tipo, ordem, _vistos):
+                return produtos_das_janelas(resultados.get((nome, tipo, ordem), {}))
+        else:
+            def produtos_de(tipo, ordem, vistos):
+                return produtos_das_paginas(resultados.get((nome, tipo, ordem), {}), vistos, loja.deduplicar_nomes)
+        organicos = juntar_sem_repetidos(produtos_de(ORGANICO, ordem, nomes_vistos)
+                                         for ordem in range(len(loja.termos_organicos)))
+        por_categoria = [produtos_de(CATEGORIA, ordem, set()) for ordem in range(len(loja.categorias))]
+        if loja.deduplicar_nomes:
+            nao_organicos = juntar_sem_repetidos(por_categoria)
+        else:
+            nao_organicos = [produto for produtos in por_categoria for produto in produtos]
+        todos_produtos = organicos + nao_organicos
+
+        incompleta = estados.get('pendente', 0) + estados.get('em_andamento', 0)
+        if estados.get('falhou'):
+            log.warning(f"⚠️  {nome}: {estados['falhou']} tarefas falharam (as categorias param na página com erro)")
+        log.info(f"🧩 {nome}: {len(organicos)} orgânicos e {len(nao_organicos)} não orgânicos "
+                 f"de {estados.get('concluida', 0)} páginas")
+        if incompleta:
+            log.warning(f"⚠️  {nome}: {incompleta} tarefas ainda na fila, salvando a planilha parcial")
+        salvar_produtos_da_loja(loja, todos_produtos, parcial=bool(incompleta))
+        produtos_por_loja[nome] = todos_produtos
+    return produtos_por_loja
+
+
+def semear(caminho_fila=ARQUIVO_FILA, nomes_lojas=None, novo=False, backend=BACKEND_EXTRACAO):
+    """Põe as lojas na fila (com `novo`, apaga antes a fila e os diários). Retorna quantas tarefas entraram"""
+    fila = FilaDeTarefas(caminho_fila)
+    try:
+        if novo:
+            fila.limpar()
+            shutil.rmtree(pasta_de_resultados(caminho_fila), ignore_errors=True)
+        lojas = [loja_do_ambiente(obter_loja(nome)) for nome in (nomes_lojas or LOJAS)]
+        novas = fila.semear(lojas, backend)
+    finally:
+        fila.fechar()
+    log.info(f"🌱 {novas} tarefas novas na fila {caminho_fila} ({', '.join(l.nome for l in lojas)}, backend {backend})")
+    return novas
+
+
+def trabalhar(caminho_fila=ARQUIVO_FILA, concorrencia=4, lease=LEASE_PADRAO, nivel_log=None):
+    """Roda um trabalhador até a fila esvaziar. Retorna o número de páginas processadas"""
+    configurar_logs(nivel_log)
+    fila = FilaDeTarefas(caminho_fila)
+    try:
+        trabalhador = TrabalhadorDaFila(fila, pasta_de_resultados(caminho_fila), concorrencia, lease)
+        return asyncio.run(trabalhador.executar())
+    finally:
+        fila.fechar()
+
+
+def trabalhar_em_processos(processos, caminho_fila=ARQUIVO_FILA, concorrencia=4, lease=LEASE_PADRAO,
+                           nivel_log=None):
+    """Roda `processos` trabalhadores em processos separados e espera todos terminarem"""
+    contexto = multiprocessing.get_context('spawn')
+    trabalhadores = [contexto.Process(target=trabalhar, args=(caminho_fila, concorrencia, lease, nivel_log))
+                     for _ in range(processos)]
+    for processo in trabalhadores:
+        processo.start()
+    for processo in trabalhadores:
+        processo.join()
+    return [processo.exitcode for processo in trabalhadores]
+
+
+def imprimir_situacao(caminho_fila=ARQUIVO_FILA):
+    fila = FilaDeTarefas(caminho_fila)
+    try:
+        contagens = fila.contagens()
+    finally:
+        fila.fechar()
+    produtos = contagens.pop('_produtos')
+    if not contagens:
+        print(f"Fila {caminho_fila} vazia")
+    for loja, estados in sorted(contagens.items()):
+        resumo = ', '.join(f"{estado} {n}" for estado, n in sorted(estados.items()))
+        print(f"{loja}: {resumo} ({produtos.get(loja, 0)} produtos)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Coleta dividida numa fila de tarefas entre vários trabalhadores')
+    parser.add_argument('--fila', default=ARQUIVO_FILA, help=f'banco SQLite da fila (padrão: {ARQUIVO_FILA})')
+    parser.add_argument('--backend', choices=('html', 'api'), default=BACKEND_EXTRACAO,
+                        help=f'raspagem das páginas ou API do VTEX (padrão: {BACKEND_EXTRACAO})')
+    parser.add_argument('-v', '--verboso', action='store_const', const='debug', dest='nivel_log')
+    comandos = parser.add_subparsers(dest='comando', required=True)
+
+    comando_semear = comandos.add_parser('semear', help='põe na fila a primeira página de cada categoria e busca')
+    comando_semear.add_argument('lojas', nargs='*', choices=sorted(LOJAS), metavar='loja')
+    comando_semear.add_argument('--novo', action='store_true', help='apaga a fila e os resultados anteriores')
+
+    comando_trabalhar = comandos.add_parser('trabalhar', help='processa tarefas até a fila esvaziar')
+    comando_trabalhar.add_argument('--processos', type=int, default=1, help='trabalhadores nesta máquina')
+    comando_trabalhar.add_argument('--concorrencia', type=int, default=4, help='tarefas ao mesmo tempo por trabalhador')
+    comando_trabalhar.add_argument('--lease', type=float, default=LEASE_PADRAO,
+                                   help='segundos até uma tarefa reservada voltar para a fila')
+
+    comandos.add_parser('situacao', help='tarefas por loja e estado')
+
+    comando_juntar = comandos.add_parser('juntar', help='junta os resultados e salva as planilhas')
+    comando_juntar.add_argument('lojas', nargs='*', choices=sorted(LOJAS), metavar='loja')
+
+    argumentos = parser.parse_args()
+    configurar_logs(argumentos.nivel_log)
+
+    if argumentos.comando == 'semear':
+        semear(argumentos.fila, argumentos.lojas, argumentos.novo, argumentos.backend)
+    elif argumentos.comando == 'trabalhar':
+        if argumentos.processos > 1:
+            trabalhar_em_processos(argumentos.processos, argumentos.fila, argumentos.concorrencia,
+                                   argumentos.lease, argumentos.nivel_log)
+        else:
+            trabalhar(argumentos.fila, argumentos.concorrencia, argumentos.lease, argumentos.nivel_log)
+    elif argumentos.comando == 'situacao':
+        imprimir_situacao(argumentos.fila)
+    else:
+        juntar(argumentos.fila, argumentos.lojas, argumentos.backend)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,350 @@
+"""
+Histórico de preços em SQLite, compacto: uma linha por faixa de preço, não por coleta.
+
+Cada coleta sobrescreve a planilha da loja. Aqui cada produto (loja + nome normalizado +
+quantidade + unidade) tem faixas [valido_de, valido_ate) com um preço; enquanto o preço
+não muda, a faixa aberta (valido_ate NULL) continua valendo e a coleta não grava nada
+para o produto. Quando o preço muda, a faixa é fechada na data da coleta e outra é
+aberta; produto que some do catálogo tem a faixa fechada. Duas coletas no mesmo dia
+corrigem a faixa do dia em vez de abrir outra. Preços ficam em centavos (inteiros).
+
+A ingestão (`registrar`) recebe o DataFrame de `salvar_planilha` e trabalha por conjunto:
+os produtos da coleta vão para uma tabela temporária e cada passo (fechar, corrigir,
+abrir) é um único UPDATE/INSERT. Índices:
+- produtos (loja, nome_normalizado, quantidade, unidade) e (nome_normalizado): "preço de X"
+- precos (produto, valido_de): faixas de um produto em ordem
+- precos (valido_de) e (valido_ate): "o que mudou hoje" sem varrer o histórico
+- precos (produto) só das faixas abertas: preço atual
+
+Uso:
+    python -m azumarill.historico importar produtos_hortifruti_zonasul.csv --loja zonasul [--data 2025-01-31]
+    python -m azumarill.historico produto "Maçã Fuji" [--loja zonasul] [--dias 90] [--prefixo]
+    python -m azumarill.historico alteracoes [--data 2025-01-31] [--loja zonasul]
+"""
+import argparse
+import datetime
+import logging
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+
+from azumarill.comparacao import normalizar_texto
+from azumarill.processamento import SEM_VALOR
+
+log = logging.getLogger('azumarill.historico')  # nome fixo: com python -m, __name__ é '__main__'
+
+ARQUIVO_HISTORICO = 'historico_precos.sqlite'
+
+DIAS_PADRAO = 90
+
+COLUNAS_HISTORICO = ['Loja', 'Nome', 'Quantidade', 'Unidade', 'Preço', 'Válido de', 'Válido até']
+COLUNAS_ALTERACOES = ['Loja', 'Nome', 'Quantidade', 'Unidade', 'Preço anterior', 'Preço', 'Variação (%)']
+
+
+def como_data(data):
+    """date, datetime ou 'AAAA-MM-DD' (None = hoje). Retorna 'AAAA-MM-DD'"""
+    if data is None:
+        return datetime.date.today().isoformat()
+    if isinstance(data, datetime.datetime):
+        return data.date().isoformat()
+    if isinstance(data, datetime.date):
+        return data.isoformat()
+    return datetime.date.fromisoformat(data).isoformat()
+
+
+def centavos(preco):
+    """'24.99' -> 2499; None para preço ausente ou inválido"""
+    if preco is None or preco == SEM_VALOR:
+        return None
+    try:
+        return round(float(preco) * 100)
+    except (ValueError, TypeError):
+        return None
+
+
+class HistoricoDePrecos:
+    """
+    Histórico de preços de todas as lojas num banco SQLite.
+    As chamadas são feitas de uma thread só (o fim da coleta ou as consultas).
+    """
+
+    def __init__(self, caminho=ARQUIVO_HISTORICO):
+        self.caminho = Path(caminho)
+        self._conexao = sqlite3.connect(self.caminho)
+        self._conexao.execute('PRAGMA journal_mode=WAL')
+        self._conexao.executescript('''
+            CREATE TABLE IF NOT EXISTS produtos (
+                id INTEGER PRIMARY KEY,
+                loja TEXT NOT NULL,
+                nome_normalizado TEXT NOT NULL,
+                quantidade TEXT NOT NULL,
+                unidade TEXT NOT NULL,
+                nome TEXT NOT NULL,
+                UNIQUE (loja, nome_normalizado, quantidade, unidade)
+            );
+            CREATE INDEX IF NOT EXISTS produtos_nome ON produtos (nome_normalizado);
+
+            CREATE TABLE IF NOT EXISTS precos (
+                produto INTEGER NOT NULL REFERENCES produtos (id),
+                centavos INTEGER NOT NULL,
+                valido_de TEXT NOT NULL,
+                valido_ate TEXT,
+                PRIMARY KEY (produto, valido_de)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS precos_valido_de ON precos (valido_de);
+            CREATE INDEX IF NOT EXISTS precos_valido_ate ON precos (valido_ate);
+            CREATE UNIQUE INDEX IF NOT EXISTS precos_abertos ON precos (produto) WHERE valido_ate IS NULL;
+
+            CREATE TABLE IF NOT EXISTS ingestoes (
+                loja TEXT NOT NULL,
+                data TEXT NOT NULL,
+                produtos INTEGER NOT NULL,
+                novos INTEGER NOT NULL,
+                alterados INTEGER NOT NULL,
+                removidos INTEGER NOT NULL,
+                PRIMARY KEY (loja, data)
+            );
+        ''')
+        self._conexao.commit()
+
+    # Ingestão
+
+    def registrar(self, df, loja, data=None):
+        """
+        Registra a planilha de uma coleta (DataFrame de salvar_planilha: Nome, Quantidade,
+        Unidade, Preço) como o catálogo da loja em `data` (padrão: hoje).
+        Retorna dict com a data e as contagens do dia (várias coletas no mesmo dia
+        acumulam): produtos, novos, alterados e removidos.
+        """
+        data = como_data(data)
+        ultima = self._conexao.execute('SELECT MAX(data) FROM ingestoes WHERE loja = ?', (loja,)).fetchone()[0]
+        if ultima is not None and data < ultima:
+            raise ValueError(f"O histórico de {loja} já vai até {ultima}; não dá para registrar {data} antes disso")
+
+        linhas = {}
+        colunas = (df[coluna].tolist() for coluna in ('Nome', 'Quantidade', 'Unidade', 'Preço'))
+        for nome, quantidade, unidade, preco in zip(*colunas):
+            valor = centavos(preco)
+            if not isinstance(nome, str) or nome == SEM_VALOR or valor is None:
+                continue
+            chave = (normalizar_texto(nome), str(quantidade), str(unidade))
+            linhas.setdefault(chave, (nome, valor))  # como na planilha: fica o primeiro
+
+        conexao = self._conexao
+        parametros = {'loja': loja, 'data': data}
+        with conexao:
+            # A coleta vai inteira para uma tabela temporária; daí em diante tudo é SQL por conjunto
+            conexao.execute('DROP TABLE IF EXISTS temp.coleta')
+            conexao.execute('CREATE TEMP TABLE coleta (nome_normalizado, quantidade, unidade, nome, centavos)')
+            conexao.executemany('INSERT INTO coleta VALUES (?, ?, ?, ?, ?)',
+                                [(*chave, nome, valor) for chave, (nome, valor) in linhas.items()])
+            # Produto já conhecido mantém o nome com que apareceu pela primeira vez
+            conexao.execute('''
+                INSERT INTO produtos (loja, nome_normalizado, quantidade, unidade, nome)
+                SELECT :loja, nome_normalizado, quantidade, unidade, nome FROM coleta WHERE true
+                ON CONFLICT (loja, nome_normalizado, quantidade, unidade) DO NOTHING''', parametros)
+
+            conexao.execute('DROP TABLE IF EXISTS temp.entrada')
+            conexao.execute('CREATE TEMP TABLE entrada (produto INTEGER PRIMARY KEY, centavos INTEGER NOT NULL)')
+            conexao.execute('''
+                INSERT INTO entrada
+                SELECT p.id, c.centavos FROM coleta c
+                JOIN produtos p ON p.loja = :loja AND p.nome_normalizado = c.nome_normalizado
+                               AND p.quantidade = c.quantidade AND p.unidade = c.unidade''', parametros)
+
+            # Faixas abertas da loja cujo preço mudou ou cujo produto sumiu
+            abertas_divergentes = '''
+                valido_ate IS NULL
+                AND produto IN (SELECT id FROM produtos WHERE loja = :loja)
+                AND NOT EXISTS (SELECT 1 FROM entrada
+                                WHERE entrada.produto = precos.produto AND entrada.centavos = precos.centavos)
+            '''
+
+            # Aberta hoje mesmo (outra coleta do dia) é descartada; aberta antes é fechada hoje
+            conexao.execute(f'DELETE FROM precos WHERE valido_de = :data AND {abertas_divergentes}', parametros)
+            conexao.execute(f'UPDATE precos SET valido_ate = :data WHERE {abertas_divergentes}', parametros)
+
+            # Produtos sem faixa aberta: novos, com preço novo ou de volta ao catálogo
+            conexao.execute('''
+                INSERT INTO precos (produto, centavos, valido_de, valido_ate)
+                SELECT produto, centavos, :data, NULL FROM entrada
+                WHERE NOT EXISTS (SELECT 1 FROM precos WHERE precos.produto = entrada.produto
+                                  AND precos.valido_ate IS NULL)''', parametros)
+
+            # Faixa aberta hoje com o mesmo preço da que fechou hoje (o preço voltou numa
+            # segunda coleta do dia): junta as duas
+            conexao.execute('DROP TABLE IF EXISTS temp.fundir')
+            conexao.execute('''
+                CREATE TEMP TABLE fundir AS
+                SELECT hoje.produto FROM precos hoje
+                JOIN precos antes ON antes.produto = hoje.produto AND antes.valido_ate = :data
+                                 AND antes.centavos = hoje.centavos
+                WHERE hoje.valido_de = :data AND hoje.valido_ate IS NULL''', parametros)
+            conexao.execute('''
+                DELETE FROM precos WHERE valido_de = :data AND valido_ate IS NULL
+                AND produto IN (SELECT produto FROM fundir)''', parametros)
+            conexao.execute('''
+                UPDATE precos SET valido_ate = NULL WHERE valido_ate = :data
+                AND produto IN (SELECT produto FROM fundir)''', parametros)
+
+            resumo = self._resumo_do_dia(loja, data)
+            resumo['produtos'] = len(linhas)
+            resumo['data'] = data
+            conexao.execute('INSERT OR REPLACE INTO ingestoes VALUES (:loja, :data, :produtos, :novos, '
+                            ':alterados, :removidos)', {**parametros, **resumo})
+            for temporaria in ('coleta', 'entrada', 'fundir'):
+                conexao.execute(f'DROP TABLE temp.{temporaria}')
+        return resumo
+
+    def _resumo_do_dia(self, loja, data):
+        """Faixas da loja abertas (novos/alterados) e fechadas sem substituta (removidos) em `data`"""
+        contagem = self._conexao.execute('''
+            SELECT
+                SUM(f.valido_de = :data AND anterior.produto IS NULL),
+                SUM(f.valido_de = :data AND anterior.produto IS NOT NULL),
+                SUM(f.valido_ate = :data AND NOT EXISTS (SELECT 1 FROM precos seguinte
+                    WHERE seguinte.produto = f.produto AND seguinte.valido_de = :data))
+            FROM precos f
+            JOIN produtos p ON p.id = f.produto
+            LEFT JOIN precos anterior ON anterior.produto = f.produto AND anterior.valido_ate = f.valido_de
+            WHERE p.loja = :loja AND (f.valido_de = :data OR f.valido_ate = :data)''',
+            {'loja': loja, 'data': data}).fetchone()
+        novos, alterados, removidos = (quantidade or 0 for quantidade in contagem)
+        return {'novos': novos, 'alterados': alterados, 'removidos': removidos}
+
+    # Consultas
+
+    def historico_do_produto(self, nome, loja=None, dias=DIAS_PADRAO, data=None, prefixo=False):
+        """
+        Faixas de preço do produto `nome` que valeram nos últimos `dias` até `data` (padrão: hoje).
+        O nome é comparado normalizado (sem acentos, minúsculas); com `prefixo`, vale qualquer
+        nome que comece assim. Retorna DataFrame com COLUNAS_HISTORICO, por loja e data.
+        """
+        fim = como_data(data)
+        inicio = (datetime.date.fromisoformat(fim) - datetime.timedelta(days=dias)).isoformat()
+        normalizado = normalizar_texto(nome)
+        if prefixo:
+            filtro_nome = 'p.nome_normalizado >= :nome AND p.nome_normalizado < :nome_fim'
+        else:
+            filtro_nome = 'p.nome_normalizado = :nome'
+        filtro_loja = 'AND p.loja = :loja' if loja else ''
+        linhas = self._conexao.execute(f'''
+            SELECT p.loja, p.nome, p.quantidade, p.unidade, f.centavos, f.valido_de, f.valido_ate
+            FROM produtos p JOIN precos f ON f.produto = p.id
+            WHERE {filtro_nome} {filtro_loja}
+              AND f.valido_de <= :fim AND (f.valido_ate IS NULL OR f.valido_ate > :inicio)
+            ORDER BY p.loja, p.nome, p.quantidade, p.unidade, f.valido_de''',
+            {'nome': normalizado, 'nome_fim': normalizado + '￿', 'loja': loja,
+             'inicio': inicio, 'fim': fim}).fetchall()
+        return pd.DataFrame([(loja_, nome_, quantidade, unidade, valor / 100, de, ate)
+                             for loja_, nome_, quantidade, unidade, valor, de, ate in linhas],
+                            columns=COLUNAS_HISTORICO)
+
+    def alteracoes(self, data=None, loja=None):
+        """
+        Produtos cujo preço mudou em `data` (padrão: hoje): faixa aberta nesse dia logo
+        depois de outra do mesmo produto. Retorna DataFrame com COLUNAS_ALTERACOES.
+        """
+        filtro_loja = 'AND p.loja = :loja' if loja else ''
+        linhas = self._conexao.execute(f'''
+            SELECT p.loja, p.nome, p.quantidade, p.unidade, anterior.centavos, atual.centavos
+            FROM precos atual
+            JOIN precos anterior ON anterior.produto = atual.produto AND anterior.valido_ate = atual.valido_de
+            JOIN produtos p ON p.id = atual.produto
+            WHERE atual.valido_de = :data {filtro_loja}
+            ORDER BY p.loja, p.nome''', {'data': como_data(data), 'loja': loja}).fetchall()
+        return pd.DataFrame([(loja_, nome, quantidade, unidade, antes / 100, depois / 100,
+                              round((depois - antes) / antes * 100, 1) if antes else None)
+                             for loja_, nome, quantidade, unidade, antes, depois in linhas],
+                            columns=COLUNAS_ALTERACOES)
+
+    def serie_diaria(self, nome, loja=None, dias=DIAS_PADRAO, data=None):
+        """
+        Preço dia a dia do produto nos últimos `dias`, a partir das faixas.
+        Retorna DataFrame indexado por data, uma coluna por (loja, nome, quantidade, unidade);
+        NaN nos dias em que o produto não estava no catálogo.
+        """
+        fim = pd.Timestamp(como_data(data))
+        dias_do_periodo = pd.date_range(fim - pd.Timedelta(days=dias), fim, freq='D')
+        colunas = {}
+        for chave, faixas in self.historico_do_produto(nome, loja, dias, data).groupby(
+                ['Loja', 'Nome', 'Quantidade', 'Unidade'], sort=True):
+            serie = pd.Series(float('nan'), index=dias_do_periodo)
+            for preco, de, ate in zip(faixas['Preço'], faixas['Válido de'], faixas['Válido até']):
+                vigente = serie.index >= pd.Timestamp(de)
+                if isinstance(ate, str):
+                    vigente &= serie.index < pd.Timestamp(ate)
+                serie[vigente] = preco
+            colunas[chave] = serie
+        return pd.DataFrame(colunas, index=dias_do_periodo)
+
+    def estatisticas(self):
+        """Retorna dict com o número de produtos, de faixas de preço e de coletas registradas"""
+        contar = lambda tabela: self._conexao.execute(f'SELECT COUNT(*) FROM {tabela}').fetchone()[0]  # noqa: E731
+        return {'produtos': contar('produtos'), 'faixas': contar('precos'), 'coletas': contar('ingestoes')}
+
+    def fechar(self):
+        self._conexao.close()
+
+
+def registrar_no_historico(df, loja, caminho=ARQUIVO_HISTORICO, data=None):
+    """Abre o histórico, registra a planilha da loja e mostra o resumo. Retorna o resumo (None se falhar)"""
+    try:
+        historico = HistoricoDePrecos(caminho)
+        try:
+            resumo = historico.registrar(df, loja, data)
+        finally:
+            historico.fechar()
+    except (sqlite3.Error, ValueError) as e:
+        log.warning(f"⚠️  Erro ao gravar o histórico de preços em {caminho}: {e}")
+        return None
+    log.info(f"🗂️  Histórico de preços em {caminho} ({resumo['data']}): {resumo['novos']} novos, "
+             f"{resumo['alterados']} com preço alterado, {resumo['removidos']} fora do catálogo")
+    return resumo
+
+
+def main():
+    from azumarill.comparacao import ler_catalogo
+    from azumarill.telemetria import configurar_logs
+
+    parser = argparse.ArgumentParser(description='Histórico de preços das lojas')
+    parser.add_argument('--historico', default=ARQUIVO_HISTORICO, help=f'banco SQLite (padrão: {ARQUIVO_HISTORICO})')
+    comandos = parser.add_subparsers(dest='comando', required=True)
+
+    importar = comandos.add_parser('importar', help='registra uma planilha CSV gravada pela coleta')
+    importar.add_argument('csv')
+    importar.add_argument('--loja', required=True)
+    importar.add_argument('--data', help='data da coleta, AAAA-MM-DD (padrão: hoje)')
+
+    produto = comandos.add_parser('produto', help='faixas de preço de um produto')
+    produto.add_argument('nome')
+    produto.add_argument('--loja')
+    produto.add_argument('--dias', type=int, default=DIAS_PADRAO)
+    produto.add_argument('--prefixo', action='store_true', help='todos os nomes que começam assim')
+
+    alteracoes = comandos.add_parser('alteracoes', help='produtos com preço alterado num dia')
+    alteracoes.add_argument('--data', help='AAAA-MM-DD (padrão: hoje)')
+    alteracoes.add_argument('--loja')
+
+    argumentos = parser.parse_args()
+    configurar_logs()
+
+    if argumentos.comando == 'importar':
+        registrar_no_historico(ler_catalogo(argumentos.csv), argumentos.loja, argumentos.historico, argumentos.data)
+        return
+
+    historico = HistoricoDePrecos(argumentos.historico)
+    try:
+        if argumentos.comando == 'produto':
+            tabela = historico.historico_do_produto(argumentos.nome, argumentos.loja, argumentos.dias,
+                                                    prefixo=argumentos.prefixo)
+        else:
+            tabela = historico.alteracoes(argumentos.data, argumentos.loja)
+    finally:
+        historico.fechar()
+    print(tabela.to_string(index=False) if len(tabela) else "Nada encontrado")
+
+
+if __name__ == '__main__':
+    main()
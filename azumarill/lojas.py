@@ -0,0 +1,173 @@
+"""
+Configuração das lojas (varejistas VTEX) coletadas.
+
+Tudo o que muda de uma loja para outra fica numa entrada `Loja`: categorias,
+termos e URL de busca de orgânicos, estilo de paginação, cadeia de extratores,
+limites de cortesia e TTLs do cache. O motor de coleta (azumarill.coleta) é o
+mesmo para todas; um terceiro supermercado VTEX é só mais uma entrada em LOJAS.
+"""
+import copy
+from urllib.parse import urlsplit
+
+from azumarill.extracao import CADEIA_PADRAO
+from azumarill.motor import MAX_POR_HOST_PADRAO, REQUISICOES_POR_SEGUNDO_PADRAO, TAXA_MAXIMA_PADRAO
+
+# Cabeçalhos de navegador usados quando a loja não define os seus
+HEADERS_PADRAO = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+# Busca global por termo das vitrines VTEX
+CAMINHO_BUSCA_PADRAO = '/organico?_q={termo}&map=ft'
+
+
+class Loja:
+    """
+    Adaptador de uma loja.
+    - nome: identificador curto, usado nos nomes de arquivos (planilha, diário, cache)
+    - url: endereço da vitrine, ex. 'https://www.zonasul.com.br'
+    - categorias: lista de (slug, nome) das categorias de alimentos (não orgânicos)
+    - termos_organicos: termos da busca global por orgânicos
+    - formato_paginacao: 'page', '_page' ou 'from'; None detecta e memoriza por URL
+    - extratores: cadeia de azumarill.extracao.EXTRATORES, na ordem de prioridade
+    - deduplicar_nomes: descarta nomes já vistos entre páginas e categorias (e para
+      a categoria quando uma página só traz repetidos)
+    - url_teste: página buscada antes da coleta HTML para conferir se a extração funciona
+    - max_por_host, requisicoes_por_segundo: requisições simultâneas e taxa inicial por host
+    - requisicoes_por_segundo_maxima: teto da taxa com o controle adaptativo do motor
+    - ttl_cache: TTL em segundos por prefixo de URL (sem o esquema); sem ele, 1h para a loja toda
+    - selecao: rótulo de uma coleta só de parte da loja (ex.: 'hortifruti'); vai no nome das
+      planilhas e do diário, para não misturá-los com os da loja inteira
+    """
+
+    def __init__(self, nome, url, categorias, termos_organicos, caminho_busca=CAMINHO_BUSCA_PADRAO,
+                 formato_paginacao='page', max_paginas=50, extratores=CADEIA_PADRAO,
+                 deduplicar_nomes=False, url_teste=None, headers=None,
+                 max_por_host=MAX_POR_HOST_PADRAO, requisicoes_por_segundo=REQUISICOES_POR_SEGUNDO_PADRAO,
+                 requisicoes_por_segundo_maxima=TAXA_MAXIMA_PADRAO, ttl_cache=None, selecao=None):
+        self.nome = nome
+        self.url = url.rstrip('/')
+        self.categorias = list(categorias)
+        self.termos_organicos = list(termos_organicos)
+        self.caminho_busca = caminho_busca
+        self.formato_paginacao = formato_paginacao
+        self.max_paginas = max_paginas
+        self.extratores = tuple(extratores)
+        self.deduplicar_nomes = deduplicar_nomes
+        self.url_teste = url_teste
+        self.headers = headers or HEADERS_PADRAO
+        self.max_por_host = max_por_host
+        self.requisicoes_por_segundo = requisicoes_por_segundo
+        self.requisicoes_por_segundo_maxima = requisicoes_por_segundo_maxima
+        self.ttl_cache = ttl_cache or {self.host: 3600}
+        self.selecao = selecao
+
+    @property
+    def host(self):
+        return urlsplit(self.url).netloc
+
+    def url_categoria(self, slug):
+        return f'{self.url}/{slug}'
+
+    def url_busca(self, termo_encoded):
+        return self.url + self.caminho_busca.format(termo=termo_encoded)
+
+    def arquivo(self, modelo):
+        """Nome de arquivo da loja, ex. arquivo('coleta_{loja}.sqlite')"""
+        return modelo.format(loja=self.nome)
+
+    def arquivo_de_saida(self, modelo):
+        """
+        Nome de arquivo desta coleta da loja (planilha, produtos brutos, diário), com a seleção
+        no nome da loja se houver: uma coleta parcial não retoma nem sobrescreve a da loja inteira
+        """
+        return modelo.format(loja=f'{self.nome}_{self.selecao}' if self.selecao else self.nome)
+
+    def com_ajustes(self, **campos):
+        """Cópia da loja com outros valores nos campos dados (ex.: categorias, max_paginas)"""
+        copia = copy.copy(self)
+        for campo, valor in campos.items():
+            if not hasattr(self, campo):
+                raise AttributeError(f"Loja não tem o campo {campo!r}")
+            setattr(copia, campo, valor)
+        return copia
+
+    def com_url(self, url):
+        """
+        Cópia da loja servida de outro endereço (ex.: o servidor local azumarill.servidor_vtex).
+        A URL de teste e os prefixos dos TTLs do cache acompanham o novo endereço.
+        """
+        copia = copy.copy(self)
+        copia.url = url.rstrip('/')
+        if self.url_teste and self.url_teste.startswith(self.url):
+            copia.url_teste = copia.url + self.url_teste[len(self.url):]
+        copia.ttl_cache = {(copia.host + prefixo[len(self.host):] if prefixo.startswith(self.host) else prefixo): ttl
+                           for prefixo, ttl in self.ttl_cache.items()}
+        return copia
+
+    def __repr__(self):
+        return f'Loja({self.nome!r}, {self.url!r})'
+
+
+LOJAS = {
+    'zonasul': Loja(
+        nome='zonasul',
+        url='https://www.zonasul.com.br',
+        categorias=[
+            ('hortifruti', 'Hortifruti'),
+            ('mercearia', 'Mercearia'),
+            ('laticinios', 'Laticínios'),
+            ('carnes', 'Carnes'),
+            ('padaria', 'Padaria'),
+            ('bebidas', 'Bebidas'),
+            ('congelados', 'Congelados'),
+            ('frios', 'Frios'),
+        ],
+        termos_organicos=['orgânico', 'organico', 'organic'],
+        formato_paginacao=None,  # aceita page, _page e from: detecta e memoriza
+        max_paginas=50,
+        extratores=('jsonld',),
+        headers={
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+        },
+        ttl_cache={
+            'www.zonasul.com.br/hortifruti': 30 * 60,  # preços de hortifruti mudam mais
+            'www.zonasul.com.br/organico': 2 * 3600,   # buscas por termo
+            'www.zonasul.com.br': 3600,
+        },
+    ),
+    'prezunic': Loja(
+        nome='prezunic',
+        url='https://www.prezunic.com.br',
+        categorias=[
+            ('mercearia', 'Mercearia'),
+            ('carnes-e-aves', 'Carnes e Aves'),
+            ('frios-e-laticinios', 'Frios e Laticínios'),
+            ('hortifruti', 'Hortifruti'),
+        ],
+        termos_organicos=['organico'],
+        formato_paginacao='page',
+        max_paginas=100,
+        extratores=('jsonld', 'html'),
+        deduplicar_nomes=True,
+        url_teste='https://www.prezunic.com.br/organico?_q=organico&map=ft',
+        ttl_cache={
+            'www.prezunic.com.br/hortifruti': 30 * 60,  # preços de hortifruti mudam mais
+            'www.prezunic.com.br/organico': 2 * 3600,   # buscas por termo
+            'www.prezunic.com.br': 3600,
+        },
+    ),
+}
+
+
+def obter_loja(nome):
+    """Retorna a Loja configurada com esse nome (ValueError se não existir)"""
+    try:
+        return LOJAS[nome]
+    except KeyError:
+        raise ValueError(f"Loja desconhecida: {nome!r} (configuradas: {', '.join(LOJAS)})") from None
@@ -0,0 +1,282 @@
+"""
+Motor assíncrono de requisições usado pelos scrapers.
+
+Substitui os `time.sleep` fixos entre páginas e categorias por dois limites por host:
+- número máximo de requisições simultâneas (semáforo)
+- taxa máxima de requisições por segundo (token bucket)
+
+Com o controle adaptativo (padrão), a taxa de cada host não fica fixa: `ControleAIMD`
+recebe cada resposta (`MotorDeColeta.observar`) e ajusta o balde como o controle de
+congestionamento do TCP. Respostas saudáveis somam à taxa (cerca de AUMENTO_POR_SEGUNDO
+req/s a cada segundo, até a taxa máxima); 429, 5xx, falhas de conexão e picos de
+latência a multiplicam por um fator < 1, no máximo uma vez por janela, para que a leva
+de respostas ruins já em voo não derrube a taxa até o mínimo. Um Retry-After pausa o
+host inteiro, não só a requisição que o recebeu.
+"""
+import asyncio
+import logging
+import threading
+import time
+from urllib.parse import urlsplit
+
+log = logging.getLogger(__name__)
+
+# Valores padrão de cortesia com os servidores
+MAX_POR_HOST_PADRAO = 4
+REQUISICOES_POR_SEGUNDO_PADRAO = 2.0
+
+# Controle adaptativo: limites da taxa por host (a inicial é a configurada)
+TAXA_MAXIMA_PADRAO = 20.0
+TAXA_MINIMA_PADRAO = 0.2
+AUMENTO_POR_SEGUNDO = 1.0  # req/s somados a cada segundo de respostas saudáveis
+FATOR_REDUCAO_ERRO = 0.5  # 429, 5xx e falhas de conexão
+FATOR_REDUCAO_LATENCIA = 0.8
+# Pico de latência: média recente acima de FATOR_PICO_LATENCIA vezes a de referência
+# (e pelo menos PICO_MINIMO_SEGUNDOS acima dela), depois de AMOSTRAS_REFERENCIA respostas
+FATOR_PICO_LATENCIA = 2.0
+PICO_MINIMO_SEGUNDOS = 0.05
+AMOSTRAS_REFERENCIA = 5
+PESO_LATENCIA_RECENTE = 0.3
+PESO_LATENCIA_REFERENCIA = 0.05
+JANELA_MINIMA_REDUCAO = 1.0  # segundos entre duas reduções
+
+
+class BaldeDeTokens:
+    """
+    Limitador de taxa no estilo token bucket.
+    Repõe `taxa` tokens por segundo, até `capacidade` tokens acumulados.
+    Cada requisição consome um token; sem token disponível, espera a reposição.
+    """
+
+    def __init__(self, taxa, capacidade=1):
+        if taxa <= 0:
+            raise ValueError("A taxa do balde de tokens deve ser positiva")
+        self.taxa = float(taxa)
+        self.capacidade = float(max(1, capacidade))
+        self._tokens = self.capacidade
+        self._ultima_reposicao = time.monotonic()
+        self._pausado_ate = 0.0
+        self._trava = asyncio.Lock()
+
+    def ajustar_taxa(self, taxa):
+        """Nova taxa de reposição (pode ser chamado de outra thread)"""
+        self.taxa = float(taxa)
+
+    def pausar(self, segundos):
+        """Nenhum token é entregue pelos próximos `segundos` (pode ser chamado de outra thread)"""
+        self._pausado_ate = max(self._pausado_ate, time.monotonic() + segundos)
+
+    def _repor(self):
+        agora = time.monotonic()
+        decorrido = agora - self._ultima_reposicao
+        self._tokens = min(self.capacidade, self._tokens + decorrido * self.taxa)
+        self._ultima_reposicao = agora
+
+    async def adquirir(self):
+        """Espera até haver um token disponível e o consome"""
+        async with self._trava:
+            while (pausa := self._pausado_ate - time.monotonic()) > 0:
+                await asyncio.sleep(pausa)
+            self._repor()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.taxa)
+                self._repor()
+            self._tokens -= 1
+
+
+class ControleAIMD:
+    """
+    Controle de taxa de um host por aumento aditivo e redução multiplicativa (AIMD).
+    Ajusta a taxa do balde do host a cada resposta observada; as observações chegam
+    das threads de busca, então passam por uma trava.
+    """
+
+    def __init__(self, host, balde, taxa_maxima=TAXA_MAXIMA_PADRAO, taxa_minima=TAXA_MINIMA_PADRAO):
+        self.host = host
+        self.balde = balde
+        self.taxa_minima = min(taxa_minima, balde.taxa)
+        self.taxa_maxima = max(taxa_maxima, balde.taxa)
+        self.taxa = balde.taxa
+        self.taxa_maior = self.taxa
+        self.reducoes = {}  # {motivo: contagem}
+        self.pausas_segundos = 0.0
+
+        self._latencia_recente = None
+        self._latencia_referencia = None
+        self._amostras = 0
+        self._proxima_reducao = 0.0
+        self._taxa_registrada = self.taxa  # último valor de aumento mostrado no log
+        self._trava = threading.Lock()
+
+    def observar(self, latencia, status, status_anteriores=(), retry_after=None):
+        """
+        Uma resposta do host: `status` final (None em falha de conexão), os status das
+        retentativas feitas antes dela e o Retry-After em segundos, se veio.
+        """
+        todos = (*status_anteriores, status)
+        if 429 in todos:
+            motivo = '429'
+        elif None in todos:
+            motivo = 'falha de conexão'
+        elif any(s >= 500 for s in todos):
+            motivo = '5xx'
+        else:
+            motivo = None
+
+        with self._trava:
+            if retry_after:
+                self.balde.pausar(retry_after)
+                self.pausas_segundos += retry_after
+                log.info(f"⏸️  {self.host}: Retry-After de {retry_after:g}s, pausando o host")
+            if motivo is None:
+                motivo = self._observar_latencia(latencia)
+            if motivo is None:
+                self._aumentar()
+            else:
+                self._reduzir(motivo, FATOR_REDUCAO_LATENCIA if motivo == 'latência' else FATOR_REDUCAO_ERRO,
+                              latencia)
+
+    def _observar_latencia(self, latencia):
+        """Atualiza as médias de latência. Retorna 'latência' num pico, senão None"""
+        if latencia is None:
+            return None
+        self._amostras += 1
+        if self._latencia_referencia is None:
+            self._latencia_recente = self._latencia_referencia = latencia
+            return None
+        self._latencia_recente += PESO_LATENCIA_RECENTE * (latencia - self._latencia_recente)
+        self._latencia_referencia += PESO_LATENCIA_REFERENCIA * (latencia - self._latencia_referencia)
+        recente, referencia = self._latencia_recente, self._latencia_referencia
+        if (self._amostras > AMOSTRAS_REFERENCIA and recente > FATOR_PICO_LATENCIA * referencia
+                and recente - referencia > PICO_MINIMO_SEGUNDOS):
+            return 'latência'
+        return None
+
+    def _aumentar(self):
+        # Uma resposta a `taxa` req/s chega a cada 1/taxa segundos: AUMENTO_POR_SEGUNDO por segundo
+        if self.taxa >= self.taxa_maxima:
+            return
+        self.taxa = min(self.taxa_maxima, self.taxa + AUMENTO_POR_SEGUNDO / self.taxa)
+        self.taxa_maior = max(self.taxa_maior, self.taxa)
+        self.balde.ajustar_taxa(self.taxa)
+        if self.taxa >= 1.5 * self._taxa_registrada or self.taxa == self.taxa_maxima:
+            self._taxa_registrada = self.taxa
+            maxima = ' (máxima)' if self.taxa == self.taxa_maxima else ''
+            log.info(f"🎛️  {self.host}: respostas saudáveis, taxa sobe para {self.taxa:.1f} req/s{maxima}")
+        else:
+            log.debug(f"🎛️  {self.host}: taxa {self.taxa:.2f} req/s")
+
+    def _reduzir(self, motivo, fator, latencia):
+        agora = time.monotonic()
+        if agora < self._proxima_reducao:
+            return  # respostas da mesma leva: já reduziu
+        anterior = self.taxa
+        self.taxa = max(self.taxa_minima, self.taxa * fator)
+        self.balde.ajustar_taxa(self.taxa)
+        self.reducoes[motivo] = self.reducoes.get(motivo, 0) + 1
+        self._taxa_registrada = self.taxa
+        # Espera as requisições em voo voltarem antes de reduzir de novo
+        self._proxima_reducao = agora + max(JANELA_MINIMA_REDUCAO, 2 * (self._latencia_recente or 0.0))
+        if motivo == 'latência':
+            self._latencia_recente = self._latencia_referencia  # o pico já foi levado em conta
+            detalhe = f" ({latencia * 1000:.0f} ms)"
+        else:
+            detalhe = ''
+        log.info(f"🎛️  {self.host}: {motivo}{detalhe}, taxa cai de {anterior:.1f} para {self.taxa:.1f} req/s")
+
+    def resumo(self):
+        """Retorna dict com a taxa final e a maior (req/s), as reduções por motivo e o total pausado"""
+        with self._trava:
+            return {
+                'taxa_final': round(self.taxa, 3),
+                'taxa_maior': round(self.taxa_maior, 3),
+                'reducoes': dict(self.reducoes),
+                'pausas_segundos': round(self.pausas_segundos, 3),
+            }
+
+
+class MotorDeColeta:
+    """
+    Executa as funções de busca (síncronas, baseadas em requests) em threads,
+    respeitando por host o limite de requisições simultâneas e a taxa do balde de tokens.
+    Com `adaptativo`, a taxa de cada host é ajustada por um ControleAIMD a partir das
+    respostas informadas em `observar`.
+    Deve ser criado e usado dentro de um mesmo `asyncio.run`.
+    """
+
+    def __init__(self, max_por_host=MAX_POR_HOST_PADRAO,
+                 requisicoes_por_segundo=REQUISICOES_POR_SEGUNDO_PADRAO, rajada=1,
+                 adaptativo=True, taxa_maxima=TAXA_MAXIMA_PADRAO):
+        self.max_por_host = max_por_host
+        self.requisicoes_por_segundo = requisicoes_por_segundo
+        self.rajada = rajada
+        self.adaptativo = adaptativo
+        self.taxa_maxima = taxa_maxima
+        self._semaforos = {}
+        self._baldes = {}
+        self._controles = {}
+
+        self._limites_configurados = {}
+
+        # Telemetria opcional (azumarill.telemetria): tempo de espera por semáforo e balde
+        self.telemetria = None
+
+    def configurar_host(self, host, max_por_host=None, requisicoes_por_segundo=None, taxa_maxima=None):
+        """
+        Define limites próprios para um host (ex.: uma loja mais sensível que as outras).
+        `requisicoes_por_segundo` é a taxa inicial; com o controle adaptativo ela varia
+        até `taxa_maxima`. Deve ser chamado antes da primeira requisição para o host.
+        """
+        self._limites_configurados[host] = (max_por_host or self.max_por_host,
+                                            requisicoes_por_segundo or self.requisicoes_por_segundo,
+                                            taxa_maxima or self.taxa_maxima)
+
+    def _limites_do_host(self, url):
+        host = urlsplit(url).netloc
+        if host not in self._semaforos:
+            max_por_host, requisicoes_por_segundo, taxa_maxima = self._limites_configurados.get(
+                host, (self.max_por_host, self.requisicoes_por_segundo, self.taxa_maxima))
+            self._semaforos[host] = asyncio.Semaphore(max_por_host)
+            self._baldes[host] = BaldeDeTokens(requisicoes_por_segundo, self.rajada)
+            if self.adaptativo:
+                self._controles[host] = ControleAIMD(host, self._baldes[host], taxa_maxima)
+        return self._semaforos[host], self._baldes[host]
+
+    def observar(self, url, latencia, status, status_anteriores=(), retry_after=None):
+        """
+        Informa uma resposta do host de `url` ao controle adaptativo (ver ControleAIMD.observar).
+        Pode ser chamado das threads de busca; sem controle para o host, não faz nada.
+        """
+        controle = self._controles.get(urlsplit(url).netloc)
+        if controle is not None:
+            controle.observar(latencia, status, status_anteriores, retry_after)
+
+    def resumo_controle(self):
+        """Retorna {host: ControleAIMD.resumo()} dos hosts com controle adaptativo"""
+        return {host: controle.resumo() for host, controle in sorted(self._controles.items())}
+
+    def imprimir_resumo_controle(self):
+        for host, resumo in self.resumo_controle().items():
+            reducoes = ', '.join(f"{n} por {motivo}" for motivo, n in resumo['reducoes'].items()) or 'nenhuma'
+            log.info(f"🎛️  {host}: taxa final {resumo['taxa_final']:.1f} req/s (maior {resumo['taxa_maior']:.1f}), "
+                     f"reduções: {reducoes}, pausado {resumo['pausas_segundos']:.0f}s")
+
+    async def buscar(self, funcao_busca, url, *args, **kwargs):
+        """
+        Chama `funcao_busca(url, *args, **kwargs)` numa thread, dentro dos limites do host.
+        Retorna o que a função de busca retornar.
+        """
+        semaforo, balde = self._limites_do_host(url)
+        inicio = time.perf_counter()
+        async with semaforo:
+            liberado = time.perf_counter()
+            await balde.adquirir()
+            if self.telemetria is not None:
+                self.telemetria.registrar_espera(url, cortesia=time.perf_counter() - liberado,
+                                                 concorrencia=liberado - inicio)
+            return await asyncio.to_thread(funcao_busca, url, *args, **kwargs)
+
+    async def buscar_varias(self, funcao_busca, urls, *args, **kwargs):
+        """Busca várias URLs em paralelo. Retorna os resultados na mesma ordem das URLs."""
+        tarefas = [self.buscar(funcao_busca, url, *args, **kwargs) for url in urls]
+        return await asyncio.gather(*tarefas)
@@ -0,0 +1,136 @@
+"""
+Representação leve de uma página baixada.
+
+A maior parte do tempo de CPU por página ia para montar a árvore BeautifulSoup,
+mas a extração por JSON-LD só precisa dos blocos <script type="application/ld+json">.
+`PaginaBruta` guarda os bytes da resposta, localiza esses blocos direto nos bytes e
+só monta a árvore quando alguém pede `pagina.soup` (ex.: fallback de extração por HTML).
+
+O parser é configurável (AZUMARILL_PARSER ou o argumento `parser`):
+- 'lxml' (padrão): libxml2, bem mais rápido que o html.parser em Python puro
+- 'html5': html5-parser (opcional, parser HTML5 em C que monta árvore lxml); sem ele, usa o lxml
+- 'html.parser': o parser da biblioteca padrão, como antes
+`pagina.arvore` é a árvore lxml usada pelos seletores do extrator de HTML;
+`pagina.soup` é a árvore BeautifulSoup montada com o parser escolhido.
+
+`pagina.total_de_itens()` lê o total da listagem (`numberOfItems` do ItemList), que
+permite à coleta saber quantas páginas existem já na primeira.
+"""
+import json
+import os
+import re
+
+from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
+
+try:
+    import html5_parser
+except ImportError:  # html5-parser é opcional: sem ele 'html5' usa o lxml
+    html5_parser = None
+
+PARSERS = ('lxml', 'html5', 'html.parser')
+PARSER_PADRAO = os.environ.get('AZUMARILL_PARSER', 'lxml')
+
+# Parser do BeautifulSoup para cada escolha ('html5' não usa o html5lib, que é lento)
+PARSER_SOUP = {'lxml': 'lxml', 'html5': 'lxml', 'html.parser': 'html.parser'}
+
+# As vitrines respondem em UTF-8; sem declarar, o libxml2 pode decodificar como latin-1
+_PARSER_LXML_UTF8 = lxml_html.HTMLParser(encoding='utf-8')
+
+# <script ... type="application/ld+json" ...> conteúdo </script>
+PADRAO_SCRIPT_JSONLD = re.compile(
+    rb'<script\b[^>]*?application/ld\+json[^>]*>(.*?)</script\s*>',
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Marcador usado para descartar rapidamente páginas sem nenhum JSON-LD
+MARCADOR_JSONLD = b'application/ld+json'
+
+# Total de itens da listagem no JSON-LD ItemList
+MARCADOR_TOTAL = b'numberOfItems'
+
+
+def blocos_jsonld(conteudo):
+    """
+    Localiza os blocos JSON-LD diretamente nos bytes do HTML.
+    Retorna lista com o conteúdo (bytes) de cada bloco, na ordem do documento.
+    """
+    if MARCADOR_JSONLD not in conteudo:
+        return []
+    return [match.group(1) for match in PADRAO_SCRIPT_JSONLD.finditer(conteudo)]
+
+
+def montar_arvore(conteudo, parser=None):
+    """Monta a árvore lxml do HTML com o parser escolhido. Retorna o elemento raiz"""
+    if (parser or PARSER_PADRAO) == 'html5' and html5_parser is not None:
+        return html5_parser.parse(conteudo, treebuilder='lxml')
+    try:
+        conteudo.decode('utf-8')
+        parser_lxml = _PARSER_LXML_UTF8
+    except (UnicodeDecodeError, AttributeError):  # outra codificação (ou str): o lxml detecta
+        parser_lxml = None
+    try:
+        return lxml_html.document_fromstring(conteudo, parser=parser_lxml)
+    except etree.ParserError:  # documento vazio
+        return lxml_html.document_fromstring('<html></html>')
+
+
+def total_do_jsonld(conteudo):
+    """
+    Total de itens da listagem (`numberOfItems` do JSON-LD ItemList), lido dos bytes do HTML.
+    Retorna int ou None se a página não informar.
+    """
+    if MARCADOR_TOTAL not in conteudo:
+        return None
+    for bloco in blocos_jsonld(conteudo):
+        if MARCADOR_TOTAL not in bloco:
+            continue
+        try:
+            dados = json.loads(bloco)
+        except ValueError:
+            continue
+        if isinstance(dados, dict) and dados.get('@type') == 'ItemList':
+            total = dados.get('numberOfItems')
+            if isinstance(total, int) and total >= 0:
+                return total
+    return None
+
+
+class PaginaBruta:
+    """
+    Corpo bruto de uma resposta HTTP, com os cabeçalhos quando vieram da rede.
+    A árvore BeautifulSoup é montada só no primeiro acesso a `soup` e depois reaproveitada.
+    """
+
+    __slots__ = ('conteudo', 'parser', 'cabecalhos', '_soup', '_arvore')
+
+    def __init__(self, conteudo, parser=None, cabecalhos=None):
+        self.conteudo = conteudo
+        self.cabecalhos = cabecalhos or {}
+        self.parser = parser or PARSER_PADRAO
+        if self.parser not in PARSERS:
+            raise ValueError(f"Parser desconhecido: {self.parser!r} (use {', '.join(PARSERS)})")
+        self._soup = None
+        self._arvore = None
+
+    @property
+    def soup(self):
+        if self._soup is None:
+            self._soup = BeautifulSoup(self.conteudo, PARSER_SOUP[self.parser])
+        return self._soup
+
+    @property
+    def arvore(self):
+        """Árvore lxml da página (elemento <html>), montada no primeiro acesso"""
+        if self._arvore is None:
+            self._arvore = montar_arvore(self.conteudo, self.parser)
+        return self._arvore
+
+    def blocos_jsonld(self):
+        """Blocos JSON-LD da página, sem montar a árvore HTML"""
+        return blocos_jsonld(self.conteudo)
+
+    def total_de_itens(self):
+        """Total de itens da listagem informado no JSON-LD, ou None"""
+        return total_do_jsonld(self.conteudo)
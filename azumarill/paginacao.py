@@ -0,0 +1,112 @@
+"""
+Formatos de paginação das vitrines VTEX e memória do formato detectado.
+
+O Zona Sul aceita mais de um formato de paginação (`page`, `_page`, `from`) e o
+formato certo era redescoberto a cada categoria e busca, com até três requisições
+de teste. Aqui o formato detectado fica guardado em disco por padrão de URL
+(host + caminho, sem os valores da query) e é reutilizado nas próximas execuções.
+Quando for preciso detectar, os formatos são testados em paralelo e a resposta
+vencedora é devolvida para ser usada como a própria página, sem nova requisição.
+"""
+import asyncio
+import json
+import os
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+# Em ordem de preferência
+FORMATOS_PAGINACAO = ('page', '_page', 'from')
+
+# Itens por página assumidos no formato `from` (deslocamento)
+ITENS_POR_PAGINA = 50
+
+
+def montar_url_pagina(url_base, formato, pagina, itens_por_pagina=ITENS_POR_PAGINA):
+    """Monta a URL da página `pagina` no formato informado (formato desconhecido usa `page`)"""
+    separador = '&' if '?' in url_base else '?'
+    if formato == 'from':
+        return f"{url_base}{separador}from={(pagina - 1) * itens_por_pagina}"
+    if formato == '_page':
+        return f"{url_base}{separador}_page={pagina}"
+    return f"{url_base}{separador}page={pagina}"
+
+
+def formato_da_url(url):
+    """Identifica o formato de paginação usado na URL: 'page', '_page', 'from' ou None"""
+    if '&page=' in url or '?page=' in url:
+        return 'page'
+    elif '&_page=' in url or '?_page=' in url:
+        return '_page'
+    elif '&from=' in url or '?from=' in url:
+        return 'from'
+    return None
+
+
+def padrao_da_url(url_base):
+    """
+    Padrão usado como chave da memória: host + caminho + nomes dos parâmetros.
+    Ex.: buscas por termos diferentes ('?_q=organico&map=ft', '?_q=organic&map=ft')
+    caem no mesmo padrão 'www.zonasul.com.br/organico?_q&map'.
+    """
+    partes = urlsplit(url_base)
+    nomes = sorted({nome for nome, _ in parse_qsl(partes.query, keep_blank_values=True)})
+    padrao = partes.netloc + partes.path
+    if nomes:
+        padrao += '?' + '&'.join(nomes)
+    return padrao
+
+
+class MemoriaDePaginacao:
+    """
+    Formatos de paginação detectados, guardados num arquivo JSON entre execuções.
+    Procura primeiro pelo padrão exato da URL e depois pelo host.
+    """
+
+    def __init__(self, caminho):
+        self.caminho = Path(caminho)
+        try:
+            self._formatos = json.loads(self.caminho.read_text(encoding='utf-8'))
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._formatos = {}
+
+    def obter(self, url_base):
+        """Formato memorizado para a URL, ou None se nunca foi detectado"""
+        padrao = padrao_da_url(url_base)
+        host = urlsplit(url_base).netloc
+        return self._formatos.get(padrao) or self._formatos.get(host)
+
+    def registrar(self, url_base, formato):
+        """Memoriza o formato para o padrão da URL e para o host, e grava o arquivo"""
+        padrao = padrao_da_url(url_base)
+        host = urlsplit(url_base).netloc
+        if self._formatos.get(padrao) == formato and self._formatos.get(host) == formato:
+            return
+        self._formatos[padrao] = formato
+        self._formatos[host] = formato
+        # Arquivo temporário + rename: vários processos (azumarill.fila) podem gravar ao mesmo tempo
+        temporario = self.caminho.with_name(f'{self.caminho.name}.{os.getpid()}.tmp')
+        temporario.write_text(json.dumps(self._formatos, indent=2, sort_keys=True), encoding='utf-8')
+        os.replace(temporario, self.caminho)
+
+
+async def sondar_formatos(motor, funcao_busca, extrator, url_base, pagina, formatos=FORMATOS_PAGINACAO):
+    """
+    Busca a página `pagina` em todos os formatos ao mesmo tempo.
+    Retorna (formato, url, documento, status, produtos) do primeiro formato, na ordem
+    de preferência, que trouxe produtos; se nenhum trouxe, o resultado do primeiro formato
+    com formato=None. O documento pode ser usado como a própria página, sem nova requisição.
+    O extrator pode ser uma função comum ou assíncrona (ex.: extração em pool de processos).
+    """
+    urls = [montar_url_pagina(url_base, formato, pagina) for formato in formatos]
+    resultados = await asyncio.gather(*(motor.buscar(funcao_busca, url, mostrar_log=False) for url in urls))
+    
+    for formato, url, (documento, status) in zip(formatos, urls, resultados):
+        if documento is not None and status == 200:
+            produtos = extrator(documento)
+            if asyncio.iscoroutine(produtos):
+                produtos = await produtos
+            if len(produtos) > 0:
+                return formato, url, documento, status, produtos
+    
+    documento, status = resultados[0]
+    return None, urls[0], documento, status, None
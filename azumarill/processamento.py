@@ -0,0 +1,118 @@
+"""
+Processamento dos produtos coletados para as colunas da planilha.
+
+`processar_dados_para_planilha` trabalha por colunas: monta o DataFrame uma vez,
+separa quantidade/unidade uma vez por nome distinto (padrões pré-compilados),
+converte preços com `pd.to_numeric` e marca Orgânico/Não Orgânico em lote. O resultado é o
+mesmo da versão produto a produto (`separar_nome_quantidade` + `determinar_organico`).
+O numpy e o pandas só são importados nas funções em lote: a saída contínua e a coleta
+que só busca usam as funções item a item sem carregá-los.
+"""
+import re
+
+from azumarill.classificador import TIPO_PADRAO, determinar_organicos
+
+# Padrão 1: número seguido de unidade no final (180g, 600g, 1kg, 500ml, etc)
+PADRAO_QUANTIDADE = re.compile(r'(\d+(?:[.,]\d+)?)\s*(g|kg|ml|l)\s*$', re.IGNORECASE)
+
+# Padrão 2: "Com X Unidades" ou "X Unidades" no final
+PADRAO_UNIDADES = re.compile(r'(?:com\s+)?(\d+(?:[.,]\d+)?)\s*(unidades?|un\.?)\s*$', re.IGNORECASE)
+
+# "Com" que sobra no final do nome depois de remover a quantidade
+PADRAO_COM_FINAL = re.compile(r'\s+[Cc]om\s*$')
+
+COLUNAS_PLANILHA = ['Nome', 'Quantidade', 'Unidade', 'Preço', 'Categoria', 'Tipo']
+SEM_VALOR = '-'
+
+
+def separar_nome_quantidade(nome_bruto):
+    """
+    Separa o nome do produto da quantidade.
+    Procura por padrões como: 180g, 600g, 1kg, 500ml, Com 10 Unidades, etc.
+    Retorna: (nome_limpo, quantidade, unidade)
+    Se não encontrar quantidade: (nome_limpo, "-", "-")
+    """
+    if not nome_bruto:
+        return (SEM_VALOR, SEM_VALOR, SEM_VALOR)
+    
+    # Tenta padrão final primeiro (mais comum), depois o de unidades
+    match = PADRAO_QUANTIDADE.search(nome_bruto) or PADRAO_UNIDADES.search(nome_bruto)
+    
+    if match:
+        quantidade = match.group(1)
+        unidade = match.group(2).lower()
+        
+        # Remove a quantidade do nome, e o "Com" se ficou no final
+        nome_limpo = nome_bruto[:match.start()].strip()
+        nome_limpo = PADRAO_COM_FINAL.sub('', nome_limpo).strip()
+        
+        return (nome_limpo, quantidade, unidade)
+    
+    return (nome_bruto.strip(), SEM_VALOR, SEM_VALOR)
+
+
+def formatar_preco(preco):
+    """Preço com duas casas decimais, ou "-" se ausente"""
+    if preco is None:
+        return SEM_VALOR
+    try:
+        return f"{float(preco):.2f}"
+    except (ValueError, TypeError):
+        return str(preco) if preco else SEM_VALOR
+
+
+def separar_nomes_quantidades(nomes):
+    """
+    Versão em lote de separar_nome_quantidade para uma Series de nomes brutos.
+    Cada nome distinto é separado uma vez só (a mesma coleta traz o produto em várias
+    buscas e categorias) e o resultado é espalhado de volta para todas as linhas.
+    Retorna DataFrame com as colunas Nome, Quantidade, Unidade.
+    """
+    import numpy as np
+    import pandas as pd
+    
+    posicoes, distintos = pd.factorize(nomes)
+    
+    # Nomes ausentes ficam com posição -1, que cai na última linha ("-", "-", "-")
+    separados = np.empty((len(distintos) + 1, 3), dtype=object)
+    separados[:] = [separar_nome_quantidade(nome) for nome in distintos] + [(SEM_VALOR,) * 3]
+    
+    return pd.DataFrame(separados[posicoes], index=nomes.index,
+                        columns=['Nome', 'Quantidade', 'Unidade'])
+
+
+def formatar_precos(precos):
+    """Versão em lote de formatar_preco para uma Series (dtype object) de preços brutos"""
+    import numpy as np
+    import pandas as pd
+    
+    numericos = pd.to_numeric(precos, errors='coerce')
+    convertidos = numericos.notna()
+    
+    formatados = pd.Series(SEM_VALOR, index=precos.index, dtype=object)
+    formatados[convertidos] = np.char.mod('%.2f', numericos[convertidos].to_numpy(dtype=float))
+    
+    # O que o to_numeric não converteu (textos fora do padrão) segue a regra item a item
+    resto = ~convertidos & precos.notna()
+    if resto.any():
+        formatados[resto] = precos[resto].map(formatar_preco)
+    return formatados
+
+
+def processar_dados_para_planilha(produtos):
+    """
+    Processa os produtos coletados e formata para a planilha.
+    AQUI é onde determinamos se é orgânico ou não baseado no nome.
+    Retorna um DataFrame com as colunas: Nome, Quantidade, Unidade, Preço, Categoria, Tipo
+    """
+    import pandas as pd
+    
+    nomes = pd.Series([produto['nome_bruto'] for produto in produtos], dtype=object)
+    precos = pd.Series([produto['preco_bruto'] for produto in produtos], dtype=object)
+    tipos = pd.Series([produto.get('tipo', TIPO_PADRAO) for produto in produtos], dtype=object)
+    
+    df = separar_nomes_quantidades(nomes)
+    df['Preço'] = formatar_precos(precos)
+    df['Categoria'] = determinar_organicos(nomes)
+    df['Tipo'] = tipos
+    return df[COLUNAS_PLANILHA]
@@ -0,0 +1,61 @@
+"""
+Extração de produtos num pool de processos, separada da rede.
+
+No modo normal a extração (JSON-LD e, na falta dele, árvore BeautifulSoup + varreduras
+do extrator de HTML) roda na mesma thread do laço de eventos que espera a rede, então
+CPU e I/O não se sobrepõem e uma página lenta de analisar atrasa as próximas
+requisições. Com `ExtracaoEmProcessos` os corpos baixados vão para um
+ProcessPoolExecutor: cada worker monta a página, roda a cadeia de extratores da loja e
+devolve só tuplas (nome, preço, id). O número de corpos à espera do pool é limitado, para
+que a rede não acumule páginas em memória mais rápido do que os workers dão conta.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from azumarill.extracao import extrair_produtos
+from azumarill.pagina import PaginaBruta
+
+log = logging.getLogger(__name__)
+
+
+def _extrair_no_worker(conteudo, cadeia):
+    """Roda no processo worker. Retorna [(nome_bruto, preco_bruto, id), ...]"""
+    produtos = extrair_produtos(PaginaBruta(conteudo), cadeia)
+    return [(produto['nome_bruto'], produto['preco_bruto'], produto.get('id')) for produto in produtos]
+
+
+class ExtracaoEmProcessos:
+    """
+    Pool de processos para a extração de produtos.
+    - processos: número de workers (padrão: número de núcleos)
+    - max_pendentes: corpos enviados ao pool e ainda não processados (padrão: 2 por worker);
+      quem chama `extrair` espera quando o limite é atingido
+    Deve ser criado e usado dentro de um mesmo `asyncio.run`, como o MotorDeColeta.
+    """
+
+    def __init__(self, processos=None, max_pendentes=None):
+        self.processos = processos or os.cpu_count() or 1
+        self.max_pendentes = max_pendentes or 2 * self.processos
+        # spawn: os workers não herdam as threads de rede do processo principal
+        self._pool = ProcessPoolExecutor(max_workers=self.processos,
+                                         mp_context=multiprocessing.get_context('spawn'))
+        self._pendentes = asyncio.Semaphore(self.max_pendentes)
+        self.paginas_extraidas = 0
+
+    async def extrair(self, pagina, cadeia):
+        """Extrai os produtos de uma PaginaBruta num worker. Retorna lista de produtos"""
+        async with self._pendentes:
+            registros = await asyncio.get_running_loop().run_in_executor(
+                self._pool, _extrair_no_worker, pagina.conteudo, cadeia)
+        self.paginas_extraidas += 1
+        return [{'nome_bruto': nome, 'preco_bruto': preco, 'id': identificador}
+                for nome, preco, identificador in registros]
+
+    def imprimir_estatisticas(self):
+        log.info(f"🧮 Extração em processos: {self.paginas_extraidas} páginas em {self.processos} workers")
+
+    def fechar(self):
+        self._pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,88 @@
+"""
+Reprocessamento offline: refaz a coleta a partir do acervo de páginas (azumarill.acervo).
+
+Depois de mudar a classificação (`classificar_tipo`), o processamento
+(`separar_nome_quantidade`) ou os extratores, a planilha nova sai das páginas já
+guardadas, sem nenhuma requisição às lojas. `ColetaDoAcervo` é a ColetaDaLoja de
+sempre (mesma paginação, deduplicação e classificação, termos e categorias em
+paralelo) com as páginas lidas do acervo: a última versão de cada URL, ou a última
+buscada até um momento (`ate`), para refazer uma coleta antiga.
+
+A extração roda num pool de processos (padrão: um por núcleo), e os corpos já
+analisados com os mesmos extratores saem do cache de extração do acervo, então mudar
+só a classificação ou o processamento não analisa nenhuma página de novo.
+
+Uso: python -m azumarill reprocessar [-l loja ...] [--acervo acervo_paginas.sqlite] [--ate 2026-10-15T18:00]
+"""
+import asyncio
+import logging
+import os
+import time
+
+from azumarill.coleta import BACKEND_EXTRACAO, ColetaDaLoja, coletar_lojas, salvar_produtos_da_loja
+from azumarill.motor import MotorDeColeta
+from azumarill.pagina import PaginaBruta
+
+log = logging.getLogger('azumarill.reprocessamento')
+
+# Leituras do acervo simultâneas por host, sem limite de taxa (não há servidor do outro lado)
+LEITURAS_SIMULTANEAS = 16
+TAXA_SEM_LIMITE = 1e6
+
+
+class ColetaDoAcervo(ColetaDaLoja):
+    """
+    Coleta de uma loja que lê as páginas do `acervo` em vez da rede.
+    `ate`: timestamp; só vale o que foi buscado até ele (padrão: a última versão de cada URL).
+    URL fora do acervo conta como erro de busca, como uma página que não respondeu.
+    """
+
+    def __init__(self, loja, acervo, backend=BACKEND_EXTRACAO, ate=None):
+        super().__init__(loja, backend, acervo=acervo)
+        self.cache = None
+        self.ate = ate
+        self.paginas_lidas = 0
+        self.paginas_ausentes = 0
+
+    def buscar_pagina(self, url, mostrar_log=False):
+        """Lê a página do acervo. Retorna (PaginaBruta, status), ou (None, None) se não estiver lá"""
+        guardada = self.acervo.ler(self.loja.nome, url, self.ate)
+        if guardada is None:
+            self.paginas_ausentes += 1
+            log.info(f"📭 {url} não está no acervo")
+            return None, None
+        conteudo, status, cabecalhos = guardada
+        self.paginas_lidas += 1
+        return PaginaBruta(conteudo, cabecalhos=cabecalhos), status
+
+    def usar_motor(self, motor):
+        """O motor só reparte as leituras entre as threads: sem limites de cortesia por host"""
+        self.motor = motor
+
+
+def reprocessar(lojas, acervo, backend=BACKEND_EXTRACAO, ate=None, processos=None, brutos=False):
+    """
+    Refaz a coleta das `lojas` (objetos Loja, com as mesmas URLs da coleta original) a
+    partir do `acervo` (AcervoDePaginas) e salva uma planilha por loja (com `brutos`, os
+    produtos brutos), como a coleta normal. O histórico de preços não é atualizado: as
+    páginas são de uma coleta que já passou por ele.
+    `processos`: workers do pool de extração (padrão: número de núcleos).
+    Retorna {nome_da_loja: produtos}.
+    """
+    coletas = [ColetaDoAcervo(loja, acervo, backend, ate) for loja in lojas]
+    motor = MotorDeColeta(max_por_host=LEITURAS_SIMULTANEAS, requisicoes_por_segundo=TAXA_SEM_LIMITE,
+                          rajada=LEITURAS_SIMULTANEAS, adaptativo=False)
+
+    inicio = time.perf_counter()
+    resultados = asyncio.run(coletar_lojas(coletas, processos=processos or os.cpu_count() or 1, motor=motor))
+    log.info(f"\n♻️  Reprocessamento do acervo em {time.perf_counter() - inicio:.1f}s")
+    acervo.imprimir_estatisticas()
+
+    produtos_por_loja = {}
+    for coleta, (produtos_organicos, produtos_nao_organicos) in zip(coletas, resultados):
+        todos_produtos = produtos_organicos + produtos_nao_organicos
+        ausentes = f", {coleta.paginas_ausentes} fora do acervo" if coleta.paginas_ausentes else ''
+        log.info(f"📦 {coleta.loja.nome}: {len(todos_produtos)} produtos de {coleta.paginas_lidas} páginas{ausentes}")
+        salvar_produtos_da_loja(coleta.loja, todos_produtos, brutos, historico=False)
+        produtos_por_loja[coleta.loja.nome] = todos_produtos
+    return produtos_por_loja
@@ -0,0 +1,157 @@
+"""
+Saída contínua da coleta: CSV ou JSONL gravado à medida que as páginas chegam.
+
+No modo normal a coleta junta todos os produtos numa lista e só no fim monta a
+planilha. Com uma SaidaContinua cada página é processada (nome/quantidade, preço,
+Orgânico/Não Orgânico) por um gerador e gravada na hora, com flush por página, e a
+página é descartada em seguida: a memória não cresce com o tamanho do catálogo
+(guarda-se só o conjunto de nomes já gravados, para não repetir linhas).
+
+As linhas saem na ordem em que chegam, sem a ordenação por Categoria/Tipo/Nome da
+planilha final.
+"""
+import csv
+import json
+import logging
+import sys
+
+from azumarill.classificador import TIPO_PADRAO, determinar_organico
+from azumarill.processamento import COLUNAS_PLANILHA, formatar_preco, separar_nome_quantidade
+
+log = logging.getLogger(__name__)
+
+SAIDA_PADRAO = '-'  # JSONL na saída padrão
+
+
+def linhas_planilha(produtos):
+    """
+    Gerador: processa cada produto coletado numa linha da planilha (dict com as
+    colunas Nome, Quantidade, Unidade, Preço, Categoria, Tipo), sob demanda.
+    """
+    for produto in produtos:
+        nome_bruto = produto['nome_bruto']
+        nome_limpo, quantidade, unidade = separar_nome_quantidade(nome_bruto)
+        yield {
+            'Nome': nome_limpo,
+            'Quantidade': quantidade,
+            'Unidade': unidade,
+            'Preço': formatar_preco(produto['preco_bruto']),
+            'Categoria': determinar_organico(nome_bruto),
+            'Tipo': produto.get('tipo', TIPO_PADRAO),
+        }
+
+
+class ListaNaSaida:
+    """
+    Substituta da lista de produtos de uma coleta quando há saída contínua:
+    extend() grava na saída e só a contagem fica em memória (len() funciona,
+    iterar não). Estender com outra ListaNaSaida só soma a contagem, porque
+    aqueles produtos já foram gravados.
+    """
+
+    def __init__(self, saida):
+        self.saida = saida
+        self.total = 0
+
+    def extend(self, produtos):
+        if isinstance(produtos, ListaNaSaida):
+            self.total += len(produtos)
+            return
+        produtos = list(produtos)
+        self.saida.escrever(produtos)
+        self.total += len(produtos)
+
+    def __len__(self):
+        return self.total
+
+
+class SaidaContinua:
+    """
+    Base das saídas contínuas. As chamadas são feitas a partir do laço de eventos
+    (uma thread só), como no DiarioDeColeta.
+    """
+
+    def __init__(self, arquivo, fechar_arquivo=True):
+        self.arquivo = arquivo
+        self._fechar_arquivo = fechar_arquivo
+        self._nomes_gravados = set()
+        self.produtos_recebidos = 0
+        self.linhas_gravadas = 0
+
+    @property
+    def na_saida_padrao(self):
+        return self.arquivo is sys.stdout
+
+    def lista(self):
+        """Nova ListaNaSaida ligada a esta saída"""
+        return ListaNaSaida(self)
+
+    def escrever(self, produtos):
+        """Processa e grava uma página de produtos; nomes já gravados são ignorados"""
+        for linha in linhas_planilha(produtos):
+            self.produtos_recebidos += 1
+            if linha['Nome'] in self._nomes_gravados:
+                continue
+            self._nomes_gravados.add(linha['Nome'])
+            self._gravar(linha)
+            self.linhas_gravadas += 1
+        self.arquivo.flush()
+
+    def _gravar(self, linha):
+        raise NotImplementedError
+
+    def imprimir_estatisticas(self):
+        log.info(f"🚰 Saída contínua: {self.produtos_recebidos} produtos recebidos, "
+                 f"{self.linhas_gravadas} linhas gravadas (sem repetir nomes)")
+
+    def fechar(self):
+        self.arquivo.flush()
+        if self._fechar_arquivo:
+            self.arquivo.close()
+
+
+class SaidaCSV(SaidaContinua):
+    """CSV com as colunas da planilha, no mesmo formato do salvar_planilha (utf-8-sig)"""
+
+    def __init__(self, caminho):
+        super().__init__(open(caminho, 'w', newline='', encoding='utf-8-sig'))
+        self._escritor = csv.DictWriter(self.arquivo, fieldnames=COLUNAS_PLANILHA)
+        self._escritor.writeheader()
+
+    def _gravar(self, linha):
+        self._escritor.writerow(linha)
+
+
+class SaidaJSONL(SaidaContinua):
+    """
+    Uma linha JSON por produto; sem caminho, grava na saída padrão.
+    Com `loja`, cada linha leva também o campo Loja (várias lojas na mesma saída).
+    """
+
+    def __init__(self, caminho=None, loja=None):
+        if caminho is None:
+            super().__init__(sys.stdout, fechar_arquivo=False)
+        else:
+            super().__init__(open(caminho, 'w', encoding='utf-8'))
+        self.loja = loja
+
+    def _gravar(self, linha):
+        if self.loja is not None:
+            linha = {'Loja': self.loja, **linha}
+        self.arquivo.write(json.dumps(linha, ensure_ascii=False) + '\n')
+
+
+def abrir_saida(destino, loja=None):
+    """
+    Abre a saída contínua pelo destino: '-' para JSONL na saída padrão,
+    '*.jsonl' para JSONL em arquivo, qualquer outro caminho para CSV.
+    Com `loja`, '{loja}' no destino é trocado pelo nome dela e o JSONL na saída
+    padrão identifica a loja em cada linha.
+    """
+    if destino == SAIDA_PADRAO:
+        return SaidaJSONL(loja=loja)
+    if loja is not None:
+        destino = destino.format(loja=loja)
+    if destino.endswith('.jsonl'):
+        return SaidaJSONL(destino)
+    return SaidaCSV(destino)
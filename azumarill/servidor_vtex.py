@@ -0,0 +1,373 @@
+"""
+Servidor local que imita uma loja VTEX (vitrine e API de busca) a partir de respostas gravadas.
+
+Permite rodar os scrapers, nos dois backends, sem acessar as lojas de verdade.
+Os dados ficam em um diretório com um arquivo por categoria:
+    <dados>/<categoria>.json (ou .json.gz) -> lista de produtos no formato da API
+Rotas servidas:
+- API de busca (/api/catalog_system/pub/products/search[/<categoria>]): aplica as
+  janelas `_from`/`_to`, filtra por `ft` (termo) e devolve o cabeçalho `resources`
+  como a API real.
+- Vitrine: /<categoria> e a busca por termo (/<qualquer>?_q=<termo>&map=ft), em
+  páginas HTML com o JSON-LD ItemList (numberOfItems com o total da listagem) e os
+  cards de produto que os extratores leem,
+  paginadas por `page`, `_page` ou `from`. Com --sem-jsonld as páginas só têm os cards.
+
+Para testes de carga o servidor injeta falhas (ver `Falhas`): latência sorteada de
+uma distribuição, 429 com Retry-After (sorteados ou acima de um limite de req/s),
+erros 5xx e páginas repetidas.
+
+Uso:
+    python -m azumarill.servidor_vtex --dados benchmarks/api/zonasul --porta 8000
+    AZUMARILL_BACKEND=api AZUMARILL_URL_API=http://127.0.0.1:8000 python zonasul_scrapper.py
+    AZUMARILL_URL_LOJA=http://127.0.0.1:8000 python zonasul_scrapper.py
+    python -m azumarill.servidor_vtex --dados benchmarks/api/zonasul --latencia lognormal:0.05:0.5 --taxa-429 0.02
+
+Para gravar respostas reais:
+    python -m azumarill.servidor_vtex --dados DIR --gravar https://www.zonasul.com.br hortifruti mercearia
+"""
+import argparse
+import gzip
+import html
+import json
+import random
+import threading
+import time
+import unicodedata
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from azumarill.paginacao import ITENS_POR_PAGINA
+from azumarill.vtex import CAMINHO_BUSCA, ITENS_POR_JANELA, extrair_produtos_api, url_busca_api
+
+# Status sorteados quando uma requisição é escolhida para falhar com 5xx
+STATUS_5XX = (500, 502, 503)
+
+
+def _sem_acentos(texto):
+    return ''.join(c for c in unicodedata.normalize('NFKD', texto.lower()) if not unicodedata.combining(c))
+
+
+def carregar_dados(diretorio):
+    """Lê os arquivos de categoria. Retorna {categoria: [produtos]}"""
+    dados = {}
+    for caminho in sorted(Path(diretorio).glob('*.json*')):
+        nome = caminho.name.removesuffix('.gz').removesuffix('.json')
+        bruto = caminho.read_bytes()
+        if caminho.suffix == '.gz':
+            bruto = gzip.decompress(bruto)
+        dados[nome] = json.loads(bruto)
+    return dados
+
+
+def distribuicao_latencia(especificacao):
+    """
+    Monta o sorteio de latência a partir de uma especificação:
+    'fixa:S', 'uniforme:MIN:MAX', 'exponencial:MEDIA' ou 'lognormal:MEDIANA:SIGMA' (segundos).
+    Retorna função (random.Random) -> segundos, ou None sem especificação.
+    """
+    if not especificacao:
+        return None
+    nome, _, parametros = especificacao.partition(':')
+    try:
+        valores = [float(v) for v in parametros.split(':')] if parametros else []
+    except ValueError:
+        raise ValueError(f"Latência inválida: {especificacao!r}") from None
+
+    formas = {
+        'fixa': (1, lambda aleatorio, s: s),
+        'uniforme': (2, lambda aleatorio, minimo, maximo: aleatorio.uniform(minimo, maximo)),
+        'exponencial': (1, lambda aleatorio, media: aleatorio.expovariate(1 / media)),
+        'lognormal': (2, lambda aleatorio, mediana, sigma: mediana * aleatorio.lognormvariate(0, sigma)),
+    }
+    if nome not in formas or len(valores) != formas[nome][0]:
+        raise ValueError(f"Latência inválida: {especificacao!r} "
+                         "(use fixa:S, uniforme:MIN:MAX, exponencial:MEDIA ou lognormal:MEDIANA:SIGMA)")
+    sortear = formas[nome][1]
+    return lambda aleatorio: sortear(aleatorio, *valores)
+
+
+class Falhas:
+    """
+    Falhas injetadas pelo servidor, sorteadas a cada requisição:
+    - latencia: especificação de distribuicao_latencia, ex. 'lognormal:0.05:0.5'
+    - taxa_429: fração respondida com 429 e cabeçalho Retry-After (`retry_after` segundos)
+    - taxa_5xx: fração respondida com 500, 502 ou 503
+    - taxa_repeticao: fração das páginas (ou janelas da API) depois da primeira respondida
+      com o conteúdo da anterior, como uma vitrine que ignora o parâmetro de paginação
+    - semente: semente do sorteio, para repetir um cenário
+    - limite_taxa: req/s aceitas (balde de tokens com rajada de 1 s); acima disso, 429
+      com Retry-After, como o limitador de uma loja de verdade
+    """
+
+    def __init__(self, latencia=None, taxa_429=0.0, taxa_5xx=0.0, taxa_repeticao=0.0,
+                 retry_after=1, semente=None, limite_taxa=None):
+        self.latencia = distribuicao_latencia(latencia)
+        self.taxa_429 = taxa_429
+        self.taxa_5xx = taxa_5xx
+        self.taxa_repeticao = taxa_repeticao
+        self.retry_after = retry_after
+        self.limite_taxa = limite_taxa
+        self._tokens = limite_taxa or 0.0
+        self._ultima_reposicao = time.monotonic()
+        self._aleatorio = random.Random(semente)
+        self._trava = threading.Lock()  # o servidor atende cada requisição numa thread
+
+    def _acima_do_limite(self):
+        """Consome um token do limite de taxa. Retorna True se não havia token"""
+        agora = time.monotonic()
+        self._tokens = min(self.limite_taxa, self._tokens + (agora - self._ultima_reposicao) * self.limite_taxa)
+        self._ultima_reposicao = agora
+        if self._tokens < 1:
+            return True
+        self._tokens -= 1
+        return False
+
+    def sortear(self):
+        """Retorna (espera em segundos, status de erro ou None, repetir página anterior)"""
+        with self._trava:
+            espera = self.latencia(self._aleatorio) if self.latencia else 0.0
+            sorteio = self._aleatorio.random()
+            status_erro = None
+            if self.limite_taxa and self._acima_do_limite():
+                status_erro = 429
+            elif sorteio < self.taxa_429:
+                status_erro = 429
+            elif sorteio < self.taxa_429 + self.taxa_5xx:
+                status_erro = self._aleatorio.choice(STATUS_5XX)
+            repetir = status_erro is None and self._aleatorio.random() < self.taxa_repeticao
+        return espera, status_erro, repetir
+
+
+def renderizar_pagina(produtos, com_jsonld=True, total=None):
+    """
+    Monta uma página de listagem com os produtos ({'nome_bruto', 'preco_bruto', 'id'}):
+    JSON-LD ItemList (se com_jsonld, com `total` em numberOfItems) e um card por produto.
+    Retorna bytes.
+    """
+    partes = ['<!DOCTYPE html><html lang="pt-BR"><head><meta charset="utf-8"><title>Loja local</title>']
+    if com_jsonld:
+        itens = [{'@type': 'ListItem', 'position': posicao,
+                  'item': {'@type': 'Product', 'name': produto['nome_bruto'], 'sku': produto.get('id'),
+                           'offers': {'@type': 'AggregateOffer', 'lowPrice': produto['preco_bruto'],
+                                      'priceCurrency': 'BRL'}}}
+                 for posicao, produto in enumerate(produtos, start=1)]
+        partes.append('<script type="application/ld+json">'
+                      + json.dumps({'@context': 'https://schema.org', '@type': 'ItemList',
+                                    'numberOfItems': len(produtos) if total is None else total,
+                                    'itemListElement': itens}, ensure_ascii=False)
+                      + '</script>')
+    partes.append('</head><body><div class="vtex-search-result-3-x-gallery">')
+    for produto in produtos:
+        nome = html.escape(produto['nome_bruto'])
+        preco = produto['preco_bruto']
+        preco_txt = '' if preco is None else f'R$ {preco:.2f}'.replace('.', ',')
+        partes.append(
+            f'<div class="vtex-product-summary-2-x-container">'
+            f'<img class="vtex-product-summary-2-x-image" alt="{nome}" src="/arquivos/ids/0">'
+            f'<span class="vtex-product-summary-2-x-productBrand">{nome}</span>'
+            f'<span class="vtex-product-price-1-x-sellingPriceValue">{preco_txt}</span></div>')
+    partes.append('</div></body></html>')
+    return ''.join(partes).encode('utf-8')
+
+
+def _deslocamento_da_vitrine(parametros):
+    """Posição do primeiro produto da página pedida (page/_page = número, from = deslocamento)"""
+    for nome in ('page', '_page'):
+        if nome in parametros:
+            return (max(1, int(parametros[nome][0])) - 1) * ITENS_POR_PAGINA
+    if 'from' in parametros:
+        return max(0, int(parametros['from'][0]))
+    return 0
+
+
+def criar_servidor(dados, host='127.0.0.1', porta=0, falhas=None, com_jsonld=True):
+    """
+    Cria o servidor (sem iniciar). Com porta=0 o sistema escolhe uma porta livre;
+    a URL fica em `servidor.url` e as contagens por status em `servidor.estatisticas`.
+    - falhas: Falhas injetadas (padrão: nenhuma)
+    - com_jsonld: False serve páginas da vitrine só com os cards HTML
+    """
+    falhas = falhas or Falhas()
+    todos = [produto for produtos in dados.values() for produto in produtos]
+    # Vitrine: mesmos produtos, já no formato {'nome_bruto', 'preco_bruto', 'id'}
+    vitrine = {categoria: extrair_produtos_api(json.dumps(produtos)) for categoria, produtos in dados.items()}
+    vitrine_toda = [produto for produtos in vitrine.values() for produto in produtos]
+    estatisticas = {'requisicoes': 0, 'repetidas': 0, 'status': {}}
+    trava = threading.Lock()
+    
+    class ManipuladorVTEX(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive, como as lojas
+        
+        def log_message(self, formato, *args):
+            pass  # sem log por requisição
+
+        def responder(self, status, corpo, tipo, cabecalhos=()):
+            with trava:
+                estatisticas['status'][status] = estatisticas['status'].get(status, 0) + 1
+            self.send_response(status)
+            self.send_header('Content-Type', tipo)
+            self.send_header('Content-Length', str(len(corpo)))
+            for nome, valor in cabecalhos:
+                self.send_header(nome, valor)
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def do_GET(self):
+            espera, status_erro, repetir = falhas.sortear()
+            with trava:
+                estatisticas['requisicoes'] += 1
+            if espera:
+                time.sleep(espera)
+            if status_erro == 429:
+                self.responder(429, b'Too Many Requests', 'text/plain', [('Retry-After', str(falhas.retry_after))])
+                return
+            if status_erro is not None:
+                self.responder(status_erro, b'Erro simulado', 'text/plain')
+                return
+            
+            partes = urlsplit(self.path)
+            parametros = parse_qs(partes.query)
+            try:
+                if partes.path.startswith(CAMINHO_BUSCA):
+                    self.servir_api(partes, parametros, repetir)
+                else:
+                    self.servir_vitrine(partes, parametros, repetir)
+            except ValueError:
+                self.responder(400, b'Parametro invalido', 'text/plain')
+
+        def contar_repeticao(self, repetir, inicio, tamanho):
+            """Recua uma página quando a repetição foi sorteada (só depois da primeira)"""
+            if not repetir or inicio < tamanho:
+                return inicio
+            with trava:
+                estatisticas['repetidas'] += 1
+            return inicio - tamanho
+
+        def servir_api(self, partes, parametros, repetir):
+            categoria = unquote(partes.path[len(CAMINHO_BUSCA):].strip('/'))
+            if categoria and categoria not in dados:
+                produtos = []
+            else:
+                produtos = dados[categoria] if categoria else todos
+            
+            termo = parametros.get('ft', [''])[0]
+            if termo:
+                termo = _sem_acentos(termo)
+                produtos = [p for p in produtos if termo in _sem_acentos(p.get('productName', ''))]
+            
+            inicio = int(parametros.get('_from', ['0'])[0])
+            fim = int(parametros.get('_to', [str(ITENS_POR_JANELA - 1)])[0])
+            inicio_servido = self.contar_repeticao(repetir, inicio, fim - inicio + 1)
+            janela = produtos[inicio_servido:inicio_servido + fim - inicio + 1]
+            corpo = json.dumps(janela, ensure_ascii=False).encode('utf-8')
+            self.responder(200 if len(janela) == len(produtos) else 206, corpo,
+                           'application/json; charset=utf-8', [('resources', f"{inicio}-{fim}/{len(produtos)}")])
+
+        def servir_vitrine(self, partes, parametros, repetir):
+            termo = parametros.get('_q', [''])[0]
+            if termo:
+                termo = _sem_acentos(termo)
+                produtos = [p for p in vitrine_toda if termo in _sem_acentos(p['nome_bruto'])]
+            else:
+                categoria = unquote(partes.path.strip('/')).split('/')[0]
+                if not categoria:
+                    self.responder(404, b'Not Found', 'text/plain')
+                    return
+                produtos = vitrine.get(categoria, [])
+            
+            inicio = self.contar_repeticao(repetir, _deslocamento_da_vitrine(parametros), ITENS_POR_PAGINA)
+            corpo = renderizar_pagina(produtos[inicio:inicio + ITENS_POR_PAGINA], com_jsonld, len(produtos))
+            self.responder(200, corpo, 'text/html; charset=utf-8')
+    
+    servidor = ThreadingHTTPServer((host, porta), ManipuladorVTEX)
+    servidor.daemon_threads = True
+    servidor.url = f"http://{host}:{servidor.server_address[1]}"
+    servidor.estatisticas = estatisticas
+    return servidor
+
+
+def iniciar_em_thread(dados, host='127.0.0.1', porta=0, falhas=None, com_jsonld=True):
+    """Sobe o servidor numa thread em segundo plano. Retorna o servidor (use servidor.shutdown())."""
+    servidor = criar_servidor(dados, host, porta, falhas, com_jsonld)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+def gravar(url_loja, categorias, diretorio):
+    """Baixa todas as janelas de cada categoria da API real e grava em <diretorio>/<categoria>.json.gz"""
+    import requests
+    diretorio = Path(diretorio)
+    diretorio.mkdir(parents=True, exist_ok=True)
+    for categoria in categorias:
+        produtos = []
+        inicio = 0
+        while True:
+            url = url_busca_api(url_loja, categoria, None, inicio, inicio + ITENS_POR_JANELA - 1)
+            resposta = requests.get(url, timeout=10)
+            resposta.raise_for_status()
+            janela = resposta.json()
+            produtos.extend(janela)
+            if len(janela) < ITENS_POR_JANELA:
+                break
+            inicio += ITENS_POR_JANELA
+        caminho = diretorio / f"{categoria}.json.gz"
+        caminho.write_bytes(gzip.compress(json.dumps(produtos, ensure_ascii=False).encode('utf-8'), mtime=0))
+        print(f"✅ {len(produtos)} produtos gravados em {caminho}")
+
+
+def distribuicao_latencia_valida(especificacao):
+    """Tipo de argumento do argparse: valida a especificação e a devolve como texto"""
+    try:
+        distribuicao_latencia(especificacao)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return especificacao
+
+
+def adicionar_argumentos_falhas(parser):
+    """Opções de injeção de falhas, compartilhadas com o teste de carga"""
+    parser.add_argument('--latencia', type=distribuicao_latencia_valida, metavar='DISTRIBUICAO',
+                        help='ex.: fixa:0.05, uniforme:0.02:0.2, exponencial:0.05, lognormal:0.05:0.5')
+    parser.add_argument('--taxa-429', type=float, default=0.0, help='fração de respostas 429')
+    parser.add_argument('--retry-after', type=int, default=1, help='segundos no Retry-After dos 429')
+    parser.add_argument('--taxa-5xx', type=float, default=0.0, help='fração de respostas 5xx')
+    parser.add_argument('--taxa-repeticao', type=float, default=0.0, help='fração de páginas repetidas')
+    parser.add_argument('--semente', type=int, help='semente do sorteio das falhas')
+    parser.add_argument('--limite-taxa', type=float, help='req/s aceitas; acima disso responde 429')
+
+
+def falhas_dos_argumentos(args):
+    return Falhas(args.latencia, args.taxa_429, args.taxa_5xx, args.taxa_repeticao,
+                  args.retry_after, args.semente, args.limite_taxa)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dados', required=True, help='diretório com os arquivos de categoria')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8000)
+    parser.add_argument('--gravar', nargs='+', metavar=('URL_LOJA', 'CATEGORIA'),
+                        help='grava respostas reais em vez de servir')
+    parser.add_argument('--sem-jsonld', action='store_true', help='páginas da vitrine só com os cards HTML')
+    adicionar_argumentos_falhas(parser)
+    args = parser.parse_args()
+    
+    if args.gravar:
+        gravar(args.gravar[0], args.gravar[1:], args.dados)
+        return
+    
+    dados = carregar_dados(args.dados)
+    falhas = falhas_dos_argumentos(args)
+    servidor = criar_servidor(dados, args.host, args.porta, falhas, com_jsonld=not args.sem_jsonld)
+    print(f"🛒 Loja VTEX local em {servidor.url} ({sum(len(p) for p in dados.values())} produtos, "
+          f"{len(dados)} categorias)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
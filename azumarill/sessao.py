@@ -0,0 +1,127 @@
+"""
+Camada de sessão HTTP compartilhada pelos scrapers.
+
+Uma única `requests.Session` por scraper mantém conexões keep-alive num pool
+(evitando um novo handshake TCP/TLS a cada página) e monta um adaptador que
+refaz requisições com backoff exponencial e jitter em 5xx, 429 e conexões resetadas.
+"""
+import email.utils
+import logging
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+log = logging.getLogger(__name__)
+
+# Status HTTP que valem uma nova tentativa
+STATUS_PARA_RETENTAR = (429, 500, 502, 503, 504)
+
+
+def criar_retentativas(tentativas=4, fator_backoff=0.5, jitter=0.5):
+    """
+    Cria a política de retentativas do urllib3.
+    Espera fator_backoff * 2^(n-1) segundos antes da n-ésima nova tentativa, mais um
+    jitter aleatório de até `jitter` segundos. Respeita o cabeçalho Retry-After.
+    """
+    parametros = dict(
+        total=tentativas,
+        connect=tentativas,
+        read=tentativas,  # inclui conexões resetadas pelo servidor
+        status=tentativas,
+        backoff_factor=fator_backoff,
+        status_forcelist=STATUS_PARA_RETENTAR,
+        allowed_methods=frozenset({'GET', 'HEAD'}),
+        respect_retry_after_header=True,
+        raise_on_status=False,  # devolve a última resposta; raise_for_status trata o erro
+    )
+    try:
+        return Retry(backoff_jitter=jitter, **parametros)
+    except TypeError:
+        # urllib3 < 2.0 não tem jitter
+        return Retry(**parametros)
+
+
+def criar_sessao(headers=None, pool_conexoes=10, pool_maximo=10, tentativas=4,
+                 fator_backoff=0.5, jitter=0.5):
+    """
+    Cria uma sessão com pool de conexões keep-alive e retentativas.
+    - pool_conexoes: quantos hosts distintos mantêm pool aberto
+    - pool_maximo: conexões mantidas por host (use pelo menos o número de requisições
+      simultâneas por host, senão conexões excedentes são descartadas após o uso)
+    Retorna a requests.Session configurada.
+    """
+    sessao = requests.Session()
+    if headers:
+        sessao.headers.update(headers)
+    
+    adaptador = HTTPAdapter(
+        pool_connections=pool_conexoes,
+        pool_maxsize=pool_maximo,
+        max_retries=criar_retentativas(tentativas, fator_backoff, jitter),
+    )
+    sessao.mount('https://', adaptador)
+    sessao.mount('http://', adaptador)
+    return sessao
+
+
+def retentativas_da_resposta(response):
+    """Quantas retentativas a sessão fez até chegar a esta resposta (0 sem resposta)"""
+    retries = getattr(getattr(response, 'raw', None), 'retries', None)
+    return len(retries.history) if retries is not None else 0
+
+
+def status_das_retentativas(response):
+    """Status HTTP das tentativas que a sessão refez antes desta resposta (None nas falhas de conexão)"""
+    retries = getattr(getattr(response, 'raw', None), 'retries', None)
+    return tuple(tentativa.status for tentativa in retries.history) if retries is not None else ()
+
+
+def segundos_retry_after(response):
+    """Segundos pedidos pelo cabeçalho Retry-After (em segundos ou data HTTP), ou None"""
+    valor = response.headers.get('Retry-After') if response is not None else None
+    if not valor:
+        return None
+    try:
+        return max(0.0, float(valor))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(valor).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def estatisticas_conexoes(sessao):
+    """
+    Soma os contadores dos pools de conexão da sessão.
+    Retorna dict com: requisicoes, conexoes_novas, conexoes_reutilizadas
+    (conexoes_reutilizadas é o número de handshakes economizados pelo keep-alive).
+    """
+    requisicoes = 0
+    conexoes_novas = 0
+    adaptadores = {id(a): a for a in sessao.adapters.values()}.values()
+    
+    for adaptador in adaptadores:
+        pools = adaptador.poolmanager.pools
+        for chave in pools.keys():
+            pool = pools.get(chave)
+            if pool is None:
+                continue
+            requisicoes += pool.num_requests
+            conexoes_novas += pool.num_connections
+    
+    return {
+        'requisicoes': requisicoes,
+        'conexoes_novas': conexoes_novas,
+        'conexoes_reutilizadas': max(0, requisicoes - conexoes_novas),
+    }
+
+
+def imprimir_estatisticas_conexoes(sessao):
+    """Mostra o resumo de reuso de conexões da sessão"""
+    stats = estatisticas_conexoes(sessao)
+    log.info(f"\n🔌 Conexões: {stats['requisicoes']} requisições, "
+             f"{stats['conexoes_novas']} conexões novas, "
+             f"{stats['conexoes_reutilizadas']} reutilizadas (handshakes economizados)")
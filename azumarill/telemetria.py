@@ -0,0 +1,337 @@
+"""
+Telemetria da coleta: métricas por etapa e logs que não seguram o laço de eventos.
+
+`Telemetria` junta as métricas de uma execução: histogramas de latência das buscas
+por host, bytes baixados, status, retentativas e erros, tempo de extração por página,
+tempo de classificação, esperas de cortesia (balde de tokens) e de concorrência
+(semáforo) por host e produtos por segundo. No fim da execução vira um relatório JSON
+e/ou um arquivo no formato texto do Prometheus (para o textfile collector do
+node_exporter).
+
+Os logs do pacote vão para o logger 'azumarill'. `configurar_logs` liga nele um
+QueueHandler: quem loga só enfileira o registro, e uma thread separada escreve no
+console. Com nível 'warning' as mensagens de progresso nem chegam a ser enfileiradas.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+# Nível dos logs quando não informado: AZUMARILL_LOG=debug|info|warning|error
+NIVEL_LOG_PADRAO = os.environ.get('AZUMARILL_LOG', 'info')
+
+# Limites (segundos) dos baldes dos histogramas, os mesmos padrões dos clientes Prometheus
+LIMITES_BUSCA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+LIMITES_EXTRACAO = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+
+PREFIXO_PROMETHEUS = 'azumarill'
+
+_ouvinte = None  # QueueListener dos logs, criado por configurar_logs
+
+
+def configurar_logs(nivel=None, stream=None):
+    """
+    Envia os logs do pacote para o console (stderr) por uma fila.
+    - nivel: 'debug', 'info', 'warning', 'error' (ou número do logging); sem ele usa
+      AZUMARILL_LOG, ou mantém o nível atual se os logs já estiverem configurados
+    Retorna o logger 'azumarill'.
+    """
+    global _ouvinte
+    logger = logging.getLogger('azumarill')
+    if _ouvinte is not None and nivel is None:
+        return logger
+
+    nivel = nivel or NIVEL_LOG_PADRAO
+    if isinstance(nivel, str):
+        nivel = logging.getLevelName(nivel.upper())
+        if not isinstance(nivel, int):
+            raise ValueError(f"Nível de log desconhecido: {nivel!r}")
+    logger.setLevel(nivel)
+
+    if _ouvinte is None:
+        fila = queue.SimpleQueue()
+        console = logging.StreamHandler(stream or sys.stderr)
+        console.setFormatter(logging.Formatter('%(message)s'))
+        _ouvinte = logging.handlers.QueueListener(fila, console)
+        _ouvinte.start()
+        logger.addHandler(logging.handlers.QueueHandler(fila))
+        logger.propagate = False
+        atexit.register(encerrar_logs)
+    return logger
+
+
+def encerrar_logs():
+    """Escreve o que ainda está na fila de logs e para a thread do console"""
+    global _ouvinte
+    if _ouvinte is None:
+        return
+    _ouvinte.stop()
+    logger = logging.getLogger('azumarill')
+    for handler in list(logger.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            logger.removeHandler(handler)
+    logger.propagate = True
+    _ouvinte = None
+
+
+class Histograma:
+    """Histograma de baldes fixos (contagem por faixa, soma e total), como os do Prometheus"""
+
+    def __init__(self, limites=LIMITES_BUSCA):
+        self.limites = tuple(limites)
+        self.contagens = [0] * (len(self.limites) + 1)  # o último é o +Inf
+        self.soma = 0.0
+        self.total = 0
+
+    def observar(self, valor):
+        self.contagens[bisect_left(self.limites, valor)] += 1
+        self.soma += valor
+        self.total += 1
+
+    def percentil(self, p):
+        """Estimativa do percentil `p` (0-1) por interpolação linear dentro do balde. None se vazio"""
+        if self.total == 0:
+            return None
+        alvo = p * self.total
+        acumulado = 0
+        inferior = 0.0
+        for limite, contagem in zip(self.limites, self.contagens):
+            if contagem and acumulado + contagem >= alvo:
+                return inferior + (limite - inferior) * (alvo - acumulado) / contagem
+            acumulado += contagem
+            inferior = limite
+        return self.limites[-1]  # caiu no +Inf: o maior limite conhecido
+
+    def baldes_acumulados(self):
+        """[(limite, contagem acumulada)], terminando em ('+Inf', total)"""
+        acumulados = []
+        acumulado = 0
+        for limite, contagem in zip(self.limites + ('+Inf',), self.contagens):
+            acumulado += contagem
+            acumulados.append((limite, acumulado))
+        return acumulados
+
+    def como_dict(self):
+        return {
+            'total': self.total,
+            'soma_segundos': round(self.soma, 6),
+            'media_segundos': round(self.soma / self.total, 6) if self.total else None,
+            'p50_segundos': _arredondar(self.percentil(0.5)),
+            'p90_segundos': _arredondar(self.percentil(0.9)),
+            'p99_segundos': _arredondar(self.percentil(0.99)),
+            'baldes': {str(limite): contagem for limite, contagem in self.baldes_acumulados()},
+        }
+
+
+def _arredondar(valor):
+    return None if valor is None else round(valor, 6)
+
+
+def _host(url):
+    # Mais barato que urlsplit, e esta função roda a cada requisição
+    return url.split('://', 1)[-1].split('/', 1)[0].split('?', 1)[0]
+
+
+class Telemetria:
+    """
+    Métricas de uma execução da coleta. As buscas registram a partir das threads do
+    motor e o resto a partir do laço de eventos, então os registros passam por uma trava.
+    """
+
+    def __init__(self):
+        self.inicio = time.time()
+        self.fim = None
+        self._trava = threading.Lock()
+
+        # Por host
+        self.latencia_busca = {}
+        self.bytes_baixados = {}
+        self.status = {}  # {host: {status: contagem}}
+        self.retentativas = {}
+        self.erros = {}  # {host: {tipo do erro: contagem}}
+        self.espera_cortesia = {}
+        self.espera_concorrencia = {}
+        self.controle = {}  # {host: resumo do controle adaptativo de taxa}
+
+        self.extracao = Histograma(LIMITES_EXTRACAO)
+        self.produtos_extraidos = 0
+        self.classificacao_segundos = 0.0
+        self.produtos_classificados = 0
+        self.produtos_por_loja = {}
+
+    def registrar_busca(self, url, segundos, status=None, tamanho=0, retentativas=0, erro=None):
+        """Uma chamada de busca de página (com as retentativas feitas pela sessão)"""
+        host = _host(url)
+        with self._trava:
+            if host not in self.latencia_busca:
+                self.latencia_busca[host] = Histograma(LIMITES_BUSCA)
+            self.latencia_busca[host].observar(segundos)
+            self.bytes_baixados[host] = self.bytes_baixados.get(host, 0) + tamanho
+            if status is not None:
+                por_status = self.status.setdefault(host, {})
+                por_status[status] = por_status.get(status, 0) + 1
+            if retentativas:
+                self.retentativas[host] = self.retentativas.get(host, 0) + retentativas
+            if erro is not None:
+                por_tipo = self.erros.setdefault(host, {})
+                tipo = type(erro).__name__
+                por_tipo[tipo] = por_tipo.get(tipo, 0) + 1
+
+    def registrar_extracao(self, segundos, produtos):
+        """Extração dos produtos de uma página (ou janela da API)"""
+        with self._trava:
+            self.extracao.observar(segundos)
+            self.produtos_extraidos += produtos
+
+    def registrar_classificacao(self, segundos, produtos):
+        with self._trava:
+            self.classificacao_segundos += segundos
+            self.produtos_classificados += produtos
+
+    def registrar_espera(self, url, cortesia, concorrencia):
+        """Tempo que uma requisição esperou pelo balde de tokens e pelo semáforo do host"""
+        host = _host(url)
+        with self._trava:
+            self.espera_cortesia[host] = self.espera_cortesia.get(host, 0.0) + cortesia
+            self.espera_concorrencia[host] = self.espera_concorrencia.get(host, 0.0) + concorrencia
+
+    def registrar_controle(self, resumos):
+        """Resumo do controle adaptativo de taxa por host (MotorDeColeta.resumo_controle), ao fim da coleta"""
+        with self._trava:
+            self.controle.update(resumos)
+
+    def registrar_produtos(self, loja, total):
+        """Total de produtos coletados por uma loja, ao fim da coleta"""
+        self.produtos_por_loja[loja] = total
+
+    def finalizar(self):
+        self.fim = time.time()
+
+    @property
+    def duracao(self):
+        return (self.fim or time.time()) - self.inicio
+
+    @property
+    def produtos_por_segundo(self):
+        produtos = sum(self.produtos_por_loja.values()) or self.produtos_extraidos
+        return produtos / self.duracao if self.duracao > 0 else 0.0
+
+    def relatorio(self):
+        """Relatório da execução (dict serializável em JSON)"""
+        hosts = sorted(set(self.latencia_busca) | set(self.espera_cortesia) | set(self.controle))
+        return {
+            'inicio': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.inicio)),
+            'duracao_segundos': round(self.duracao, 3),
+            'produtos_por_loja': dict(self.produtos_por_loja),
+            'produtos_por_segundo': round(self.produtos_por_segundo, 2),
+            'hosts': {
+                host: {
+                    'busca': self.latencia_busca[host].como_dict() if host in self.latencia_busca else None,
+                    'bytes_baixados': self.bytes_baixados.get(host, 0),
+                    'status': {str(s): n for s, n in sorted(self.status.get(host, {}).items())},
+                    'retentativas': self.retentativas.get(host, 0),
+                    'erros': dict(self.erros.get(host, {})),
+                    'espera_cortesia_segundos': round(self.espera_cortesia.get(host, 0.0), 3),
+                    'espera_concorrencia_segundos': round(self.espera_concorrencia.get(host, 0.0), 3),
+                    'controle_taxa': self.controle.get(host),
+                }
+                for host in hosts
+            },
+            'extracao': {**self.extracao.como_dict(), 'produtos': self.produtos_extraidos},
+            'classificacao': {
+                'segundos': round(self.classificacao_segundos, 6),
+                'produtos': self.produtos_classificados,
+            },
+        }
+
+    def gravar_json(self, caminho):
+        Path(caminho).write_text(json.dumps(self.relatorio(), indent=2, ensure_ascii=False) + '\n',
+                                 encoding='utf-8')
+
+    def texto_prometheus(self):
+        """Métricas no formato texto de exposição do Prometheus"""
+        p = PREFIXO_PROMETHEUS
+        linhas = []
+
+        def metrica(nome, tipo, ajuda, amostras):
+            linhas.append(f'# HELP {p}_{nome} {ajuda}')
+            linhas.append(f'# TYPE {p}_{nome} {tipo}')
+            for sufixo, rotulos, valor in amostras:
+                texto_rotulos = ','.join(f'{chave}="{_escapar(str(v))}"' for chave, v in rotulos.items())
+                linhas.append(f'{p}_{nome}{sufixo}{{{texto_rotulos}}} {valor}' if rotulos
+                              else f'{p}_{nome}{sufixo} {valor}')
+
+        def amostras_histograma(histograma, rotulos):
+            for limite, acumulado in histograma.baldes_acumulados():
+                yield '_bucket', {**rotulos, 'le': limite}, acumulado
+            yield '_sum', rotulos, histograma.soma
+            yield '_count', rotulos, histograma.total
+
+        metrica('busca_segundos', 'histogram', 'Latência das buscas de página, com retentativas',
+                [a for host, h in sorted(self.latencia_busca.items()) for a in amostras_histograma(h, {'host': host})])
+        metrica('bytes_baixados_total', 'counter', 'Bytes dos corpos das respostas',
+                [('', {'host': host}, n) for host, n in sorted(self.bytes_baixados.items())])
+        metrica('respostas_total', 'counter', 'Respostas por status HTTP',
+                [('', {'host': host, 'status': s}, n)
+                 for host, por_status in sorted(self.status.items()) for s, n in sorted(por_status.items())])
+        metrica('retentativas_total', 'counter', 'Retentativas feitas pela sessão HTTP',
+                [('', {'host': host}, n) for host, n in sorted(self.retentativas.items())])
+        metrica('erros_total', 'counter', 'Buscas que terminaram em erro, por tipo',
+                [('', {'host': host, 'tipo': tipo}, n)
+                 for host, por_tipo in sorted(self.erros.items()) for tipo, n in sorted(por_tipo.items())])
+        metrica('espera_cortesia_segundos_total', 'counter', 'Tempo esperando o balde de tokens do host',
+                [('', {'host': host}, round(s, 6)) for host, s in sorted(self.espera_cortesia.items())])
+        metrica('espera_concorrencia_segundos_total', 'counter', 'Tempo esperando vaga no semáforo do host',
+                [('', {'host': host}, round(s, 6)) for host, s in sorted(self.espera_concorrencia.items())])
+        metrica('taxa_requisicoes', 'gauge', 'Taxa do host (req/s) ao fim da execução, pelo controle adaptativo',
+                [('', {'host': host}, resumo['taxa_final']) for host, resumo in sorted(self.controle.items())])
+        metrica('reducoes_taxa_total', 'counter', 'Reduções da taxa do host pelo controle adaptativo, por motivo',
+                [('', {'host': host, 'motivo': motivo}, n)
+                 for host, resumo in sorted(self.controle.items()) for motivo, n in sorted(resumo['reducoes'].items())])
+        metrica('extracao_segundos', 'histogram', 'Tempo de extração dos produtos por página',
+                list(amostras_histograma(self.extracao, {})))
+        metrica('produtos_extraidos_total', 'counter', 'Produtos extraídos das páginas',
+                [('', {}, self.produtos_extraidos)])
+        metrica('classificacao_segundos_total', 'counter', 'Tempo classificando o tipo dos produtos',
+                [('', {}, round(self.classificacao_segundos, 6))])
+        metrica('produtos_coletados', 'gauge', 'Produtos coletados por loja na última execução',
+                [('', {'loja': loja}, n) for loja, n in sorted(self.produtos_por_loja.items())])
+        metrica('produtos_por_segundo', 'gauge', 'Produtos coletados por segundo na última execução',
+                [('', {}, round(self.produtos_por_segundo, 3))])
+        metrica('duracao_segundos', 'gauge', 'Duração da última execução', [('', {}, round(self.duracao, 3))])
+        metrica('ultima_execucao_timestamp_segundos', 'gauge', 'Fim da última execução (Unix)',
+                [('', {}, round(self.fim or time.time(), 3))])
+        return '\n'.join(linhas) + '\n'
+
+    def gravar_prometheus(self, caminho):
+        """Grava o arquivo de métricas de uma vez (arquivo temporário + rename), como pede o textfile collector"""
+        caminho = Path(caminho)
+        temporario = caminho.with_name(caminho.name + '.tmp')
+        temporario.write_text(self.texto_prometheus(), encoding='utf-8')
+        os.replace(temporario, caminho)
+
+    def imprimir_resumo(self):
+        log.info(f"\n📈 Telemetria: {self.duracao:.1f}s, {self.produtos_por_segundo:.1f} produtos/s")
+        for host, histograma in sorted(self.latencia_busca.items()):
+            p50, p99 = histograma.percentil(0.5), histograma.percentil(0.99)
+            log.info(f"   {host}: {histograma.total} buscas, p50 {p50 * 1000:.0f} ms, p99 {p99 * 1000:.0f} ms, "
+                     f"{self.bytes_baixados.get(host, 0) / 1e6:.1f} MB, "
+                     f"{self.retentativas.get(host, 0)} retentativas, {sum(self.erros.get(host, {}).values())} erros, "
+                     f"cortesia {self.espera_cortesia.get(host, 0.0):.1f}s")
+        if self.extracao.total:
+            log.info(f"   extração: {self.extracao.total} páginas, {self.extracao.soma:.2f}s "
+                     f"(p50 {self.extracao.percentil(0.5) * 1000:.1f} ms); "
+                     f"classificação: {self.produtos_classificados} produtos em {self.classificacao_segundos:.2f}s")
+
+
+def _escapar(valor):
+    return valor.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
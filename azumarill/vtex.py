@@ -0,0 +1,180 @@
+"""
+Cliente da API pública de catálogo do VTEX, alternativa à raspagem das páginas HTML.
+
+As duas lojas rodam em VTEX, que expõe a busca do catálogo em JSON:
+    /api/catalog_system/pub/products/search/<categoria>?_from=0&_to=49
+    /api/catalog_system/pub/products/search?ft=<termo>&_from=0&_to=49
+Cada janela `_from`/`_to` traz até 50 produtos. A saída tem o mesmo formato
+(`nome_bruto`/`preco_bruto`) que os extratores de HTML, então segue direto para
+`processar_dados_para_planilha`.
+"""
+import asyncio
+import json
+import logging
+import time
+from urllib.parse import urlencode
+
+try:
+    import orjson
+    carregar_json = orjson.loads
+except ImportError:  # orjson é opcional: sem ele usa o json da biblioteca padrão
+    carregar_json = json.loads
+
+log = logging.getLogger(__name__)
+
+CAMINHO_BUSCA = '/api/catalog_system/pub/products/search'
+
+# A API aceita no máximo 50 itens por janela (_to - _from <= 49)
+ITENS_POR_JANELA = 50
+
+# Limite de segurança de janelas por categoria/busca (o total do cabeçalho dá o número real)
+MAX_JANELAS = 50
+
+# A API responde 206 (Partial Content) quando a janela não cobre todos os resultados
+STATUS_OK = (200, 206)
+
+
+def url_busca_api(url_loja, categoria=None, termo=None, inicio=0, fim=ITENS_POR_JANELA - 1):
+    """Monta a URL da API de busca para uma categoria e/ou termo, na janela [inicio, fim]"""
+    caminho = CAMINHO_BUSCA
+    if categoria:
+        caminho += '/' + categoria.strip('/')
+    parametros = []
+    if termo:
+        parametros.append(('ft', termo))
+    parametros += [('_from', inicio), ('_to', fim)]
+    return f"{url_loja.rstrip('/')}{caminho}?{urlencode(parametros)}"
+
+
+def total_de_resultados(headers):
+    """Lê o total de resultados do cabeçalho `resources: 0-49/1234`. Retorna int ou None."""
+    recursos = headers.get('resources') or headers.get('Resources')
+    if not recursos or '/' not in recursos:
+        return None
+    try:
+        return int(recursos.rsplit('/', 1)[1])
+    except ValueError:
+        return None
+
+
+def extrair_produtos_api(conteudo):
+    """
+    Decodifica uma resposta da API de busca.
+    O preço é o menor preço positivo entre os itens (SKUs) e vendedores do produto,
+    como o `lowPrice` do JSON-LD.
+    Retorna lista de {'nome_bruto', 'preco_bruto', 'id'} ('id' é o productId).
+    """
+    try:
+        dados = carregar_json(conteudo)
+    except ValueError:
+        return []
+    if not isinstance(dados, list):
+        return []
+    
+    produtos = []
+    for produto in dados:
+        nome = produto.get('productName')
+        if not nome:
+            continue
+        
+        precos = []
+        for item in produto.get('items') or []:
+            for vendedor in item.get('sellers') or []:
+                preco = (vendedor.get('commertialOffer') or {}).get('Price')
+                if preco:
+                    precos.append(preco)
+        
+        produtos.append({
+            'nome_bruto': nome,
+            'preco_bruto': min(precos) if precos else None,
+            'id': str(produto['productId']) if produto.get('productId') else None,
+        })
+    return produtos
+
+
+async def coletar_paginas_api(url_loja, motor, funcao_busca, categoria=None, termo=None,
+                              max_paginas=MAX_JANELAS, classificar=None, diario=None, saida=None, telemetria=None,
+                              primeira_pagina=None):
+    """
+    Coleta todas as janelas da API para uma categoria e/ou termo.
+    - funcao_busca: mesma função de busca dos scrapers (retorna (PaginaBruta, status))
+    - classificar: função opcional nome -> tipo, gravada em produto['tipo']
+    - diario: DiarioDeColeta opcional, usado como em coletar_todas_paginas
+    - saida: SaidaContinua opcional; os produtos vão direto para ela (ListaNaSaida)
+    - telemetria: Telemetria opcional, recebe o tempo de decodificação e de classificação
+    - primeira_pagina: (documento, produtos) da primeira janela, se já buscada
+    O total de resultados do cabeçalho `resources` da primeira janela dá o número de
+    janelas, e as restantes são buscadas todas de uma vez (`max_paginas` fica só como
+    limite de segurança). Sem o cabeçalho (ex.: resposta do cache), vai janela a janela
+    e para quando uma vem com menos de ITENS_POR_JANELA produtos.
+    Retorna lista de produtos.
+    """
+    # A URL da primeira janela identifica a coleta no diário
+    chave = url_busca_api(url_loja, categoria, termo)
+    todos_produtos = [] if saida is None else saida.lista()
+    pagina = 1
+    
+    if diario is not None:
+        for pagina_salva, _, produtos_salvos in diario.paginas_concluidas(chave):
+            todos_produtos.extend(produtos_salvos)
+            pagina = pagina_salva + 1
+        if diario.categoria_concluida(chave):
+            return todos_produtos
+    
+    def url_da_janela(numero):
+        inicio = (numero - 1) * ITENS_POR_JANELA
+        return url_busca_api(url_loja, categoria, termo, inicio, inicio + ITENS_POR_JANELA - 1)
+    
+    concluida = True
+    ultima_janela = None  # Vem do total de resultados da primeira janela
+    buscas_adiantadas = {}  # {janela: tarefa} das janelas buscadas de uma vez
+    while pagina <= max_paginas and (ultima_janela is None or pagina <= ultima_janela):
+        url = url_da_janela(pagina)
+        log.debug(f"📄 API janela {pagina}: {url}")
+        
+        produtos_pagina = None
+        tarefa = buscas_adiantadas.pop(pagina, None)
+        if pagina == 1 and primeira_pagina is not None:
+            (documento, produtos_pagina), status = primeira_pagina, 200
+        else:
+            documento, status = await (tarefa if tarefa is not None else motor.buscar(funcao_busca, url))
+        if documento is None or status not in STATUS_OK:
+            log.error(f"❌ Erro na API. Parando na janela {pagina}")
+            concluida = False
+            break
+        
+        inicio_extracao = time.perf_counter()
+        if produtos_pagina is None:
+            produtos_pagina = extrair_produtos_api(documento.conteudo)
+        inicio_classificacao = time.perf_counter()
+        for produto in produtos_pagina:
+            if classificar is not None:
+                produto['tipo'] = classificar(produto['nome_bruto'])
+            produto['url_origem'] = url
+        if telemetria is not None:
+            telemetria.registrar_extracao(inicio_classificacao - inicio_extracao, len(produtos_pagina))
+            telemetria.registrar_classificacao(time.perf_counter() - inicio_classificacao, len(produtos_pagina))
+        
+        todos_produtos.extend(produtos_pagina)
+        if diario is not None and produtos_pagina:
+            diario.registrar_pagina(chave, pagina, url, produtos_pagina)
+        
+        if len(produtos_pagina) < ITENS_POR_JANELA:
+            break
+        
+        if pagina == 1:
+            total = total_de_resultados(documento.cabecalhos)
+            if total is not None:
+                ultima_janela = -(-total // ITENS_POR_JANELA)
+                buscas_adiantadas = {numero: asyncio.ensure_future(motor.buscar(funcao_busca, url_da_janela(numero)))
+                                     for numero in range(2, min(ultima_janela, max_paginas) + 1)}
+        pagina += 1
+    
+    # Parou antes das janelas já buscadas (erro ou janela incompleta): descarta o resto
+    for tarefa in buscas_adiantadas.values():
+        tarefa.cancel()
+    
+    if diario is not None and concluida:
+        diario.concluir_categoria(chave)
+    
+    return todos_produtos
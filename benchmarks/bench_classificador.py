@@ -0,0 +1,92 @@
+"""
+Compara o classificador compilado (azumarill.classificador) com a implementação
+original lista a lista, em 100 mil nomes tirados das planilhas salvas.
+Também confere que as duas dão exatamente o mesmo resultado.
+
+Uso: python benchmarks/bench_classificador.py [--nomes N]
+"""
+import argparse
+import csv
+import sys
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from azumarill.classificador import (PALAVRAS_ORGANICO, PALAVRAS_POR_TIPO, TIPO_PADRAO,  # noqa: E402
+                                     classificar_tipo, classificar_tipos, determinar_organico,
+                                     determinar_organicos)
+
+
+def classificar_tipo_original(nome_produto):
+    """Implementação original: um `in` por palavra, lista a lista"""
+    if not nome_produto:
+        return TIPO_PADRAO
+    nome_lower = nome_produto.lower()
+    for tipo, palavras in PALAVRAS_POR_TIPO:
+        if any(palavra in nome_lower for palavra in list(palavras)):
+            return tipo
+    return TIPO_PADRAO
+
+
+def determinar_se_organico_original(nome_produto):
+    if not nome_produto:
+        return 'Não Orgânico'
+    nome_lower = nome_produto.lower()
+    if any(palavra in nome_lower for palavra in list(PALAVRAS_ORGANICO)):
+        return 'Orgânico'
+    return 'Não Orgânico'
+
+
+def carregar_nomes(quantidade):
+    """Nomes brutos (nome + quantidade) das planilhas, repetidos até `quantidade`"""
+    nomes = []
+    for caminho in sorted(RAIZ.glob('produtos_hortifruti_*.csv')):
+        with open(caminho, encoding='utf-8-sig', newline='') as arquivo:
+            for linha in csv.DictReader(arquivo):
+                nome = linha['Nome']
+                if linha['Quantidade'] != '-':
+                    nome = f"{nome} {linha['Quantidade']}{linha['Unidade']}"
+                nomes.append(nome)
+    return (nomes * (quantidade // len(nomes) + 1))[:quantidade]
+
+
+def cronometrar(funcao, *args):
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    return time.perf_counter() - inicio, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--nomes', type=int, default=100_000)
+    args = parser.parse_args()
+    
+    import pandas as pd
+    
+    nomes = carregar_nomes(args.nomes)
+    serie = pd.Series(nomes)
+    
+    casos = [
+        ('tipo', classificar_tipo_original, classificar_tipo, classificar_tipos),
+        ('orgânico', determinar_se_organico_original, determinar_organico, determinar_organicos),
+    ]
+    print(f"{len(nomes)} nomes\n")
+    print(f"{'função':<10} {'original (s)':>13} {'compilado (s)':>14} {'lote (s)':>9} {'ganho':>7} {'lote':>7}")
+    for nome_caso, original, compilado, lote in casos:
+        t_original, esperado = cronometrar(lambda: [original(n) for n in nomes])
+        t_compilado, obtido = cronometrar(lambda: [compilado(n) for n in nomes])
+        t_lote, obtido_lote = cronometrar(lote, serie)
+        
+        if obtido != esperado or obtido_lote.tolist() != esperado:
+            print(f"❌ {nome_caso}: resultado diferente da implementação original")
+            sys.exit(1)
+        print(f"{nome_caso:<10} {t_original:>13.3f} {t_compilado:>14.3f} {t_lote:>9.3f} "
+              f"{t_original / t_compilado:>6.1f}x {t_original / t_lote:>6.1f}x")
+    
+    print("\n✅ Resultados idênticos à implementação original")
+
+
+if __name__ == "__main__":
+    main()
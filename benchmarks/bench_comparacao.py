@@ -0,0 +1,82 @@
+"""
+Compara o casamento de produtos entre lojas pelo índice invertido (azumarill.comparacao)
+com a comparação de todos os pares, sobre as planilhas CSV gravadas pela coleta.
+
+Com --escala N cada catálogo é repetido N vezes (cada cópia com um token próprio, para
+que só case com a cópia correspondente da outra loja), simulando catálogos maiores: o
+índice cresce perto de linear, todos os pares cresce com N². A comparação de todos os
+pares só roda até --max-escala-todos e precisa chegar nos mesmos pares que o índice.
+
+Uso:
+    python benchmarks/bench_comparacao.py [--lojas zonasul prezunic] [--escala 1 2 4 8] [--max-escala-todos 1]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from azumarill.comparacao import ARQUIVO_CATALOGO, casar_catalogos, ler_catalogo  # noqa: E402
+
+
+def ampliar(df, escala):
+    """Catálogo repetido `escala` vezes, cada cópia com o sufixo 'Lote<i>' no nome"""
+    if escala == 1:
+        return df
+    copias = []
+    for indice in range(escala):
+        copia = df.copy()
+        copia['Nome'] = copia['Nome'] + f' Lote{indice}'
+        copias.append(copia)
+    return pd.concat(copias, ignore_index=True)
+
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lojas', nargs=2, default=['zonasul', 'prezunic'])
+    parser.add_argument('--escala', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--max-escala-todos', type=int, default=1,
+                        help='maior escala em que a comparação de todos os pares também roda (padrão: 1)')
+    args = parser.parse_args()
+
+    loja_a, loja_b = args.lojas
+    try:
+        catalogo_a = ler_catalogo(RAIZ / ARQUIVO_CATALOGO.format(loja=loja_a))
+        catalogo_b = ler_catalogo(RAIZ / ARQUIVO_CATALOGO.format(loja=loja_b))
+    except FileNotFoundError as erro:
+        print(f"❌ {erro.filename} não encontrado: rode a coleta das lojas antes")
+        sys.exit(1)
+
+    print(f"{loja_a} x {loja_b}\n")
+    print(f"{'escala':>6} {'produtos A':>11} {'produtos B':>11} {'pares':>7} {'índice (s)':>11} "
+          f"{'todos (s)':>10} {'ganho':>7}")
+    for escala in args.escala:
+        df_a = ampliar(catalogo_a, escala)
+        df_b = ampliar(catalogo_b, escala)
+        pares, segundos_indice = cronometrar(lambda: casar_catalogos(loja_a, df_a, loja_b, df_b))
+
+        segundos_todos = None
+        if escala <= args.max_escala_todos:
+            referencia, segundos_todos = cronometrar(
+                lambda: casar_catalogos(loja_a, df_a, loja_b, df_b, indexado=False))
+            if not pares.equals(referencia):
+                print(f"❌ escala {escala}: o índice casou pares diferentes da comparação de todos os pares")
+                sys.exit(1)
+
+        todos = f"{segundos_todos:>10.2f}" if segundos_todos is not None else f"{'-':>10}"
+        ganho = f"{segundos_todos / segundos_indice:>6.1f}x" if segundos_todos is not None else f"{'-':>7}"
+        print(f"{escala:>6} {len(df_a):>11} {len(df_b):>11} {len(pares):>7} {segundos_indice:>11.2f} {todos} {ganho}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Coleta pela fila de tarefas (azumarill.fila) com 1, 2, 4... processos trabalhadores
+contra lojas VTEX locais (azumarill.servidor_vtex, com latência).
+
+Para cada número de processos: semeia a fila num diretório temporário, sobe os
+trabalhadores (cada um com o seu motor e os limites da Loja; --taxa fica alta para não
+ser ela o gargalo), espera a fila esvaziar e junta os resultados. A planilha juntada
+precisa ser idêntica, byte a byte, à da coleta normal (azumarill.coleta.main num
+processo só, rodada antes como referência).
+
+Com --matar, um dos trabalhadores leva SIGKILL no meio da coleta (depois de --matar
+segundos): as tarefas que ele tinha reservado voltam para a fila quando o lease
+(--lease) vence e os outros terminam a coleta, com a mesma planilha.
+
+Uso:
+    python benchmarks/bench_fila.py [--processos 1 2 4] [--lojas zonasul prezunic] [--backend html|api]
+                                    [--latencia lognormal:0.05:0.5] [--concorrencia 4] [--taxa 1000]
+                                    [--matar 1.5] [--lease 3]
+"""
+import argparse
+import multiprocessing
+import os
+import signal
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from azumarill import servidor_vtex  # noqa: E402
+
+DIRETORIO_API = Path(__file__).resolve().parent / 'api'
+
+
+def configurar_lojas(lojas, concorrencia, taxa):
+    """Limites por host das lojas neste processo (a coleta de referência e cada trabalhador)"""
+    from azumarill.lojas import obter_loja
+    for nome in lojas:
+        loja = obter_loja(nome)
+        loja.max_por_host = concorrencia
+        loja.requisicoes_por_segundo = taxa
+
+
+def trabalhador(caminho_fila, lojas, concorrencia, taxa, lease):
+    """Alvo dos processos trabalhadores"""
+    from azumarill import fila
+    configurar_lojas(lojas, concorrencia, taxa)
+    fila.trabalhar(caminho_fila, concorrencia, lease, 'critical')
+
+
+def planilhas(diretorio):
+    """{nome do arquivo: conteúdo} das planilhas CSV do diretório"""
+    return {caminho.name: caminho.read_bytes() for caminho in sorted(Path(diretorio).glob('*.csv'))}
+
+
+def referencia(lojas, args):
+    """Planilhas da coleta normal, num processo só. Retorna (planilhas, segundos)"""
+    from azumarill import coleta
+    configurar_lojas(lojas, args.concorrencia, args.taxa)
+    diretorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as diretorio:
+        os.chdir(diretorio)
+        try:
+            inicio = time.perf_counter()
+            coleta.main(lojas)
+            return planilhas(diretorio), time.perf_counter() - inicio
+        finally:
+            os.chdir(diretorio_original)
+
+
+def rodada(lojas, processos, args, matar=None):
+    """
+    Coleta pela fila com `processos` trabalhadores; com `matar`, mata um deles com
+    SIGKILL depois de `matar` segundos. Retorna (planilhas, segundos, tarefas por estado,
+    tarefas reservadas mais de uma vez)
+    """
+    from azumarill import fila
+    contexto = multiprocessing.get_context('spawn')
+    diretorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as diretorio:
+        os.chdir(diretorio)  # fila, diários, memória de paginação e planilhas ficam no temporário
+        try:
+            caminho_fila = str(Path(diretorio) / 'fila.sqlite')
+            fila.semear(caminho_fila, lojas, novo=True, backend=args.backend)
+            inicio = time.perf_counter()
+            trabalhadores = [contexto.Process(target=trabalhador,
+                                              args=(caminho_fila, lojas, args.concorrencia, args.taxa, args.lease))
+                             for _ in range(processos)]
+            for processo in trabalhadores:
+                processo.start()
+            if matar is not None:
+                time.sleep(matar)
+                os.kill(trabalhadores[0].pid, signal.SIGKILL)
+            for processo in trabalhadores:
+                processo.join()
+            segundos = time.perf_counter() - inicio
+            fila.juntar(caminho_fila, lojas, args.backend)
+            with sqlite3.connect(caminho_fila) as conexao:
+                estados = dict(conexao.execute('SELECT estado, COUNT(*) FROM tarefas GROUP BY estado'))
+                retomadas = conexao.execute('SELECT COUNT(*) FROM tarefas WHERE tentativas > 1').fetchone()[0]
+            conexao.close()
+            return planilhas(diretorio), segundos, estados, retomadas
+        finally:
+            os.chdir(diretorio_original)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--processos', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--lojas', nargs='+', default=sorted(p.name for p in DIRETORIO_API.iterdir() if p.is_dir()))
+    parser.add_argument('--backend', choices=('html', 'api'), default='html')
+    parser.add_argument('--latencia', default='lognormal:0.05:0.5', help='latência do servidor local')
+    parser.add_argument('--concorrencia', type=int, default=4, help='requisições simultâneas por host e trabalhador')
+    parser.add_argument('--taxa', type=float, default=1000.0, help='requisições por segundo por host e trabalhador')
+    parser.add_argument('--matar', type=float, help='segundos até o SIGKILL num trabalhador (com 2 processos)')
+    parser.add_argument('--lease', type=float, default=3.0, help='lease das tarefas, em segundos (padrão: 3)')
+    args = parser.parse_args()
+
+    # Lidos na importação de azumarill.coleta, aqui e nos trabalhadores
+    os.environ['AZUMARILL_BACKEND'] = args.backend
+    os.environ['AZUMARILL_HISTORICO'] = ''
+    for variavel in ('AZUMARILL_SAIDA', 'AZUMARILL_CACHE', 'AZUMARILL_FILA'):
+        os.environ.pop(variavel, None)
+
+    servidores = []
+    for nome in args.lojas:
+        servidor = servidor_vtex.iniciar_em_thread(servidor_vtex.carregar_dados(DIRETORIO_API / nome),
+                                                   falhas=servidor_vtex.Falhas(args.latencia))
+        servidores.append(servidor)
+        os.environ[f'AZUMARILL_URL_LOJA_{nome.upper()}'] = servidor.url
+        os.environ[f'AZUMARILL_URL_API_{nome.upper()}'] = servidor.url
+
+    from azumarill import coleta
+    coleta.configurar_logs('critical')
+
+    try:
+        esperado, segundos_referencia = referencia(args.lojas, args)
+        print(f"Lojas: {', '.join(args.lojas)} | backend {args.backend} | latência {args.latencia} | "
+              f"{args.concorrencia} por host e trabalhador\n")
+        print(f"{'processos':>9} {'tempo (s)':>10} {'ganho':>7} {'tarefas':>16} {'retomadas':>10} {'planilhas':>10}")
+        print(f"{'coleta':>9} {segundos_referencia:>10.2f} {'1.0x':>7} {'-':>16} {'-':>10} {'referência':>10}")
+
+        rodadas = [(processos, None) for processos in args.processos]
+        if args.matar is not None:
+            rodadas.append((2, args.matar))
+        divergentes = 0
+        for processos, matar in rodadas:
+            obtido, segundos, estados, retomadas = rodada(args.lojas, processos, args, matar)
+            iguais = obtido == esperado
+            divergentes += not iguais
+            rotulo = f"{processos}{' (kill)' if matar is not None else ''}"
+            tarefas = ' '.join(f"{estado}={quantidade}" for estado, quantidade in sorted(estados.items()))
+            print(f"{rotulo:>9} {segundos:>10.2f} {segundos_referencia / segundos:>6.1f}x {tarefas:>16} {retomadas:>10} "
+                  f"{'iguais' if iguais else 'DIFERENTES':>10}")
+    finally:
+        for servidor in servidores:
+            servidor.shutdown()
+            servidor.server_close()
+
+    if divergentes:
+        print(f"\n❌ {divergentes} rodadas com planilhas diferentes da coleta normal")
+        sys.exit(1)
+    print("\n✅ Planilhas da fila idênticas às da coleta normal")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Histórico de preços (azumarill.historico) com anos de coletas simuladas.
+
+Parte das planilhas CSV das lojas e simula uma coleta por dia e por loja: a cada dia
+uma fração dos produtos muda de preço (--mudancas) e outra sai ou volta ao catálogo
+(--rotatividade). Cada coleta passa por `HistoricoDePrecos.registrar`, como no fim da
+coleta real. Relata o tempo de ingestão, o tamanho do banco contra o de guardar uma
+foto completa por dia, e a latência das consultas:
+- preço de um produto nos últimos 90 dias (nome exato e por prefixo)
+- produtos com preço alterado no último dia (todas as lojas e uma loja)
+
+Uso:
+    python benchmarks/bench_historico.py [--dias 365] [--mudancas 0.01] [--rotatividade 0.002] [--repeticoes 50]
+"""
+import argparse
+import datetime
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from azumarill.comparacao import ARQUIVO_CATALOGO, ler_catalogo  # noqa: E402
+from azumarill.historico import HistoricoDePrecos  # noqa: E402
+
+LOJAS = ('zonasul', 'prezunic')
+
+
+def simular_dia(df, precos, ativos, aleatorio, mudancas, rotatividade):
+    """
+    Muda o preço de uma fração dos produtos (em precos) e tira/devolve outra do catálogo
+    (em ativos). Retorna a planilha do dia
+    """
+    for posicao in aleatorio.sample(range(len(df)), int(len(df) * mudancas)):
+        preco = float(precos[posicao]) if precos[posicao] != '-' else 10.0
+        precos[posicao] = f"{max(0.5, preco * aleatorio.uniform(0.85, 1.15)):.2f}"
+    for posicao in aleatorio.sample(range(len(df)), int(len(df) * rotatividade)):
+        ativos[posicao] = not ativos[posicao]
+    return df.assign(**{'Preço': precos})[ativos]
+
+
+def medir_consulta(funcao, repeticoes):
+    """Mediana (ms) de `repeticoes` chamadas e o resultado da última"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos), resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dias', type=int, default=365)
+    parser.add_argument('--mudancas', type=float, default=0.01, help='fração de produtos com preço novo por dia')
+    parser.add_argument('--rotatividade', type=float, default=0.002,
+                        help='fração de produtos que sai ou volta ao catálogo por dia')
+    parser.add_argument('--repeticoes', type=int, default=50)
+    parser.add_argument('--semente', type=int, default=42)
+    args = parser.parse_args()
+
+    planilhas = {}
+    for loja in LOJAS:
+        try:
+            planilhas[loja] = ler_catalogo(RAIZ / ARQUIVO_CATALOGO.format(loja=loja))
+        except FileNotFoundError as erro:
+            print(f"❌ {erro.filename} não encontrado: rode a coleta das lojas antes")
+            sys.exit(1)
+    precos = {loja: list(df['Preço']) for loja, df in planilhas.items()}
+    ativos = {loja: [True] * len(df) for loja, df in planilhas.items()}
+    aleatorio = random.Random(args.semente)
+    inicio_historico = datetime.date(2020, 1, 1)
+    ultimo_dia = inicio_historico + datetime.timedelta(days=args.dias - 1)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = Path(diretorio) / 'historico.sqlite'
+        historico = HistoricoDePrecos(caminho)
+
+        print(f"Simulando {args.dias} dias x {len(LOJAS)} lojas ({sum(map(len, planilhas.values()))} produtos)...")
+        tempos_ingestao = []
+        linhas_fotos = 0
+        for dia in range(args.dias):
+            data = inicio_historico + datetime.timedelta(days=dia)
+            for loja, df in planilhas.items():
+                planilha = df if dia == 0 else simular_dia(df, precos[loja], ativos[loja], aleatorio, args.mudancas,
+                                                           args.rotatividade)
+                linhas_fotos += len(planilha)
+                inicio = time.perf_counter()
+                historico.registrar(planilha, loja, data)
+                tempos_ingestao.append((time.perf_counter() - inicio) * 1000)
+
+        estatisticas = historico.estatisticas()
+        tamanho = caminho.stat().st_size + sum(p.stat().st_size for p in caminho.parent.glob('*-wal'))
+        print(f"\nIngestão: mediana {statistics.median(tempos_ingestao):.1f} ms por coleta, "
+              f"máximo {max(tempos_ingestao):.1f} ms")
+        print(f"Faixas de preço: {estatisticas['faixas']} (fotos diárias completas teriam {linhas_fotos} linhas, "
+              f"{linhas_fotos / estatisticas['faixas']:.0f}x mais); banco com {tamanho / 1024 / 1024:.1f} MB\n")
+
+        nome = planilha['Nome'].iat[len(planilha) // 2]  # da última coleta simulada, ainda no catálogo
+        consultas = {
+            'produto pelo nome, últimos 90 dias': lambda: historico.historico_do_produto(nome, dias=90, data=ultimo_dia),
+            f'prefixo "{nome[:5]}", últimos 90 dias': lambda: historico.historico_do_produto(
+                nome[:5], dias=90, data=ultimo_dia, prefixo=True),
+            'alterados no último dia': lambda: historico.alteracoes(ultimo_dia),
+            'alterados no último dia (zonasul)': lambda: historico.alteracoes(ultimo_dia, 'zonasul'),
+        }
+        print(f"Produto: {nome}\n")
+        print(f"{'consulta':<40} {'linhas':>7} {'mediana (ms)':>13}")
+        for descricao, consulta in consultas.items():
+            mediana, resultado = medir_consulta(consulta, args.repeticoes)
+            print(f"{descricao:<40} {len(resultado):>7} {mediana:>13.2f}")
+        historico.fechar()
+
+
+if __name__ == "__main__":
+    main()
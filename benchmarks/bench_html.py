@@ -0,0 +1,102 @@
+"""
+Compara o extrator de HTML atual (árvore BeautifulSoup + find_all com funções Python)
+com o extrator por seletores XPath pré-compilados sobre a árvore lxml, nos parsers
+disponíveis. Os tempos incluem a montagem da árvore, como acontece a cada página baixada.
+Todos os caminhos precisam extrair exatamente os mesmos produtos.
+
+Uso:
+    python benchmarks/bench_html.py [--repeticoes N] [--todas]   # --todas inclui as páginas com JSON-LD
+"""
+import argparse
+import gzip
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from azumarill.extracao import extrair_produtos_html, extrair_produtos_seletores  # noqa: E402
+from azumarill.pagina import PaginaBruta, html5_parser  # noqa: E402
+
+DIRETORIO_PAGINAS = Path(__file__).resolve().parent / 'paginas'
+
+
+def carregar_paginas(todas=False):
+    """Retorna {nome: bytes} das páginas só com cards (ou de todas, com `todas`)"""
+    return {caminho.name.removesuffix('.html.gz'): gzip.decompress(caminho.read_bytes())
+            for caminho in sorted(DIRETORIO_PAGINAS.glob('*.html.gz'))
+            if todas or caminho.name.endswith('_html.html.gz')}
+
+
+def caminho_atual(conteudo):
+    """Caminho antigo: html.parser do BeautifulSoup + extrair_produtos_html"""
+    return extrair_produtos_html(BeautifulSoup(conteudo, 'html.parser'))
+
+
+def caminho_bs4_lxml(conteudo):
+    """Mesmo extrator antigo, só trocando o parser do BeautifulSoup pelo lxml"""
+    return extrair_produtos_html(BeautifulSoup(conteudo, 'lxml'))
+
+
+def caminho_seletores(conteudo):
+    """Caminho novo: árvore lxml + seletores XPath pré-compilados"""
+    return extrair_produtos_seletores(PaginaBruta(conteudo, 'lxml'))
+
+
+def caminho_seletores_html5(conteudo):
+    """Caminho novo com a árvore montada pelo html5-parser"""
+    return extrair_produtos_seletores(PaginaBruta(conteudo, 'html5'))
+
+
+def medir(funcao, conteudo, repeticoes):
+    """Retorna o melhor tempo (segundos) entre as repetições"""
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(conteudo)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeticoes', type=int, default=10)
+    parser.add_argument('--todas', action='store_true', help='inclui as páginas com JSON-LD')
+    args = parser.parse_args()
+
+    paginas = carregar_paginas(args.todas)
+    if not paginas:
+        print(f"❌ Nenhuma página em {DIRETORIO_PAGINAS}. Rode benchmarks/gerar_paginas.py.")
+        sys.exit(1)
+
+    caminhos = {'atual': caminho_atual, 'bs4+lxml': caminho_bs4_lxml, 'seletores': caminho_seletores}
+    if html5_parser is not None:
+        caminhos['seletores html5'] = caminho_seletores_html5
+    else:
+        print("💡 html5-parser não instalado: sem a coluna 'seletores html5' (pip install html5-parser)\n")
+
+    print(f"{'página':<26} {'produtos':>9} " + ' '.join(f"{nome + ' (ms)':>21}" for nome in caminhos)
+          + f" {'ganho':>7}")
+    totais = dict.fromkeys(caminhos, 0.0)
+    for nome, conteudo in paginas.items():
+        referencia = caminho_atual(conteudo)
+        for nome_caminho, funcao in caminhos.items():
+            if funcao(conteudo) != referencia:
+                print(f"❌ {nome}: '{nome_caminho}' extraiu produtos diferentes do extrator atual")
+                sys.exit(1)
+
+        tempos = {nome_caminho: medir(funcao, conteudo, args.repeticoes) for nome_caminho, funcao in caminhos.items()}
+        for nome_caminho, segundos in tempos.items():
+            totais[nome_caminho] += segundos
+        print(f"{nome:<26} {len(referencia):>9} " + ' '.join(f"{t * 1000:>21.2f}" for t in tempos.values())
+              + f" {tempos['atual'] / tempos['seletores']:>6.1f}x")
+
+    print(f"{'total':<26} {'':>9} " + ' '.join(f"{t * 1000:>21.2f}" for t in totais.values())
+          + f" {totais['atual'] / totais['seletores']:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Compara a extração por JSON-LD atual (árvore BeautifulSoup + find_all) com o
+caminho rápido (blocos JSON-LD lidos direto dos bytes da resposta).
+
+Uso:
+    python benchmarks/bench_jsonld.py [--repeticoes N]
+    python benchmarks/bench_jsonld.py --gravar URL NOME   # grava uma página real
+"""
+import argparse
+import gzip
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from azumarill.pagina import PaginaBruta  # noqa: E402
+from azumarill.extracao import extrair_produtos_jsonld  # noqa: E402
+from azumarill.lojas import HEADERS_PADRAO as HEADERS  # noqa: E402
+
+DIRETORIO_PAGINAS = Path(__file__).resolve().parent / 'paginas'
+
+
+def carregar_paginas():
+    """Retorna {nome: bytes} das páginas com JSON-LD gravadas em benchmarks/paginas"""
+    return {caminho.name.removesuffix('.html.gz'): gzip.decompress(caminho.read_bytes())
+            for caminho in sorted(DIRETORIO_PAGINAS.glob('*.html.gz'))
+            if not caminho.name.endswith('_html.html.gz')}  # as *_html não têm JSON-LD
+
+
+def caminho_atual(conteudo):
+    """Caminho antigo: monta a árvore inteira e procura os scripts nela"""
+    return extrair_produtos_jsonld(BeautifulSoup(conteudo, 'html.parser'))
+
+
+def caminho_rapido(conteudo):
+    """Caminho novo: varre os bytes atrás dos blocos JSON-LD"""
+    return extrair_produtos_jsonld(PaginaBruta(conteudo))
+
+
+def medir(funcao, conteudo, repeticoes):
+    """Retorna o melhor tempo (segundos) entre as repetições"""
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(conteudo)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def gravar(url, nome):
+    """Baixa uma página real e grava como fixture comprimida"""
+    import requests
+    resposta = requests.get(url, headers=HEADERS, timeout=10)
+    resposta.raise_for_status()
+    DIRETORIO_PAGINAS.mkdir(parents=True, exist_ok=True)
+    caminho = DIRETORIO_PAGINAS / f'{nome}.html.gz'
+    caminho.write_bytes(gzip.compress(resposta.content, mtime=0))
+    print(f"✅ Página gravada: {caminho}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeticoes', type=int, default=20)
+    parser.add_argument('--gravar', nargs=2, metavar=('URL', 'NOME'))
+    args = parser.parse_args()
+    
+    if args.gravar:
+        gravar(*args.gravar)
+        return
+    
+    paginas = carregar_paginas()
+    if not paginas:
+        print(f"❌ Nenhuma página em {DIRETORIO_PAGINAS}. Rode benchmarks/gerar_paginas.py ou use --gravar.")
+        sys.exit(1)
+    
+    print(f"{'página':<22} {'KB':>6} {'produtos':>9} {'atual (ms)':>11} {'rápido (ms)':>12} {'ganho':>7}")
+    total_atual = total_rapido = 0.0
+    for nome, conteudo in paginas.items():
+        produtos_atual = caminho_atual(conteudo)
+        produtos_rapido = caminho_rapido(conteudo)
+        if produtos_atual != produtos_rapido:
+            print(f"❌ {nome}: os dois caminhos extraíram produtos diferentes")
+            sys.exit(1)
+        
+        t_atual = medir(caminho_atual, conteudo, args.repeticoes)
+        t_rapido = medir(caminho_rapido, conteudo, args.repeticoes)
+        total_atual += t_atual
+        total_rapido += t_rapido
+        print(f"{nome:<22} {len(conteudo) / 1024:>6.0f} {len(produtos_rapido):>9} "
+              f"{t_atual * 1000:>11.2f} {t_rapido * 1000:>12.2f} {t_atual / t_rapido:>6.1f}x")
+    
+    print(f"{'total':<22} {'':>6} {'':>9} {total_atual * 1000:>11.2f} {total_rapido * 1000:>12.2f} "
+          f"{total_atual / total_rapido:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Teste de carga da coleta completa contra lojas VTEX locais (azumarill.servidor_vtex).
+
+Para cada nível de concorrência sobe um servidor local por loja, com os dados de
+benchmarks/api/<loja> e as falhas pedidas (latência, 429, 5xx, páginas repetidas),
+aponta as lojas para ele (AZUMARILL_URL_LOJA_<LOJA> / AZUMARILL_URL_API_<LOJA>) e roda
+o `main()` de azumarill.coleta inteiro, num diretório temporário. A concorrência é o
+limite de requisições simultâneas por host; a taxa por segundo fica alta (--taxa) para
+não ser ela o gargalo.
+
+Com --controle fixo adaptativo cada nível roda com a taxa fixa e com o controle
+adaptativo do motor (AZUMARILL_CONTROLE). Para comparar os dois, dê ao servidor um
+limite de req/s (--limite-taxa) e comece de uma taxa baixa (--taxa): a fixa fica presa
+nela, a adaptativa sobe até o limite e recua nos 429.
+
+Relata produtos por segundo e a latência das páginas (p50/p99) vista pelo scraper,
+incluindo as retentativas feitas pela sessão.
+
+Uso:
+    python benchmarks/carga.py [--concorrencia 1 2 4 8] [--lojas zonasul prezunic] [--backend html|api]
+                               [--latencia lognormal:0.05:0.5] [--taxa-429 0.02] [--taxa-5xx 0.01]
+                               [--taxa-repeticao 0.0] [--limite-taxa 10] [--taxa 1000]
+                               [--controle fixo adaptativo] [--resultado carga.json]
+"""
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from azumarill import servidor_vtex  # noqa: E402
+
+DIRETORIO_API = Path(__file__).resolve().parent / 'api'
+
+
+def percentil(valores, p):
+    """Percentil `p` (0-100) dos valores; None sem valores"""
+    if not valores:
+        return None
+    if len(valores) == 1:
+        return valores[0]
+    return statistics.quantiles(valores, n=100, method='inclusive')[p - 1]
+
+
+@contextlib.contextmanager
+def cronometrar_paginas(coleta):
+    """Mede cada chamada de ColetaDaLoja.buscar_pagina. Retorna (latências, erros) preenchidos na saída"""
+    latencias = []
+    erros = []
+    original = coleta.ColetaDaLoja.buscar_pagina
+
+    def buscar_pagina(self, url, mostrar_log=False):
+        inicio = time.perf_counter()
+        documento, status = original(self, url, mostrar_log)
+        latencias.append(time.perf_counter() - inicio)
+        if documento is None:
+            erros.append(url)
+        return documento, status
+
+    coleta.ColetaDaLoja.buscar_pagina = buscar_pagina
+    try:
+        yield latencias, erros
+    finally:
+        coleta.ColetaDaLoja.buscar_pagina = original
+
+
+def rodada(coleta, lojas, concorrencia, controle, args):
+    """
+    Roda a coleta completa com `concorrencia` requisições simultâneas por loja e o
+    `controle` de taxa ('fixo' ou 'adaptativo'). Retorna dict de métricas
+    """
+    servidores = {}
+    for indice, nome in enumerate(lojas):
+        semente = None if args.semente is None else args.semente + indice
+        falhas = servidor_vtex.Falhas(args.latencia, args.taxa_429, args.taxa_5xx, args.taxa_repeticao,
+                                      args.retry_after, semente, args.limite_taxa)
+        servidores[nome] = servidor_vtex.iniciar_em_thread(
+            servidor_vtex.carregar_dados(DIRETORIO_API / nome), falhas=falhas, com_jsonld=not args.sem_jsonld)
+        os.environ[f'AZUMARILL_URL_LOJA_{nome.upper()}'] = servidores[nome].url
+        os.environ[f'AZUMARILL_URL_API_{nome.upper()}'] = servidores[nome].url
+        loja = coleta.obter_loja(nome)
+        loja.max_por_host = concorrencia
+        loja.requisicoes_por_segundo = args.taxa
+    coleta.CONTROLE_TAXA = controle
+
+    diretorio_original = os.getcwd()
+    try:
+        with tempfile.TemporaryDirectory() as diretorio, cronometrar_paginas(coleta) as (latencias, erros):
+            os.chdir(diretorio)  # planilhas, diários e memória de paginação ficam no temporário
+            inicio = time.perf_counter()
+            produtos_por_loja = coleta.main(lojas)
+            duracao = time.perf_counter() - inicio
+    finally:
+        os.chdir(diretorio_original)
+        for servidor in servidores.values():
+            servidor.shutdown()
+            servidor.server_close()
+
+    status = {}
+    for servidor in servidores.values():
+        for codigo, quantidade in servidor.estatisticas['status'].items():
+            status[codigo] = status.get(codigo, 0) + quantidade
+    produtos = sum(len(p) for p in produtos_por_loja.values())
+    return {
+        'concorrencia': concorrencia,
+        'controle': controle,
+        'paginas': len(latencias),
+        'produtos': produtos,
+        'segundos': round(duracao, 3),
+        'produtos_por_segundo': round(produtos / duracao, 1) if duracao else None,
+        'p50_ms': round(percentil(latencias, 50) * 1000, 1) if latencias else None,
+        'p99_ms': round(percentil(latencias, 99) * 1000, 1) if latencias else None,
+        'respostas_429': status.get(429, 0),
+        'respostas_5xx': sum(q for codigo, q in status.items() if codigo >= 500),
+        'paginas_repetidas': sum(s.estatisticas['repetidas'] for s in servidores.values()),
+        'paginas_com_erro': len(erros),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concorrencia', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--lojas', nargs='+', default=sorted(p.name for p in DIRETORIO_API.iterdir() if p.is_dir()))
+    parser.add_argument('--backend', choices=('html', 'api'), default='html')
+    parser.add_argument('--taxa', type=float, default=1000.0,
+                        help='requisições por segundo por loja, a inicial no controle adaptativo (padrão: 1000)')
+    parser.add_argument('--controle', nargs='+', choices=('fixo', 'adaptativo'), default=['adaptativo'],
+                        help='controle de taxa do motor; com os dois, cada nível roda duas vezes')
+    parser.add_argument('--sem-jsonld', action='store_true', help='vitrine só com os cards HTML')
+    parser.add_argument('--resultado', help='grava as métricas das rodadas neste arquivo JSON')
+    parser.add_argument('--verboso', action='store_true', help='mostra os logs da coleta')
+    servidor_vtex.adicionar_argumentos_falhas(parser)
+    parser.set_defaults(latencia='lognormal:0.05:0.5')
+    args = parser.parse_args()
+
+    # Lidos na importação de azumarill.coleta
+    os.environ['AZUMARILL_BACKEND'] = args.backend
+    for variavel in ('AZUMARILL_SAIDA', 'AZUMARILL_CACHE'):
+        os.environ.pop(variavel, None)
+    from azumarill import coleta
+    coleta.configurar_logs('info' if args.verboso else 'critical')
+
+    print(f"Lojas: {', '.join(args.lojas)} | backend {args.backend} | latência {args.latencia} | "
+          f"429 {args.taxa_429:.0%} | 5xx {args.taxa_5xx:.0%} | repetição {args.taxa_repeticao:.0%} | "
+          f"limite {args.limite_taxa or '-'} req/s | taxa {args.taxa:g} req/s\n")
+    print(f"{'concorr.':>8} {'controle':>10} {'páginas':>8} {'produtos':>9} {'tempo (s)':>10} {'prod/s':>8} "
+          f"{'p50 (ms)':>9} {'p99 (ms)':>9} {'429':>5} {'5xx':>5} {'repet.':>7} {'erros':>6}")
+
+    resultados = []
+    for concorrencia in args.concorrencia:
+        for controle in args.controle:
+            r = rodada(coleta, args.lojas, concorrencia, controle, args)
+            resultados.append(r)
+            print(f"{r['concorrencia']:>8} {r['controle']:>10} {r['paginas']:>8} {r['produtos']:>9} "
+                  f"{r['segundos']:>10.2f} {r['produtos_por_segundo']:>8} {r['p50_ms']:>9} {r['p99_ms']:>9} {r['respostas_429']:>5} "
+                  f"{r['respostas_5xx']:>5} {r['paginas_repetidas']:>7} {r['paginas_com_erro']:>6}")
+
+    if args.resultado:
+        Path(args.resultado).write_text(json.dumps(resultados, indent=2) + '\n', encoding='utf-8')
+        print(f"\n💾 Métricas gravadas em {args.resultado}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Gera páginas de vitrine no formato do VTEX Store Framework para os benchmarks.
+
+As páginas reproduzem a estrutura que os scrapers leem (JSON-LD ItemList, cards
+vtex-product-summary, estado __STATE__ embutido) com produtos tirados das planilhas
+já coletadas. Também gera, por categoria, respostas no formato da API de busca do
+catálogo VTEX (benchmarks/api/<loja>/), servidas por `python -m azumarill.servidor_vtex`.
+Cada página de listagem sai em duas variantes: com JSON-LD e só com os cards HTML
+(`<nome>_html`). Para gravar páginas reais em vez de geradas, use
+`python benchmarks/bench_jsonld.py --gravar URL NOME`.
+
+Uso: python benchmarks/gerar_paginas.py
+"""
+import csv
+import gzip
+import html
+import json
+import random
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+DIRETORIO_PAGINAS = Path(__file__).resolve().parent / 'paginas'
+DIRETORIO_API = Path(__file__).resolve().parent / 'api'
+
+LOJAS = {
+    'zonasul': ('https://www.zonasul.com.br', 'Zona Sul', RAIZ / 'produtos_hortifruti_zonasul.csv'),
+    'prezunic': ('https://www.prezunic.com.br', 'Prezunic', RAIZ / 'produtos_hortifruti_prezunic.csv'),
+}
+
+PRODUTOS_POR_PAGINA = 48
+
+# Categoria da loja em que cada tipo de produto é publicado na API gerada
+CATEGORIAS_API = {
+    'zonasul': {'hortifruti': 'hortifruti', 'carnes': 'carnes', 'frios e laticinios': 'laticinios',
+                'mercearia': 'mercearia', 'processados': 'padaria'},
+    'prezunic': {'hortifruti': 'hortifruti', 'carnes': 'carnes-e-aves', 'frios e laticinios': 'frios-e-laticinios',
+                 'mercearia': 'mercearia', 'processados': 'mercearia'},
+}
+
+
+def ler_produtos(caminho_csv, com_tipo=False):
+    """
+    Lê a planilha e remonta o nome bruto (nome + quantidade) e o preço de cada produto.
+    Retorna lista de (nome, preco), ou (nome, preco, tipo) com com_tipo=True.
+    """
+    produtos = []
+    with open(caminho_csv, encoding='utf-8-sig', newline='') as arquivo:
+        for linha in csv.DictReader(arquivo):
+            nome = linha['Nome']
+            if linha['Quantidade'] != '-':
+                nome = f"{nome} {linha['Quantidade']}{linha['Unidade']}"
+            preco = None if linha['Preço'] == '-' else float(linha['Preço'])
+            produtos.append((nome, preco, linha['Tipo']) if com_tipo else (nome, preco))
+    return produtos
+
+
+def _slug(nome):
+    return ''.join(c if c.isalnum() else '-' for c in nome.lower()).strip('-')
+
+
+def _jsonld_itemlist(url_loja, nome_loja, produtos):
+    itens = []
+    for posicao, (nome, preco, sku) in enumerate(produtos, start=1):
+        oferta = {
+            '@type': 'Offer', 'price': preco, 'priceCurrency': 'BRL',
+            'availability': 'http://schema.org/InStock', 'sku': sku,
+            'itemCondition': 'http://schema.org/NewCondition',
+            'priceValidUntil': '2026-12-31', 'seller': {'@type': 'Organization', 'name': nome_loja},
+        }
+        itens.append({
+            '@type': 'ListItem',
+            'position': posicao,
+            'item': {
+                '@type': 'Product',
+                '@id': f'{url_loja}/{_slug(nome)}/p',
+                'name': nome,
+                'brand': {'@type': 'Brand', 'name': nome_loja},
+                'image': f'https://{nome_loja.lower().replace(" ", "")}.vteximg.com.br/arquivos/ids/{sku}-500-500/{_slug(nome)}.jpg',
+                'description': '',
+                'mpn': sku,
+                'sku': sku,
+                'offers': {
+                    '@type': 'AggregateOffer', 'lowPrice': preco, 'highPrice': preco,
+                    'priceCurrency': 'BRL', 'offers': [oferta], 'offerCount': 1,
+                },
+            },
+        })
+    return {'@context': 'https://schema.org', '@type': 'ItemList', 'itemListElement': itens}
+
+
+def _card_html(url_loja, nome, preco, sku):
+    nome_html = html.escape(nome)
+    preco_txt = '' if preco is None else f'R$ {preco:.2f}'.replace('.', ',')
+    return (
+        f'<section class="vtex-product-summary-2-x-container vtex-product-summary-2-x-containerNormal '
+        f'overflow-hidden br3 h-100 w-100 flex flex-column justify-between center tc">'
+        f'<a class="vtex-product-summary-2-x-clearLink h-100 flex flex-column" href="/{_slug(nome)}/p">'
+        f'<article class="vtex-product-summary-2-x-element pointer pt3 pb4 flex flex-column h-100">'
+        f'<div class="vtex-product-summary-2-x-imageWrapper"><div class="dib relative vtex-product-summary-2-x-imageContainer">'
+        f'<img src="{url_loja}/arquivos/ids/{sku}-200-200" width="200" height="200" alt="{nome_html}" '
+        f'class="vtex-product-summary-2-x-imageNormal vtex-product-summary-2-x-image" crossorigin="anonymous"></div></div>'
+        f'<div class="vtex-product-summary-2-x-nameContainer flex items-start justify-center pv6">'
+        f'<h3 class="vtex-product-summary-2-x-productNameContainer mv0 vtex-product-summary-2-x-nameWrapper overflow-hidden c-on-base f5">'
+        f'<span class="vtex-product-summary-2-x-productBrand vtex-product-summary-2-x-brandName t-body">{nome_html}</span></h3></div>'
+        f'<div class="vtex-flex-layout-0-x-flexRow"><div class="vtex-product-price-1-x-sellingPrice vtex-product-price-1-x-sellingPrice--summary">'
+        f'<span class="vtex-product-price-1-x-sellingPriceValue">{preco_txt}</span></div></div>'
+        f'<div class="vtex-add-to-cart-button-0-x-buttonDataContainer flex justify-center items-center h-100 pv2">'
+        f'<button class="vtex-button bw1 ba fw5 v-mid relative pa0 lh-solid br2 min-h-small t-action--small">'
+        f'<div class="vtex-button__label flex items-center justify-center h-100 ph5">Adicionar</div></button></div>'
+        f'</article></a></section>'
+    )
+
+
+def gerar_pagina(loja, produtos, com_jsonld=True, semente=0):
+    """
+    Monta o HTML de uma página de listagem da loja com os (nome, preço) informados.
+    Com com_jsonld=False a página só tem os cards HTML (cenário do fallback do Prezunic).
+    Retorna o HTML em bytes.
+    """
+    url_loja, nome_loja, _ = LOJAS[loja]
+    aleatorio = random.Random(semente)
+    produtos_sku = [(nome, preco, str(aleatorio.randint(10000, 999999))) for nome, preco in produtos]
+    
+    # Estado de runtime embutido pelo VTEX: grande, mas irrelevante para a extração
+    estado = {
+        f'Product:sp-{sku}': {
+            'cacheId': f'sp-{sku}', 'productId': sku, 'productName': nome,
+            'linkText': _slug(nome), 'categories': ['/Alimentos/', '/Alimentos/Hortifruti/'],
+            'priceRange': {'sellingPrice': {'highPrice': preco, 'lowPrice': preco}},
+            'items': [{'itemId': sku, 'name': nome, 'images': [{'imageUrl': f'{url_loja}/arquivos/ids/{sku}'}] * 3}],
+            'properties': [{'name': 'sellerId', 'values': ['1']}] * 4,
+        }
+        for nome, preco, sku in produtos_sku
+    }
+    runtime = {'account': nome_loja.lower().replace(' ', ''), 'workspace': 'master',
+               'route': {'id': 'store.search#category'},
+               'settings': {f'vtex.store@2.x:{i}': {'setting': 'x' * 40} for i in range(120)}}
+    
+    partes = [
+        '<!DOCTYPE html><html lang="pt-BR"><head><meta charset="utf-8">',
+        f'<title>{nome_loja}</title>',
+        ''.join(f'<link rel="preload" href="{url_loja}/_v/public/assets/v1/bundle/css/{i}.css" as="style">' for i in range(25)),
+        '<style>' + ''.join(f'.vtex-{i}{{display:flex;margin:{i % 7}px}}' for i in range(1500)) + '</style>',
+        f'<script>window.__RUNTIME__ = {json.dumps(runtime)};</script>',
+        '<script type="application/ld+json">' + json.dumps({
+            '@context': 'https://schema.org', '@type': 'BreadcrumbList',
+            'itemListElement': [{'@type': 'ListItem', 'name': 'Hortifruti', 'item': f'{url_loja}/hortifruti', 'position': 1}],
+        }) + '</script>',
+    ]
+    if com_jsonld:
+        partes.append('<script type="application/ld+json">'
+                      + json.dumps(_jsonld_itemlist(url_loja, nome_loja, produtos_sku), ensure_ascii=False)
+                      + '</script>')
+    partes.append('</head><body><div class="render-container render-route-store-search-category">')
+    partes.append('<div class="vtex-search-result-3-x-gallery flex flex-row flex-wrap items-stretch bn ph1 na4 pl9-l">')
+    for nome, preco, sku in produtos_sku:
+        partes.append(f'<div class="vtex-search-result-3-x-galleryItem vtex-search-result-3-x-galleryItem--normal pa4">'
+                      f'{_card_html(url_loja, nome, preco, sku)}</div>')
+    partes.append('</div></div>')
+    partes.append('<template data-type="json" data-varname="__STATE__"><script>'
+                  + json.dumps(estado, ensure_ascii=False) + '</script></template>')
+    partes.append('</body></html>')
+    return ''.join(partes).encode('utf-8')
+
+
+def gerar_produto_api(loja, nome, preco, sku):
+    """Monta um produto no formato da API de busca do catálogo VTEX (campos principais)"""
+    url_loja, nome_loja, _ = LOJAS[loja]
+    oferta = {'Price': preco or 0, 'ListPrice': preco or 0, 'PriceWithoutDiscount': preco or 0,
+              'AvailableQuantity': 99999 if preco else 0, 'IsAvailable': bool(preco)}
+    return {
+        'productId': sku, 'productName': nome, 'brand': nome_loja, 'linkText': _slug(nome),
+        'productReference': sku, 'categoryId': '1', 'link': f'{url_loja}/{_slug(nome)}/p',
+        'categories': ['/Alimentos/'],
+        'items': [{
+            'itemId': sku, 'name': nome, 'nameComplete': nome, 'measurementUnit': 'un', 'unitMultiplier': 1.0,
+            'images': [{'imageId': sku, 'imageUrl': f'{url_loja}/arquivos/ids/{sku}/{_slug(nome)}.jpg'}],
+            'sellers': [{'sellerId': '1', 'sellerName': nome_loja, 'sellerDefault': True,
+                         'commertialOffer': oferta}],
+        }],
+    }
+
+
+def salvar_pagina(nome_arquivo, conteudo):
+    """Grava a página comprimida em benchmarks/paginas/<nome>.html.gz"""
+    DIRETORIO_PAGINAS.mkdir(parents=True, exist_ok=True)
+    caminho = DIRETORIO_PAGINAS / f'{nome_arquivo}.html.gz'
+    # mtime fixo para que regenerar as páginas não altere os arquivos versionados
+    caminho.write_bytes(gzip.compress(conteudo, mtime=0))
+    return caminho
+
+
+def salvar_api(loja, produtos_com_tipo):
+    """Agrupa os produtos por categoria e grava benchmarks/api/<loja>/<categoria>.json.gz"""
+    aleatorio = random.Random(f'api-{loja}')
+    categorias = {}
+    for nome, preco, tipo in produtos_com_tipo:
+        sku = str(aleatorio.randint(10000, 999999))
+        categorias.setdefault(CATEGORIAS_API[loja][tipo], []).append(gerar_produto_api(loja, nome, preco, sku))
+    
+    diretorio = DIRETORIO_API / loja
+    diretorio.mkdir(parents=True, exist_ok=True)
+    for categoria, produtos in categorias.items():
+        caminho = diretorio / f'{categoria}.json.gz'
+        caminho.write_bytes(gzip.compress(json.dumps(produtos, ensure_ascii=False).encode('utf-8'), mtime=0))
+        print(f"✅ {caminho.relative_to(RAIZ)} ({len(produtos)} produtos)")
+
+
+def main():
+    for loja, (_, _, caminho_csv) in LOJAS.items():
+        salvar_api(loja, ler_produtos(caminho_csv, com_tipo=True))
+
+        produtos = ler_produtos(caminho_csv)
+        aleatorio = random.Random(loja)
+        organicos = [p for p in produtos if 'orgânico' in p[0].lower() or 'organico' in p[0].lower()]
+        paginas = {
+            f'{loja}_categoria': aleatorio.sample(produtos, PRODUTOS_POR_PAGINA),
+            f'{loja}_busca': (organicos or produtos)[:PRODUTOS_POR_PAGINA],
+        }
+        for nome_arquivo, produtos_pagina in paginas.items():
+            caminho = salvar_pagina(nome_arquivo, gerar_pagina(loja, produtos_pagina, semente=nome_arquivo))
+            print(f"✅ {caminho.relative_to(RAIZ)}")
+            # Variante sem JSON-LD (só os cards), para o extrator de HTML
+            caminho = salvar_pagina(f'{nome_arquivo}_html', gerar_pagina(loja, produtos_pagina, com_jsonld=False,
+                                                                         semente=nome_arquivo))
+            print(f"✅ {caminho.relative_to(RAIZ)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Suíte de micro-benchmarks offline sobre as páginas gravadas em benchmarks/paginas.
+
+Cada etapa do caminho página -> planilha é cronometrada separadamente:
+montagem da árvore da página (o parse feito a partir do `buscar_pagina`),
+`extrair_produtos_jsonld`, `extrair_produtos_html`, `extrair_produtos_seletores`, `classificar_tipo`,
+`separar_nome_quantidade`, `processar_dados_para_planilha` e `salvar_planilha`.
+
+Dois tipos de verificação:
+- saída de referência (golden): o resultado de cada etapa é comparado com
+  benchmarks/golden/<etapa>.json; uma otimização que mude o resultado falha aqui.
+- desempenho: a mediana de cada etapa é comparada com benchmarks/resultados/referencia.json;
+  mais lenta que a referência além da tolerância conta como regressão.
+O resultado da execução fica em benchmarks/resultados/ultima.json. Os tempos de
+referência valem para a máquina em que foram gravados; ao trocar de máquina,
+grave uma nova referência antes de comparar.
+
+Uso:
+    python benchmarks/suite.py [--repeticoes N] [--tolerancia 0.3] [--etapas ETAPA ...]
+    python benchmarks/suite.py --atualizar-golden       # depois de uma mudança intencional de resultado
+    python benchmarks/suite.py --atualizar-referencia   # grava os tempos desta máquina como referência
+"""
+import argparse
+import gzip
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from azumarill.classificador import classificar_tipo  # noqa: E402
+from azumarill.exportacao import salvar_planilha  # noqa: E402
+from azumarill.extracao import extrair_produtos_html, extrair_produtos_jsonld, extrair_produtos_seletores  # noqa: E402
+from azumarill.pagina import PaginaBruta  # noqa: E402
+from azumarill.processamento import processar_dados_para_planilha, separar_nome_quantidade  # noqa: E402
+
+DIRETORIO_BENCH = Path(__file__).resolve().parent
+DIRETORIO_PAGINAS = DIRETORIO_BENCH / 'paginas'
+DIRETORIO_GOLDEN = DIRETORIO_BENCH / 'golden'
+DIRETORIO_RESULTADOS = DIRETORIO_BENCH / 'resultados'
+ARQUIVO_REFERENCIA = DIRETORIO_RESULTADOS / 'referencia.json'
+ARQUIVO_ULTIMA = DIRETORIO_RESULTADOS / 'ultima.json'
+
+SUFIXO_HTML = '_html'  # páginas sem JSON-LD, só com os cards
+
+# Quantas vezes os nomes/produtos das páginas são repetidos nas etapas por item,
+# para que cada medida dure o bastante para ser estável
+ESCALA_ITENS = 50
+
+
+def carregar_paginas():
+    """Retorna {nome: bytes} das páginas gravadas"""
+    return {caminho.name.removesuffix('.html.gz'): gzip.decompress(caminho.read_bytes())
+            for caminho in sorted(DIRETORIO_PAGINAS.glob('*.html.gz'))}
+
+
+class Dados:
+    """Entradas das etapas, montadas uma vez a partir das páginas"""
+
+    def __init__(self, paginas, escala=ESCALA_ITENS):
+        self.paginas = paginas
+        self.paginas_jsonld = {nome: c for nome, c in paginas.items() if not nome.endswith(SUFIXO_HTML)}
+        self.paginas_html = {nome: c for nome, c in paginas.items() if nome.endswith(SUFIXO_HTML)}
+        self.soups_html = {nome: PaginaBruta(c).soup for nome, c in self.paginas_html.items()}
+        self.arvores_html = {nome: PaginaBruta(c).arvore for nome, c in self.paginas_html.items()}
+
+        self.produtos = []
+        for conteudo in self.paginas_jsonld.values():
+            for produto in extrair_produtos_jsonld(PaginaBruta(conteudo)):
+                produto['tipo'] = classificar_tipo(produto['nome_bruto'])
+                self.produtos.append(produto)
+        self.nomes = sorted({produto['nome_bruto'] for produto in self.produtos})
+        self.escala = escala
+
+
+# Cada etapa recebe os Dados e retorna (executar, resultado): `executar` é o trabalho
+# cronometrado e `resultado()` a saída comparada com a golden
+
+def etapa_parse_pagina(dados):
+    """Montagem da árvore BeautifulSoup das páginas baixadas"""
+    def executar():
+        return {nome: PaginaBruta(c).soup for nome, c in dados.paginas.items()}
+    return executar, lambda: {nome: len(soup.find_all(True)) for nome, soup in executar().items()}
+
+
+def etapa_extrair_jsonld(dados):
+    """extrair_produtos_jsonld sobre os bytes das páginas com JSON-LD"""
+    def executar():
+        return {nome: extrair_produtos_jsonld(PaginaBruta(c)) for nome, c in dados.paginas_jsonld.items()}
+    return executar, executar
+
+
+def etapa_extrair_html(dados):
+    """extrair_produtos_html sobre as árvores já montadas das páginas sem JSON-LD"""
+    def executar():
+        return {nome: extrair_produtos_html(soup) for nome, soup in dados.soups_html.items()}
+    return executar, executar
+
+
+def etapa_extrair_html_seletores(dados):
+    """extrair_produtos_seletores sobre as árvores lxml já montadas; mesma saída de extrair_html"""
+    def executar():
+        return {nome: extrair_produtos_seletores(arvore) for nome, arvore in dados.arvores_html.items()}
+    return executar, executar
+
+
+def etapa_classificar_tipo(dados):
+    """classificar_tipo nome a nome"""
+    nomes = dados.nomes * dados.escala
+
+    def executar():
+        return [classificar_tipo(nome) for nome in nomes]
+    return executar, lambda: dict(zip(dados.nomes, map(classificar_tipo, dados.nomes)))
+
+
+def etapa_separar_nome_quantidade(dados):
+    """separar_nome_quantidade nome a nome"""
+    nomes = dados.nomes * dados.escala
+
+    def executar():
+        return [separar_nome_quantidade(nome) for nome in nomes]
+    return executar, lambda: {nome: list(separar_nome_quantidade(nome)) for nome in dados.nomes}
+
+
+def etapa_processar_planilha(dados):
+    """processar_dados_para_planilha sobre os produtos extraídos"""
+    produtos = dados.produtos * dados.escala
+
+    def executar():
+        return processar_dados_para_planilha(produtos)
+    return executar, lambda: processar_dados_para_planilha(dados.produtos).to_dict('records')
+
+
+def etapa_salvar_planilha(dados):
+    """salvar_planilha (CSV, Excel e, com pyarrow, Parquet/Arrow) num diretório temporário"""
+    produtos = dados.produtos * dados.escala
+
+    def salvar(lista):
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = Path(diretorio) / 'planilha.xlsx'
+            salvar_planilha(lista, str(caminho))
+            return caminho.with_suffix('.csv').read_text(encoding='utf-8-sig')
+    return lambda: salvar(produtos), lambda: salvar(dados.produtos).splitlines()
+
+
+ETAPAS = {
+    'parse_pagina': etapa_parse_pagina,
+    'extrair_jsonld': etapa_extrair_jsonld,
+    'extrair_html': etapa_extrair_html,
+    'extrair_html_seletores': etapa_extrair_html_seletores,
+    'classificar_tipo': etapa_classificar_tipo,
+    'separar_nome_quantidade': etapa_separar_nome_quantidade,
+    'processar_planilha': etapa_processar_planilha,
+    'salvar_planilha': etapa_salvar_planilha,
+}
+
+
+# Etapas rápidas são repetidas dentro de cada amostra até durarem pelo menos isto,
+# para que o ruído do relógio não vire "regressão"
+DURACAO_MINIMA_AMOSTRA = 0.1
+
+
+def medir(executar, repeticoes):
+    """Mediana (segundos por execução) de `repeticoes` amostras, depois de calibrar as voltas por amostra"""
+    voltas = 1
+    while True:
+        inicio = time.perf_counter()
+        for _ in range(voltas):
+            executar()
+        if time.perf_counter() - inicio >= DURACAO_MINIMA_AMOSTRA:
+            break
+        voltas *= 2
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for _ in range(voltas):
+            executar()
+        tempos.append((time.perf_counter() - inicio) / voltas)
+    return statistics.median(tempos)
+
+
+def normalizar(resultado):
+    """Passa o resultado por JSON, para comparar com a golden do mesmo jeito que foi gravada"""
+    return json.loads(json.dumps(resultado, ensure_ascii=False, default=str))
+
+
+def conferir_golden(nome, resultado, atualizar):
+    """Compara com benchmarks/golden/<nome>.json (ou grava, com atualizar). Retorna True se bateu"""
+    caminho = DIRETORIO_GOLDEN / f'{nome}.json'
+    resultado = normalizar(resultado)
+    if atualizar or not caminho.exists():
+        DIRETORIO_GOLDEN.mkdir(parents=True, exist_ok=True)
+        caminho.write_text(json.dumps(resultado, ensure_ascii=False, indent=1, sort_keys=True) + '\n',
+                           encoding='utf-8')
+        return True
+    return json.loads(caminho.read_text(encoding='utf-8')) == resultado
+
+
+def ler_referencia():
+    try:
+        return json.loads(ARQUIVO_REFERENCIA.read_text(encoding='utf-8'))['etapas']
+    except FileNotFoundError:
+        return {}
+
+
+def gravar_resultados(caminho, tempos, repeticoes):
+    DIRETORIO_RESULTADOS.mkdir(parents=True, exist_ok=True)
+    conteudo = {
+        'gravado_em': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'maquina': platform.platform(),
+        'repeticoes': repeticoes,
+        'etapas': {nome: {'mediana_ms': round(segundos * 1000, 3)} for nome, segundos in tempos.items()},
+    }
+    caminho.write_text(json.dumps(conteudo, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeticoes', type=int, default=7)
+    parser.add_argument('--tolerancia', type=float, default=0.3,
+                        help='fração acima da referência tolerada antes de acusar regressão (padrão: 0.3)')
+    parser.add_argument('--etapas', nargs='+', choices=list(ETAPAS), default=list(ETAPAS))
+    parser.add_argument('--atualizar-golden', action='store_true')
+    parser.add_argument('--atualizar-referencia', action='store_true')
+    args = parser.parse_args()
+
+    paginas = carregar_paginas()
+    if not paginas:
+        print(f"❌ Nenhuma página em {DIRETORIO_PAGINAS}. Rode benchmarks/gerar_paginas.py ou grave páginas reais.")
+        sys.exit(1)
+
+    dados = Dados(paginas)
+    referencia = ler_referencia()
+    print(f"{len(paginas)} páginas, {len(dados.produtos)} produtos, {len(dados.nomes)} nomes distintos "
+          f"(x{dados.escala} nas etapas por item)\n")
+    print(f"{'etapa':<25} {'mediana (ms)':>13} {'referência':>11} {'razão':>7}  resultado")
+
+    tempos = {}
+    falhas = []
+    for nome in args.etapas:
+        executar, resultado = ETAPAS[nome](dados)
+        golden_ok = conferir_golden(nome, resultado(), args.atualizar_golden)
+        tempos[nome] = medir(executar, args.repeticoes)
+
+        ms = tempos[nome] * 1000
+        ref = referencia.get(nome, {}).get('mediana_ms')
+        razao = ms / ref if ref else None
+        situacao = '✅ golden ok' if golden_ok else '❌ saída mudou'
+        if not golden_ok:
+            falhas.append(f"{nome}: saída diferente de {DIRETORIO_GOLDEN.name}/{nome}.json")
+        if razao is not None and razao > 1 + args.tolerancia and not args.atualizar_referencia:
+            situacao += f', ❌ {razao:.2f}x mais lenta'
+            falhas.append(f"{nome}: {ms:.2f} ms contra {ref:.2f} ms de referência")
+        print(f"{nome:<25} {ms:>13.2f} {ref if ref else '-':>11} {f'{razao:.2f}x' if razao else '-':>7}  {situacao}")
+
+    gravar_resultados(ARQUIVO_ULTIMA, tempos, args.repeticoes)
+    if args.atualizar_referencia:
+        gravar_resultados(ARQUIVO_REFERENCIA, {**{k: v['mediana_ms'] / 1000 for k, v in referencia.items()},
+                                               **tempos}, args.repeticoes)
+        print(f"\n💾 Referência gravada em {ARQUIVO_REFERENCIA.relative_to(RAIZ)}")
+
+    if falhas:
+        print("\n❌ Falhas:")
+        for falha in falhas:
+            print(f"   - {falha}")
+        sys.exit(1)
+    print("\n✅ Nenhuma saída mudou e nenhuma etapa ficou mais lenta que a referência")
+
+
+if __name__ == "__main__":
+    main()